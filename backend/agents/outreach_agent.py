@@ -1,17 +1,15 @@
 from crewai import Agent
-from crewai import LLM
 import os
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool
+from services.logging_setup import crew_verbose
+from services.model_routing import llm_for
+from crewai_tools import SerperDevTool
+from tools.cached_scrape_tool import CachedScrapeWebsiteTool
 
-# Initialize the Gemini model using CrewAI's LLM class
-llm = LLM(
-    model="gemini/gemini-2.5-flash",  # Use gemini/ prefix for Google AI Studio
-    api_key=os.getenv("GEMINI_API_KEY"),
-    temperature=0.7
-)
+# Fast model for short LinkedIn notes and emails (per-task routing in services/model_routing.py)
+llm = llm_for("outreach")
 
 search_tool = SerperDevTool()
-scrape_tool = ScrapeWebsiteTool()  # Add scraping tool for LinkedIn profiles
+scrape_tool = CachedScrapeWebsiteTool()  # Cached scraping tool for LinkedIn profiles
 
 outreach_agent = Agent(
     role='Professional Networking and Outreach Strategist with LinkedIn Research',
@@ -31,8 +29,9 @@ outreach_agent = Agent(
         "Your strength is finding authentic connection points between the candidate and each contact based "
         "on real profile data."
     ),
-    verbose=True,
+    verbose=crew_verbose(),
     allow_delegation=False,
+    max_iter=int(os.getenv("OUTREACH_AGENT_MAX_ITER", "8")),  # bounds the reasoning/tool loop
     llm=llm,
     tools=[search_tool, scrape_tool]  # Give agent ability to search and scrape
 )
@@ -1,13 +1,10 @@
 from crewai import Agent
-from crewai import LLM
 import os
+from services.logging_setup import crew_verbose
+from services.model_routing import llm_for
 
-# Initialize the Gemini model using CrewAI's LLM class
-llm = LLM(
-    model="gemini/gemini-2.5-flash",  # Use gemini/ prefix for Google AI Studio
-    api_key=os.getenv("GEMINI_API_KEY"),
-    temperature=0.7
-)
+# Strong model for the long-form resume and cover letter (per-task routing in services/model_routing.py)
+llm = llm_for("resume_tailoring")
 
 resume_tailoring_agent = Agent(
     role='Resume and Cover Letter Specialist',
@@ -17,7 +14,8 @@ resume_tailoring_agent = Agent(
         " compelling storytelling. You know how to highlight the most relevant skills and"
         " experiences to catch a recruiter's eye and pass through applicant tracking systems."
     ),
-    verbose=True,
+    verbose=crew_verbose(),
     allow_delegation=False,
+    max_iter=int(os.getenv("RESUME_AGENT_MAX_ITER", "3")),  # bounds the reasoning/tool loop
     llm=llm
 )
\ No newline at end of file
@@ -0,0 +1,57 @@
+# Production gunicorn settings for the Flask API (see wsgi.py).
+# Every value can be overridden with an environment variable.
+import os
+import signal
+import time
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+
+# Background jobs live in each worker's in-process queue, so polling must reach the worker that
+# accepted the job. Keep one worker process (scale with threads / containers) unless requests are
+# routed stickily or a shared queue backend replaces LocalQueueBackend.
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+# Blocking /api/process-application runs can take minutes; async jobs return immediately
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "600"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "300"))
+keepalive = 5
+
+# Worker recycling is intentionally off (max_requests = 0): the single worker holds the in-process job
+# queue and job state, so recycling it would drop queued and running jobs. Set GUNICORN_MAX_REQUESTS
+# (jitter defaults to 100) only once jobs live in a shared backend.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100")) if max_requests else 0
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+
+def worker_exit(server, worker):
+    # Drain in-flight crew runs before the worker process goes away. After SIGTERM the arbiter kills
+    # the worker graceful_timeout seconds later, so only drain for what is left of that period.
+    from main import job_manager
+
+    stop_requested_at = getattr(worker, "stop_requested_at", None)
+    remaining = graceful_timeout
+    if stop_requested_at is not None:
+        remaining = max(0, graceful_timeout - (time.monotonic() - stop_requested_at) - 1)
+    server.log.info("Draining background jobs (up to %.0fs)", remaining)
+    job_manager.shutdown(timeout=remaining)
+
+
+def post_worker_init(worker):
+    # Remember when a graceful stop was requested, for worker_exit's drain budget
+    handle_exit = worker.handle_exit
+
+    def on_sigterm(sig, frame):
+        worker.stop_requested_at = time.monotonic()
+        handle_exit(sig, frame)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+
+    # Start loading crewai and the agents once the worker is up; /readyz turns 200 when done
+    from services.warmup import warmup
+    warmup.start_background()
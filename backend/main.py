@@ -1,19 +1,41 @@
-from flask import Flask, request, jsonify
-from crewai import Crew, Process
-from agents.resume_agent import resume_tailoring_agent
-from agents.outreach_agent import outreach_agent
-from tasks.resume_tasks import create_resume_tailoring_task
-from tasks.outreach_tasks import create_outreach_task
+from dotenv import load_dotenv
+
+# Before the service imports: they read their settings (model tiers, budgets, cache sizes, ...)
+# from the environment when they are imported
+load_dotenv()
+
+from flask import Flask, request, jsonify, Response
+from services.jobs import JobManager, QueueFullError
+from services.batch import run_batch
+from services.keyword_analyzer import analyze
+from services.llm_cache import llm_result_cache
+from services.hunter_client import hunter_cache
+from services.contact_store import contact_store
+from services.prefetch import prefetcher
+from services.resume_profile import resume_profile_cache
+from services.warmup import warmup
+from services.logging_setup import configure_logging
+from services.metrics import metrics, llm_stats
+from services.model_routing import model_router
+from services.single_flight import single_flight_stats
 from flask_cors import CORS
+import logging
 import os
 import json
-from dotenv import load_dotenv
+import threading
 
-load_dotenv()
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)
 
+
+def trace_requested(data):
+    """Debug mode: return the per-stage timing trace with the results."""
+    return bool(data.get('debug')) or os.getenv("DEBUG_TRACE", "").lower() in ("1", "true", "yes", "on")
+
+
 @app.route('/api/process-application', methods=['POST'])
 def process_application():
     data = request.json
@@ -23,100 +45,295 @@ def process_application():
     role = data.get('role')
 
     # Debug logging to verify data is received
-    print(f"\n=== RECEIVED DATA ===")
-    print(f"Company: {company_name}")
-    print(f"Role: {role}")
-    print(f"Resume length: {len(base_resume) if base_resume else 0}")
-    print(f"Job description length: {len(job_description) if job_description else 0}")
-    print(f"===================\n")
+    logger.debug(
+        f"Received data: company={company_name}, role={role}, "
+        f"resume length={len(base_resume) if base_resume else 0}, "
+        f"job description length={len(job_description) if job_description else 0}"
+    )
 
     if not all([base_resume, job_description, company_name, role]):
         return jsonify({"error": "Missing required fields"}), 400
 
-    # Create tasks for the agents
-    resume_task = create_resume_tailoring_task(resume_tailoring_agent, job_description, base_resume)
-    outreach_task = create_outreach_task(outreach_agent, company_name, role, base_resume)
-    
-    # Create a crew with the agents and tasks
-    job_application_crew = Crew(
-        agents=[resume_tailoring_agent, outreach_agent],
-        tasks=[resume_task, outreach_task],
-        process=Process.sequential,
-        verbose=True
-    )
+    execution_mode = data.get('execution_mode')
 
-    # Kick off the crew's work
-    crew_output = job_application_crew.kickoff()
+    # Kick off the crews' work (parallel branches by default, see services/pipeline.py)
+    pipeline = warmup.ensure_ready()
+    run_result = pipeline.run_application(
+        base_resume, job_description, company_name, role,
+        mode=execution_mode, use_cache=data.get('use_cache')
+    )
+    logger.info(f"⏱️  Crew timings: {run_result['timings']} | upstream calls: {run_result['upstream_calls']}")
 
-    # Extract the raw output from CrewOutput object
     try:
-        # Structure the response properly
-        response = {
-            "tailored_resume": None,
-            "cover_letter": None,
-            "outreach": []
-        }
-        
-        # Extract resume and cover letter from the first task output
-        if len(crew_output.tasks_output) > 0:
-            resume_output = crew_output.tasks_output[0].raw
-            
-            # Clean JSON markdown fences if present
-            resume_output = resume_output.strip()
-            if resume_output.startswith('```json'):
-                resume_output = resume_output[7:]  # Remove ```json
-            if resume_output.startswith('```'):
-                resume_output = resume_output[3:]  # Remove ```
-            if resume_output.endswith('```'):
-                resume_output = resume_output[:-3]  # Remove trailing ```
-            resume_output = resume_output.strip()
-            
-            try:
-                resume_data = json.loads(resume_output)
-                response["tailored_resume"] = resume_data.get("tailored_resume", "")
-                response["cover_letter"] = resume_data.get("cover_letter", "")
-            except json.JSONDecodeError as e:
-                print(f"Error parsing resume JSON: {e}")
-                response["tailored_resume"] = resume_output
-        
-        # Extract outreach contacts from the second task output
-        if len(crew_output.tasks_output) > 1:
-            outreach_output = crew_output.tasks_output[1].raw
-    
-    # Clean JSON markdown fences if present
-            outreach_output = outreach_output.strip()
-            if outreach_output.startswith('```json'):
-                outreach_output = outreach_output[7:]
-            if outreach_output.startswith('```'):
-                outreach_output = outreach_output[3:]
-            if outreach_output.endswith('```'):
-                outreach_output = outreach_output[:-3]
-            outreach_output = outreach_output.strip()
-    
-    # NEW: Extract just the JSON array from the text
-    # Find the first '[' and last ']'
-            start_idx = outreach_output.find('[')
-            end_idx = outreach_output.rfind(']')
-    
-            if start_idx != -1 and end_idx != -1:
-                outreach_output = outreach_output[start_idx:end_idx + 1]
-    
-            try:
-                outreach_data = json.loads(outreach_output)
-                if isinstance(outreach_data, list):
-                    response["outreach"] = outreach_data
-                else:
-                    response["outreach"] = [outreach_data]
-            except json.JSONDecodeError as e:
-                print(f"Error parsing outreach JSON: {e}")
-                print(f"Failed to parse: {outreach_output[:500]}")
-                response["outreach"] = []
-        
-        return jsonify(response)
+        return jsonify(pipeline.build_response(run_result, include_trace=trace_requested(data)))
         
     except Exception as e:
-        print(f"Error processing crew output: {e}")
+        logger.error(f"Error processing crew output: {e}")
         return jsonify({"error": f"Failed to process crew output: {str(e)}"}), 500
 
+def run_application_job(payload, job):
+    """Worker handler: runs the crews for a queued job and returns the response payload."""
+    pipeline = warmup.ensure_ready()
+    run_result = pipeline.run_application(
+        payload['resume'],
+        payload['job_description'],
+        payload['company_name'],
+        payload['role'],
+        mode=payload.get('execution_mode'),
+        use_cache=payload.get('use_cache'),
+        on_event=lambda event, data: job_manager.publish(job, event, data)
+    )
+    logger.info(f"⏱️  Job {job.id} timings: {run_result['timings']} | upstream calls: {run_result['upstream_calls']}")
+    return pipeline.build_response(run_result, include_trace=payload.get('debug'))
+
+
+job_manager = JobManager(handler=run_application_job)
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    data = request.json or {}
+    required = ['resume', 'job_description', 'company_name', 'role']
+
+    if not all(data.get(field) for field in required):
+        return jsonify({"error": "Missing required fields"}), 400
+
+    payload = {field: data.get(field) for field in required}
+    payload['execution_mode'] = data.get('execution_mode')
+    payload['use_cache'] = data.get('use_cache')
+    payload['debug'] = trace_requested(data)
+
+    try:
+        job = job_manager.submit(payload)
+    except QueueFullError:
+        # Back-pressure: tell the client to retry instead of piling up work
+        response = jsonify({"error": "Server is busy, please retry shortly"})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+
+    logger.info(f"📥 Queued job {job.id} for {payload['company_name']} / {payload['role']}")
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.id}",
+        "stream_url": f"/api/jobs/{job.id}/stream"
+    }), 202
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    response = job.to_dict()
+    # Polling clients pass ?since=<events seen so far> to get the same progress events as the stream
+    since = request.args.get('since', type=int)
+    if since is not None:
+        events = list(job.events)
+        response["events"] = events[max(0, since):]
+        response["next"] = len(events)
+    return jsonify(response)
+
+
+# Each open stream holds a gthread thread for the whole job, so only a few may be open at once;
+# polling GET /api/jobs/<id>?since=N is the default transport
+stream_slots = threading.BoundedSemaphore(int(os.getenv("SSE_MAX_STREAMS", "2")))
+
+
+@app.route('/api/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not stream_slots.acquire(blocking=False):
+        response = jsonify({"error": "Too many open streams, poll the job status instead"})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+
+    def generate():
+        sent = 0
+        while True:
+            events = job_manager.wait_for_events(job, sent)
+            if not events:
+                yield ": keep-alive\n\n"
+            for event in events:
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+            sent += len(events)
+            if job.done and sent >= len(job.events):
+                yield f"event: result\ndata: {json.dumps(job.to_dict())}\n\n"
+                return
+
+    response = Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+    # Released when the server closes the response, including on client disconnects
+    response.call_on_close(stream_slots.release)
+    return response
+
+
+def run_batch_job(payload, job):
+    """Worker handler for batches: one resume, many postings, shared lookups per company."""
+    postings = payload['postings']
+    pipeline = warmup.ensure_ready()
+    job.result = {"items": [None] * len(postings), "completed": 0, "total": len(postings)}
+
+    def run_item(posting):
+        run_result = pipeline.run_application(
+            payload['resume'],
+            posting['job_description'],
+            posting['company_name'],
+            posting['role'],
+            mode=payload.get('execution_mode'),
+            use_cache=payload.get('use_cache')
+        )
+        return pipeline.build_response(run_result, include_trace=payload.get('debug'))
+
+    def on_item(index, item):
+        # Progressive results: visible on GET /api/jobs/<id> and as "item" stream events
+        item = {"index": index, **postings[index], **item}
+        item.pop('job_description', None)
+        job.result["items"][index] = item
+        job.result["completed"] += 1
+        job_manager.publish(job, "item", item)
+
+    items, shared_stats = run_batch(postings, run_item, on_item=on_item)
+
+    upstream_calls = {}
+    for item in items:
+        for service, count in ((item.get("result") or {}).get("upstream_calls") or {}).items():
+            upstream_calls[service] = upstream_calls.get(service, 0) + count
+
+    logger.info(f"📦 Batch {job.id} done: shared work {shared_stats}, upstream calls {upstream_calls}")
+    return {**job.result, "shared_work": shared_stats, "upstream_calls": upstream_calls}
+
+
+@app.route('/api/batches', methods=['POST'])
+def submit_batch():
+    data = request.json or {}
+    resume = data.get('resume')
+    postings = data.get('postings') or []
+    required = ['job_description', 'company_name', 'role']
+    max_items = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+
+    if not resume or not postings:
+        return jsonify({"error": "Missing required fields"}), 400
+    if len(postings) > max_items:
+        return jsonify({"error": f"A batch can contain at most {max_items} postings"}), 400
+    if not all(isinstance(p, dict) and all(p.get(field) for field in required) for p in postings):
+        return jsonify({"error": "Every posting needs job_description, company_name and role"}), 400
+
+    payload = {
+        "resume": resume,
+        "postings": [{field: p[field] for field in required} for p in postings],
+        "execution_mode": data.get('execution_mode'),
+        "use_cache": data.get('use_cache'),
+        "debug": trace_requested(data)
+    }
+
+    try:
+        job = job_manager.submit(payload, handler=run_batch_job)
+    except QueueFullError:
+        response = jsonify({"error": "Server is busy, please retry shortly"})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+
+    logger.info(f"📥 Queued batch {job.id} with {len(postings)} postings")
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/api/jobs/{job.id}",
+        "stream_url": f"/api/jobs/{job.id}/stream"
+    }), 202
+
+
+@app.route('/api/jobs/stats', methods=['GET'])
+def job_stats():
+    return jsonify({**job_manager.stats(), "coalescing": single_flight_stats()})
+
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze_job():
+    """Fast local keyword/relevance analysis (no LLM call)."""
+    data = request.json or {}
+    job_description = data.get('job_description')
+
+    if not job_description:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    return jsonify(analyze(job_description, data.get('resume')))
+
+
+@app.route('/api/prefetch', methods=['POST'])
+def prefetch_contacts():
+    """
+    Starts looking up contacts for a company/role while the user finishes the form.
+    Debounced, capped per session (session_id field, X-Session-Id header or client address) and per day.
+    """
+    data = request.json or {}
+    company_name = (data.get('company_name') or "").strip()
+    role = (data.get('role') or "").strip()
+
+    if not company_name or not role:
+        return jsonify({"error": "Missing required fields"}), 400
+
+    session = data.get('session_id') or request.headers.get('X-Session-Id') or request.remote_addr
+    status = prefetcher.request(session, company_name, role)
+    if status == "limited":
+        return jsonify({"status": status, "error": "Prefetch limit reached for this session"}), 429
+    return jsonify({"status": status}), 200 if status == "warm" else 202
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        "hunter": hunter_cache.stats(),
+        "llm": llm_result_cache.stats(),
+        "contacts": contact_store.stats(),
+        "prefetch": prefetcher.stats(),
+        "resume_profiles": resume_profile_cache.stats()
+    })
+
+
+@app.route('/api/llm/stats', methods=['GET'])
+def llm_model_stats():
+    """Task -> model routing and per-model call, latency and token totals."""
+    return jsonify({"routes": model_router.describe(), "models": llm_stats.as_dict()})
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus exposition: stage latency histograms, upstream/LLM call and token counters, queue gauges."""
+    jobs = job_manager.stats()
+    gauges = {
+        "app_jobs_queued": ("Jobs waiting in the queue", jobs["queued"]),
+        "app_jobs_running": ("Jobs currently running", jobs["jobs"].get("running", 0)),
+        "app_job_workers": ("Job worker threads", jobs["workers"]),
+        "app_ready": ("1 once agents and crews are loaded", int(warmup.ready)),
+    }
+    for name, cache in (("hunter", hunter_cache), ("llm", llm_result_cache)):
+        stats = cache.stats()
+        gauges[f"app_cache_{name}_entries"] = (f"Entries in the {name} cache", stats["entries"])
+        gauges[f"app_cache_{name}_hit_rate"] = (f"Hit rate of the {name} cache since start", stats["hit_rate"])
+    store = contact_store.stats()
+    gauges["app_contact_store_contacts"] = ("Contacts in the local contact store", store["contacts"])
+    gauges["app_contact_store_hit_rate"] = ("Contact searches answered locally since start", store["hit_rate"])
+    return Response(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving requests (crew modules may still be loading)."""
+    return jsonify({"status": "ok"})
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: agents and crews are loaded, so requests won't pay the import cost."""
+    report = warmup.report()
+    return jsonify(report), (200 if warmup.ready else 503)
+
+
 if __name__ == '__main__':
+    # Load crewai and the agents in the background so the dev server starts listening right away
+    # (only in the reloader's child process - the watcher process never serves requests)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        warmup.start_background()
     app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Accuracy and speed of the role -> Hunter.io department classifier.
+
+Scores services/role_classifier.py against the labeled titles in role_labels.csv
+(an empty department means "no filter") and compares it with the original any() keyword chain:
+
+    python scripts/bench_role_classifier.py
+    python scripts/bench_role_classifier.py --titles 100000
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.role_classifier import RoleClassifier, load_keywords
+
+LABELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "role_labels.csv")
+
+
+def legacy_department(role):
+    """The original substring chain from find_contacts_hunter, kept as the baseline."""
+    role_lower = role.lower()
+    if any(word in role_lower for word in ['data', 'analyst', 'analytics', 'engineer', 'developer', 'scientist']):
+        return 'it'
+    elif any(word in role_lower for word in ['hr', 'people', 'talent', 'recruiter']):
+        return 'hr'
+    elif any(word in role_lower for word in ['sales', 'account', 'business development']):
+        return 'sales'
+    elif any(word in role_lower for word in ['marketing', 'brand', 'content']):
+        return 'marketing'
+    elif any(word in role_lower for word in ['finance', 'accounting', 'controller']):
+        return 'finance'
+    elif any(word in role_lower for word in ['support', 'customer success', 'service']):
+        return 'support'
+    elif any(word in role_lower for word in ['ceo', 'cto', 'cfo', 'chief', 'executive', 'president', 'vp']):
+        return 'executive'
+    return None
+
+
+def load_labels(path):
+    with open(path, newline="") as f:
+        return [(row["title"], row["department"] or None) for row in csv.DictReader(f)]
+
+
+def accuracy(classify, labels):
+    wrong = [(title, expected, classify(title)) for title, expected in labels if classify(title) != expected]
+    return 1 - len(wrong) / len(labels), wrong
+
+
+def throughput(classify, titles):
+    start = time.perf_counter()
+    for title in titles:
+        classify(title)
+    return len(titles) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the role -> department classifier")
+    parser.add_argument("--labels", default=LABELS_PATH)
+    parser.add_argument("--titles", type=int, default=50000, help="titles classified for the speed test")
+    args = parser.parse_args()
+
+    labels = load_labels(args.labels)
+    classifier = RoleClassifier(load_keywords())
+    # Distinct titles defeat the classifier's memoization, so this measures the matching itself
+    titles = [f"{labels[i % len(labels)][0]} {i}" for i in range(args.titles)]
+
+    print(f"{'='*60}")
+    print(f"{len(labels)} labeled titles, {args.titles} titles for speed")
+    for name, classify in (("legacy any() chain", legacy_department), ("RoleClassifier", classifier._department)):
+        score, wrong = accuracy(classify, labels)
+        print(f"{'-'*60}")
+        print(f"{name:20} accuracy {score:.1%} | {throughput(classify, titles):,.0f} titles/s")
+        for title, expected, got in wrong:
+            print(f"   {title!r}: expected {expected}, got {got}")
+    cached = throughput(classifier.department, [title for title, _ in labels] * (args.titles // len(labels)))
+    print(f"{'-'*60}")
+    print(f"RoleClassifier, repeated titles (memoized): {cached:,.0f} titles/s")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""
+Offline benchmark for the application pipeline.
+
+Replaces Gemini with a deterministic fake LLM (fixed latency and output size) and serves
+Hunter.io and the LinkedIn profile pages from a local stub server, then drives
+POST /api/process-application and the task builders at several concurrency levels.
+No network access or API keys are needed, so the numbers measure orchestration overhead
+(crews, threads, caches, parsing) and are comparable between runs:
+
+    python scripts/benchmark.py
+    python scripts/benchmark.py --concurrency 1,4,8 --requests 16 --llm-latency 0.2
+    python scripts/benchmark.py --json bench.json --fail-above-p95 5000
+
+Reports p50/p95 latency, throughput, per-stage latency (from the debug traces) and memory.
+"""
+import argparse
+import json
+import os
+import re
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_JOB_DESCRIPTION = (
+    "Senior Data Engineer\n"
+    "Responsibilities:\n"
+    "- Build ETL pipelines in Python and Spark on AWS\n"
+    "- Own data quality, monitoring and on-call for the data platform\n"
+    "Requirements:\n"
+    "- 5+ years of experience with Airflow, Kafka, SQL and Kubernetes\n"
+    "- Experience with Snowflake or BigQuery\n"
+    "Benefits:\n"
+    "- Remote friendly, equity, learning budget\n"
+)
+
+SAMPLE_RESUME = (
+    "Jane Doe\n"
+    "jane.doe@example.com | linkedin.com/in/janedoe\n"
+    "Experience\n"
+    "- Built ETL pipelines in Python and Airflow processing 2TB/day on AWS\n"
+    "- Led migration of the SQL warehouse to Snowflake, cutting costs by 30%\n"
+    "- Designed React dashboards for the marketing team\n"
+    "Skills\n"
+    "Python, SQL, Airflow, Spark, AWS, Docker, Snowflake\n"
+    "Education\n"
+    "B.Sc. Computer Science, State University\n"
+)
+
+PROFILE_HTML = (
+    "<html><head><title>{name}</title><script>var x = 1;</script></head><body>"
+    "<nav>Home Jobs Messaging</nav><main><h1>{name}</h1><p>{title} at {company}</p>"
+    "<p>Works on data platforms, streaming pipelines and analytics infrastructure.</p>"
+    "<p>Previously at a consulting firm; speaks at data engineering meetups.</p></main>"
+    "<footer>About Privacy</footer></body></html>"
+)
+
+# Fake model behaviour, set from the command line before the agents are imported
+FAKE_LLM = {"latency": 0.05, "output_tokens": 300}
+
+
+def slugify(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def max_rss_mb():
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Hunter.io domain search and LinkedIn profile pages, with configurable latency."""
+
+    hunter_latency = 0.05
+    scrape_latency = 0.05
+    contacts = 5
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path.endswith("/domain-search"):
+            time.sleep(self.hunter_latency)
+            company = query.get("company") or query.get("domain", "").split(".")[0]
+            domain = query.get("domain") or f"{slugify(company).replace('-', '')}.com"
+            host = f"http://{self.headers['Host']}"
+            emails = []
+            for i in range(min(self.contacts, int(query.get("limit", "10")))):
+                first, last = f"Person{i}", slugify(company).replace("-", "").title() or "Bench"
+                emails.append({
+                    "value": f"person{i}@{domain}",
+                    "first_name": first,
+                    "last_name": last,
+                    "position": "Engineering Manager" if i % 2 else "Senior Data Engineer",
+                    "confidence": 95 - i * 5,
+                    "linkedin": f"{host}/in/{slugify(domain)}-{i}"
+                })
+            body = {"data": {"domain": domain, "organization": company, "emails": emails}}
+            self._send(200, json.dumps(body), "application/json")
+        elif url.path.startswith("/in/"):
+            time.sleep(self.scrape_latency)
+            slug = url.path.rsplit("/", 1)[-1]
+            self._send(200, PROFILE_HTML.format(name=slug, title="Engineering Manager", company=slug), "text/html")
+        else:
+            self._send(404, "{}", "application/json")
+
+
+def start_stub_server(args):
+    StubHandler.hunter_latency = args.hunter_latency
+    StubHandler.scrape_latency = args.scrape_latency
+    StubHandler.contacts = args.contacts
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-server", daemon=True).start()
+    return server
+
+
+def _prompt_text(messages):
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(m.get("content") or "" for m in messages if isinstance(m.get("content"), str))
+
+
+def fake_answer(prompt):
+    """Deterministic final answer in the shape each task asks for."""
+    filler = " ".join(["lorem"] * max(1, FAKE_LLM["output_tokens"] * 4 // 6))
+
+    if "'tailored_resume' and 'cover_letter'" in prompt:
+        return {"tailored_resume": f"Jane Doe\n{filler}", "cover_letter": f"Dear Hiring Manager,\n{filler}"}
+
+    messages = {
+        "linkedin_profile_summary": "Leads the data platform team.",
+        "connection_points": "Both built Airflow pipelines on AWS.",
+        "linkedin_note": "Hi, I enjoyed reading about your data platform work - would love to connect!",
+        "cold_email": f"Subject: Data platform\n\n{filler}"
+    }
+    contact = re.search(r"CONTACT:\n(\{.*?\})\n", prompt)
+    if contact:
+        return {**json.loads(contact.group(1)), **messages}
+    contacts = re.search(r"CONTACTS TO RESEARCH:\n(\[.*?\])\n", prompt)
+    if contacts:
+        return [{**c, **messages} for c in json.loads(contacts.group(1))]
+    return {"error": "No contacts found via Hunter.io"}
+
+
+def install_fake_llm():
+    """Makes `from crewai import LLM` (used by the agent modules) return the fake model."""
+    import crewai
+    from crewai.llms.base_llm import BaseLLM
+
+    class FakeLLM(BaseLLM):
+        def __init__(self, model, api_key=None, temperature=None, **kwargs):
+            super().__init__(model=f"fake/{model.split('/')[-1]}", temperature=temperature)
+
+        def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+            time.sleep(FAKE_LLM["latency"])
+            answer = json.dumps(fake_answer(_prompt_text(messages)))
+            return f"Thought: I now know the final answer\nFinal Answer: {answer}"
+
+        def supports_function_calling(self):
+            return False
+
+        def supports_stop_words(self):
+            return True
+
+        def get_context_window_size(self):
+            return 1_000_000
+
+    crewai.LLM = FakeLLM
+
+
+def configure_environment(args, stub_port, cache_dir):
+    os.environ.update({
+        "HUNTER_API_BASE": f"http://127.0.0.1:{stub_port}/v2",
+        "HUNTER_API_KEY": "benchmark",
+        "HUNTER_RATE_PER_SECOND": "1000",
+        "HUNTER_RATE_BURST": "1000",
+        "GEMINI_API_KEY": "benchmark",
+        "SERPER_API_KEY": "benchmark",
+        "CACHE_DIR": cache_dir,
+        "LLM_CACHE_ENABLED": "true" if args.warm else "false",
+        "LOG_LEVEL": args.log_level,
+        "CREW_EXECUTION_MODE": args.mode,
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    })
+
+
+def bench_task_builders(iterations):
+    """Times building the task prompts alone (no crew run)."""
+    from agents.resume_agent import resume_tailoring_agent
+    from agents.outreach_agent import outreach_agent
+    from tasks.resume_tasks import create_resume_tailoring_task
+    from tasks.outreach_tasks import create_contact_outreach_task
+
+    contact = {"name": "Person0 Bench", "title": "Engineering Manager", "email": "person0@bench.com",
+               "linkedin": "https://linkedin.com/in/person0-bench"}
+    builders = {
+        "resume_task": lambda: create_resume_tailoring_task(resume_tailoring_agent, SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME),
+        "contact_task": lambda: create_contact_outreach_task(
+            outreach_agent, "Bench Co", "Data Engineer", SAMPLE_RESUME, contact, "Leads the data platform team."
+        ),
+    }
+
+    results = {}
+    for name, build in builders.items():
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            build()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "mean_ms": round(statistics.mean(timings), 3)
+        }
+    return results
+
+
+def bench_process_application(client, concurrency, requests, warm):
+    """Sends `requests` application requests with `concurrency` in flight; returns latency stats."""
+    def one_request(index):
+        company = "Bench Co" if warm else f"Bench Co {concurrency}-{index}"
+        payload = {
+            "resume": SAMPLE_RESUME,
+            "job_description": SAMPLE_JOB_DESCRIPTION,
+            "company_name": company,
+            "role": "Senior Data Engineer",
+            "debug": True
+        }
+        start = time.perf_counter()
+        response = client.post("/api/process-application", json=payload)
+        elapsed = (time.perf_counter() - start) * 1000
+        body = response.get_json(silent=True) or {}
+        ok = response.status_code == 200 and body.get("cover_letter") is not None and len(body.get("outreach") or []) > 0
+        return ok, elapsed, body.get("trace") or []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(one_request, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for ok, latency, _ in results if ok]
+    stages = {}
+    for _, _, trace in results:
+        for span in trace:
+            stages.setdefault(span["stage"], []).append(span["seconds"] * 1000)
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "ok": len(latencies),
+        "errors": requests - len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 3),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "max_rss_mb": max_rss_mb(),
+        "stages_p50_ms": {stage: round(percentile(values, 50), 1) for stage, values in sorted(stages.items())}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark with a fake LLM and stub Hunter.io/scrape server")
+    parser.add_argument("--concurrency", default="1,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=8, help="requests per concurrency level")
+    parser.add_argument("--mode", default="parallel", choices=["parallel", "sequential"])
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds per fake LLM call")
+    parser.add_argument("--llm-tokens", type=int, default=300, help="approx. tokens per fake LLM answer")
+    parser.add_argument("--hunter-latency", type=float, default=0.05)
+    parser.add_argument("--scrape-latency", type=float, default=0.05)
+    parser.add_argument("--contacts", type=int, default=5, help="contacts returned per Hunter.io search")
+    parser.add_argument("--warm", action="store_true", help="repeat one company so caches are hit")
+    parser.add_argument("--builder-iterations", type=int, default=200)
+    parser.add_argument("--tracemalloc", action="store_true", help="also report peak Python heap (slower)")
+    parser.add_argument("--log-level", default="warning")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--fail-above-p95", type=float, help="exit 1 if any level's p95 (ms) is above this")
+    args = parser.parse_args()
+
+    FAKE_LLM.update(latency=args.llm_latency, output_tokens=args.llm_tokens)
+    server = start_stub_server(args)
+
+    with tempfile.TemporaryDirectory(prefix="bench-cache-") as cache_dir:
+        configure_environment(args, server.server_address[1], cache_dir)
+        install_fake_llm()
+        if args.tracemalloc:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        import main as backend
+        backend.warmup.ensure_ready()
+        startup = {"import_seconds": round(time.perf_counter() - start, 3), "modules": backend.warmup.report()["import_seconds"]}
+
+        results = {
+            "startup": startup,
+            "task_builders": bench_task_builders(args.builder_iterations),
+            "process_application": []
+        }
+        client = backend.app.test_client()
+        for level in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            results["process_application"].append(bench_process_application(client, level, args.requests, args.warm))
+
+        if args.tracemalloc:
+            results["peak_heap_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+
+    server.shutdown()
+
+    print(f"{'='*72}")
+    print(f"Startup:        {startup['import_seconds']}s")
+    for name, stats in results["task_builders"].items():
+        print(f"Build {name:13} p50 {stats['p50_ms']:.2f} ms | p95 {stats['p95_ms']:.2f} ms")
+    print(f"{'-'*72}")
+    print(f"{'conc':>5} {'ok':>4} {'err':>4} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'rss MB':>8}")
+    for level in results["process_application"]:
+        print(f"{level['concurrency']:>5} {level['ok']:>4} {level['errors']:>4} {level['throughput_rps']:>8.2f} "
+              f"{level['p50_ms']:>9.1f} {level['p95_ms']:>9.1f} {level['max_rss_mb']:>8.1f}")
+    if results["process_application"]:
+        print(f"{'-'*72}")
+        print("Stage p50 ms (last level): " + ", ".join(
+            f"{stage} {ms}" for stage, ms in results["process_application"][-1]["stages_p50_ms"].items()
+        ))
+    if "peak_heap_mb" in results:
+        print(f"Peak heap:      {results['peak_heap_mb']} MB")
+    print(f"{'='*72}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.fail_above_p95 is not None:
+        slow = [level for level in results["process_application"] if level["p95_ms"] > args.fail_above_p95]
+        if slow:
+            print(f"❌ p95 above {args.fail_above_p95} ms at concurrency {[level['concurrency'] for level in slow]}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
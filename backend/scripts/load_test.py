@@ -0,0 +1,99 @@
+"""
+Simple HTTP load test for the backend.
+
+Compare the Flask dev server with the production gunicorn setup:
+
+    python main.py                                  # dev server on :5001
+    python scripts/load_test.py --requests 500 --concurrency 50
+
+    gunicorn -c gunicorn.conf.py wsgi:app           # production server on :5001
+    python scripts/load_test.py --requests 500 --concurrency 50
+
+By default it hits POST /api/analyze, which does no external calls, so the numbers
+reflect the serving stack rather than Hunter.io or Gemini latency.
+"""
+import argparse
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+SAMPLE_PAYLOAD = {
+    "job_description": (
+        "Senior Data Engineer. Build ETL pipelines in Python and Spark on AWS. "
+        "Experience with Airflow, Kafka, SQL and Kubernetes. Own data quality and monitoring."
+    ),
+    "resume": (
+        "Jane Doe\n"
+        "- Built ETL pipelines in Python and Airflow processing 2TB/day on AWS\n"
+        "- Led migration of the SQL warehouse to Snowflake\n"
+        "- Designed React dashboards for the marketing team\n"
+    )
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the job application backend")
+    parser.add_argument("--url", default="http://localhost:5001/api/analyze")
+    parser.add_argument("--method", default="POST", choices=["GET", "POST"])
+    parser.add_argument("--payload", help="JSON payload file (defaults to a sample analyze request)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args()
+
+    payload = SAMPLE_PAYLOAD
+    if args.payload:
+        with open(args.payload) as f:
+            payload = json.load(f)
+
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency))
+
+    def one_request(_):
+        start = time.perf_counter()
+        try:
+            response = session.request(args.method, args.url, json=payload if args.method == "POST" else None,
+                                       timeout=args.timeout)
+            ok = response.status_code < 400
+            status = response.status_code
+        except requests.RequestException as e:
+            ok = False
+            status = type(e).__name__
+        return ok, status, time.perf_counter() - start
+
+    print(f"🚀 {args.requests} requests, concurrency {args.concurrency} -> {args.method} {args.url}")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(one_request, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency * 1000 for ok, _, latency in results if ok]
+    errors = {}
+    for ok, status, _ in results:
+        if not ok:
+            errors[status] = errors.get(status, 0) + 1
+
+    print(f"{'='*50}")
+    print(f"Completed:   {len(latencies)}/{args.requests} in {elapsed:.2f}s")
+    print(f"Throughput:  {len(latencies) / elapsed:.1f} req/s")
+    if latencies:
+        print(f"Latency ms:  p50 {percentile(latencies, 50):.1f} | p95 {percentile(latencies, 95):.1f} | "
+              f"p99 {percentile(latencies, 99):.1f} | mean {statistics.mean(latencies):.1f}")
+    if errors:
+        print(f"Errors:      {errors}")
+    print(f"{'='*50}")
+
+
+if __name__ == "__main__":
+    main()
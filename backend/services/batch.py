@@ -0,0 +1,94 @@
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from services.call_stats import submit_in_context
+
+logger = logging.getLogger(__name__)
+
+_current_shared_work = contextvars.ContextVar("batch_shared_work", default=None)
+
+
+class SharedWork:
+    """
+    Batch-scoped memo: the first caller for a key computes the value, concurrent callers
+    for the same key wait for it and later callers reuse it. Failures are not memoized.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.computed = 0
+        self.reused = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            if key in self._results:
+                with self._lock:
+                    self.reused += 1
+                return self._results[key]
+
+            value = compute()
+            self._results[key] = value
+            with self._lock:
+                self.computed += 1
+            return value
+
+    def stats(self):
+        with self._lock:
+            return {"computed": self.computed, "reused": self.reused}
+
+
+@contextmanager
+def share_work():
+    """Work wrapped with shared() inside this block is computed once per key."""
+    shared_work = SharedWork()
+    token = _current_shared_work.set(shared_work)
+    try:
+        yield shared_work
+    finally:
+        _current_shared_work.reset(token)
+
+
+def shared(key, compute):
+    """Returns compute() memoized for the current batch (or just compute() outside a batch)."""
+    shared_work = _current_shared_work.get()
+    if shared_work is None:
+        return compute()
+    return shared_work.get_or_compute(key, compute)
+
+
+def run_batch(postings, run_item, on_item=None, concurrency=None):
+    """
+    Runs run_item(posting) for every posting with a concurrency cap, sharing work across items.
+    on_item(index, item) is called as each item finishes, so callers can report
+    progressively; item is {"status": "completed", "result": ...} or
+    {"status": "failed", "error": ...}. Returns (results in posting order, shared-work stats).
+    """
+    concurrency = concurrency or int(os.getenv("BATCH_CONCURRENCY", "3"))
+    results = [None] * len(postings)
+
+    with share_work() as shared_work:
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(postings))), thread_name_prefix="batch-item") as executor:
+            futures = {
+                submit_in_context(executor, run_item, posting): index
+                for index, posting in enumerate(postings)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = {"status": "completed", "result": future.result()}
+                except Exception as e:
+                    logger.error(f"❌ Batch item {index} failed: {type(e).__name__}: {str(e)}")
+                    results[index] = {"status": "failed", "error": str(e)}
+                if on_item:
+                    on_item(index, results[index])
+
+    return results, shared_work.stats()
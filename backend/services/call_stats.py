@@ -0,0 +1,51 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+
+from services.metrics import upstream_calls_total
+
+_current_counter = contextvars.ContextVar("upstream_call_counter", default=None)
+
+
+class UpstreamCallCounter:
+    """Thread-safe per-job counter of calls made to upstream services (Hunter.io, ...)."""
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def increment(self, service):
+        with self._lock:
+            self._counts[service] = self._counts.get(service, 0) + 1
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+def submit_in_context(executor, fn, *args):
+    """
+    Submits fn(*args) to executor in a copy of the caller's context.
+    Per-run state lives in context variables - the upstream call counter, progress listener,
+    span trace, deadline and batch shared work - so every hand-off to another thread must go
+    through this (or contextvars.copy_context) for that work to count against the same run.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+@contextmanager
+def track_upstream_calls():
+    """Counts upstream calls made inside this block (see submit_in_context for other threads)."""
+    counter = UpstreamCallCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+def record_upstream_call(service):
+    upstream_calls_total.inc(service=service)
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.increment(service)
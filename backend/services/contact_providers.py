@@ -0,0 +1,223 @@
+import csv
+from abc import ABC, abstractmethod
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from services.call_stats import submit_in_context
+from services.deadline import stage_timeout
+from services.metrics import span
+from services.role_classifier import classify_department
+
+logger = logging.getLogger(__name__)
+
+CONTACT_DISCOVERY_TIMEOUT = float(os.getenv("CONTACT_DISCOVERY_TIMEOUT", "20"))
+
+# Columns understood in local contact lists (CSV header / SQLite "contacts" table)
+CONTACT_FIELDS = ("name", "title", "email", "linkedin", "confidence")
+
+
+def normalize_company_name(company_name):
+    """Normalizes a company name for use in cache keys."""
+    return " ".join((company_name or "").lower().replace(",", " ").replace("'", "").split())
+
+
+def company_domain_hint(company_name):
+    """The domain the user typed instead of a company name (e.g. "hpe.com"), or None."""
+    name = (company_name or "").lower().strip()
+    return name if "." in name and " " not in name else None
+
+
+class ContactProvider(ABC):
+    """
+    A source of people to contact at a company.
+    find_contacts returns dicts with name, title, email, linkedin and confidence (0-100).
+    """
+
+    name = "provider"
+
+    @abstractmethod
+    def find_contacts(self, company_name, role, department, limit):
+        """Up to limit contacts at company_name for role (department is its classified department)."""
+
+
+def _local_contact(row, default_confidence):
+    contact = {field: (row.get(field) or "").strip() for field in ("name", "title", "email", "linkedin")}
+    try:
+        contact["confidence"] = int(float(row.get("confidence") or default_confidence))
+    except ValueError:
+        contact["confidence"] = default_confidence
+    return contact
+
+
+def _matches_department(row, department):
+    # Rows without a department are classified by title; unclassifiable ones match any role
+    row_department = (row.get("department") or "").strip().lower() or classify_department(row.get("title"))
+    return not department or not row_department or row_department == department
+
+
+class CSVContactProvider(ContactProvider):
+    """
+    Contacts from a CSV file with a header row: company, domain, name, title, email, linkedin,
+    department, confidence (only company or domain, name and email are required).
+    The file is indexed once and re-read when it changes on disk.
+    Hand-maintained lists default to a high confidence.
+    """
+
+    name = "csv"
+
+    def __init__(self, path, default_confidence=90):
+        self.path = path
+        self.default_confidence = default_confidence
+        self._index = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        mtime = os.path.getmtime(self.path)
+        with self._lock:
+            if mtime == self._mtime:
+                return self._index
+            index = {}
+            with open(self.path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    row = {(key or "").strip().lower(): value for key, value in row.items()}
+                    if not row.get("email"):
+                        continue
+                    for key in {normalize_company_name(row.get("company")), (row.get("domain") or "").strip().lower()}:
+                        if key:
+                            index.setdefault(key, []).append(row)
+            self._index, self._mtime = index, mtime
+            logger.info(f"📇 Loaded {sum(len(rows) for rows in index.values())} local contact rows from {self.path}")
+            return index
+
+    def find_contacts(self, company_name, role, department, limit):
+        index = self._load()
+        rows = index.get(company_domain_hint(company_name) or normalize_company_name(company_name), [])
+        contacts = [_local_contact(row, self.default_confidence) for row in rows if _matches_department(row, department)]
+        return contacts[:limit]
+
+
+class SQLiteContactProvider(ContactProvider):
+    """
+    Contacts from a SQLite database with a "contacts" table using the same columns as the CSV
+    provider. Companies are matched on their normalized name (like the CSV provider and the
+    contact store) or on the domain.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path, default_confidence=90):
+        self.path = path
+        self.default_confidence = default_confidence
+        self._local = threading.local()
+
+    def _conn(self):
+        # One read-only connection per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            conn.row_factory = sqlite3.Row
+            conn.create_function("normalize_company_name", 1, normalize_company_name, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def find_contacts(self, company_name, role, department, limit):
+        domain = company_domain_hint(company_name)
+        if domain:
+            rows = self._conn().execute("SELECT * FROM contacts WHERE lower(domain) = ?", (domain,)).fetchall()
+        else:
+            rows = self._conn().execute(
+                "SELECT * FROM contacts WHERE normalize_company_name(company) = ?", (normalize_company_name(company_name),)
+            ).fetchall()
+        rows = [{key.lower(): row[key] for key in row.keys()} for row in rows]
+        contacts = [
+            _local_contact({key: str(value) if value is not None else "" for key, value in row.items()}, self.default_confidence)
+            for row in rows if row.get("email") and _matches_department(row, department)
+        ]
+        return contacts[:limit]
+
+
+def local_contact_providers():
+    """Local contact lists configured with CONTACT_CSV_PATH / CONTACT_DB_PATH."""
+    providers = []
+    if os.getenv("CONTACT_CSV_PATH"):
+        providers.append(CSVContactProvider(os.getenv("CONTACT_CSV_PATH")))
+    if os.getenv("CONTACT_DB_PATH"):
+        providers.append(SQLiteContactProvider(os.getenv("CONTACT_DB_PATH")))
+    return providers
+
+
+def merge_contacts(results, limit):
+    """
+    Merges provider results into one list: duplicates (same email, or same name when an email
+    is missing) are combined, keeping the highest confidence and filling in missing fields.
+    Sorted by confidence, highest first; ties keep provider order.
+    """
+    merged = []
+    by_key = {}
+    for provider_name, contacts in results:
+        for contact in contacts:
+            keys = [key for key in (
+                ("email", (contact.get("email") or "").strip().lower()),
+                ("name", " ".join((contact.get("name") or "").lower().split()))
+            ) if key[1]]
+            existing = next((by_key[key] for key in keys if key in by_key), None)
+            if existing is None:
+                existing = {**contact, "sources": [provider_name]}
+                merged.append(existing)
+            else:
+                if provider_name not in existing["sources"]:
+                    existing["sources"].append(provider_name)
+                if (contact.get("confidence") or 0) > (existing.get("confidence") or 0):
+                    existing.update({field: value for field, value in contact.items() if value})
+                else:
+                    existing.update({field: value for field, value in contact.items() if value and not existing.get(field)})
+            for key in keys:
+                by_key.setdefault(key, existing)
+
+    merged = [contact for contact in merged if contact.get("email")]
+    merged.sort(key=lambda contact: -(contact.get("confidence") or 0))
+    return merged[:limit]
+
+
+def _run_provider(provider, company_name, role, department, limit):
+    with span("contact_provider", provider=provider.name) as attrs:
+        contacts = provider.find_contacts(company_name, role, department, limit)
+        attrs["contacts"] = len(contacts)
+    return contacts
+
+
+def discover_contacts(providers, company_name, role, department=None, limit=5, timeout=None):
+    """
+    Queries every provider at once and merges what comes back before the deadline.
+    A provider that is slow or fails is skipped for this request (a slow one keeps running in
+    the background, so whatever it caches helps the next request).
+    """
+    timeout = stage_timeout("hunter", CONTACT_DISCOVERY_TIMEOUT if timeout is None else timeout)
+    with span("contact_discovery", company=company_name) as attrs:
+        executor = ThreadPoolExecutor(max_workers=max(1, len(providers)), thread_name_prefix="contact-provider")
+        futures = {
+            submit_in_context(executor, _run_provider, provider, company_name, role, department, limit): provider
+            for provider in providers
+        }
+        done, not_done = wait(futures, timeout=timeout)
+        executor.shutdown(wait=False)
+
+        results = []
+        for future, provider in futures.items():
+            if future in not_done:
+                logger.warning(f"⏱️  Contact provider '{provider.name}' missed the {timeout}s deadline for {company_name}")
+                continue
+            try:
+                results.append((provider.name, future.result()))
+            except Exception as e:
+                logger.error(f"❌ Contact provider '{provider.name}' failed: {type(e).__name__}: {str(e)}")
+
+        contacts = merge_contacts(results, limit)
+        attrs["providers"] = {name: len(found) for name, found in results}
+        attrs["contacts"] = len(contacts)
+    logger.info(f"📇 {len(contacts)} contacts for {company_name} from {attrs['providers']}")
+    return contacts
@@ -0,0 +1,178 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.cache import CACHE_DIR
+from services.contact_providers import normalize_company_name
+from services.role_classifier import classify_department
+
+logger = logging.getLogger(__name__)
+
+CONTACT_STORE_STALE_AFTER = int(os.getenv("CONTACT_STORE_STALE_AFTER", str(7 * 24 * 3600)))
+CONTACT_STORE_EMPTY_STALE_AFTER = int(os.getenv("CONTACT_STORE_EMPTY_STALE_AFTER", str(6 * 3600)))
+CONTACT_STORE_MAX_AGE = int(os.getenv("CONTACT_STORE_MAX_AGE", str(90 * 24 * 3600)))
+
+
+class ContactStore:
+    """
+    Persistent local index of every contact Hunter.io has returned, keyed by domain and the
+    department filter of the search that found them.
+    A search answered from the store needs no upstream call; stale searches are still served
+    and refreshed in the background (stale-while-revalidate).
+    """
+
+    def __init__(self, path=None, refresh_workers=None):
+        self.path = path or os.path.join(CACHE_DIR, "contacts.sqlite3")
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._refresher = ThreadPoolExecutor(
+            max_workers=refresh_workers or int(os.getenv("CONTACT_STORE_REFRESH_WORKERS", "1")),
+            thread_name_prefix="contact-refresh"
+        )
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS searches ("
+            " domain TEXT NOT NULL,"
+            " department TEXT NOT NULL,"
+            " company_key TEXT,"
+            " requested INTEGER NOT NULL,"
+            " found INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (domain, department));"
+            "CREATE INDEX IF NOT EXISTS idx_searches_company ON searches (company_key);"
+            "CREATE TABLE IF NOT EXISTS contacts ("
+            " domain TEXT NOT NULL,"
+            " search_department TEXT NOT NULL,"
+            " email TEXT NOT NULL,"
+            " name TEXT,"
+            " title TEXT,"
+            " department TEXT,"
+            " linkedin TEXT,"
+            " confidence INTEGER,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (domain, search_department, email));"
+            "CREATE INDEX IF NOT EXISTS idx_contacts_department ON contacts (domain, department);"
+            "CREATE INDEX IF NOT EXISTS idx_contacts_title ON contacts (domain, title);"
+        )
+        self._conn.commit()
+
+    def domain_for(self, company_name):
+        """The domain a company name resolved to in an earlier search, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT domain FROM searches WHERE company_key = ? ORDER BY fetched_at DESC LIMIT 1",
+                (normalize_company_name(company_name),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, domain, department, limit):
+        """
+        Returns (contacts, stale) when an earlier search for this domain and department can answer
+        the request, or None when Hunter.io has to be asked.
+        """
+        now = time.time()
+        with self._lock:
+            search = self._conn.execute(
+                "SELECT requested, found, fetched_at FROM searches WHERE domain = ? AND department = ?",
+                (domain, department or "")
+            ).fetchone()
+            # Usable if it was searched recently enough and asked for at least as many contacts
+            # (or returned everything Hunter had)
+            if search is None or now - search[2] > CONTACT_STORE_MAX_AGE or (search[0] < limit and search[1] >= search[0]):
+                self.misses += 1
+                return None
+
+            if department:
+                rows = self._conn.execute(
+                    "SELECT name, title, email, linkedin, MAX(confidence) AS best FROM contacts"
+                    " WHERE domain = ? AND (search_department = ? OR department = ?)"
+                    " GROUP BY email ORDER BY best DESC LIMIT ?",
+                    (domain, department, department, limit)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT name, title, email, linkedin, MAX(confidence) AS best FROM contacts"
+                    " WHERE domain = ? GROUP BY email ORDER BY best DESC LIMIT ?",
+                    (domain, limit)
+                ).fetchall()
+            self.hits += 1
+
+        stale_after = CONTACT_STORE_STALE_AFTER if search[1] else CONTACT_STORE_EMPTY_STALE_AFTER
+        contacts = [
+            {"name": name or "", "title": title or "", "email": email, "linkedin": linkedin or "", "confidence": confidence}
+            for name, title, email, linkedin, confidence in rows
+        ]
+        return contacts, now - search[2] > stale_after
+
+    def save_search(self, company_name, domain, department, requested, contacts):
+        """Replaces the stored result of a domain/department search with a fresh Hunter.io answer."""
+        now = time.time()
+        department = department or ""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM contacts WHERE domain = ? AND search_department = ?", (domain, department)
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO contacts"
+                " (domain, search_department, email, name, title, department, linkedin, confidence, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (domain, department, c["email"].lower(), c.get("name"), c.get("title"),
+                     c.get("department") or classify_department(c.get("title")) or department or None, c.get("linkedin"), c.get("confidence") or 0, now)
+                    for c in contacts if c.get("email")
+                ]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (domain, department, company_key, requested, found, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (domain, department, normalize_company_name(company_name), requested, len(contacts), now)
+            )
+            self._conn.commit()
+
+    def schedule_refresh(self, key, refresh):
+        """Runs refresh() on the background refresher unless a refresh for key is already pending."""
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            self.refreshes += 1
+
+        def run():
+            try:
+                refresh()
+            except Exception as e:
+                logger.warning(f"⚠️  Background contact refresh {key} failed: {type(e).__name__}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        logger.info(f"🔄 Refreshing stale contacts in the background: {key}")
+        # Not submit_in_context: the refresh outlives the request and must not inherit its deadline
+        self._refresher.submit(run)
+
+    def stats(self):
+        with self._lock:
+            searches, = self._conn.execute("SELECT COUNT(*) FROM searches").fetchone()
+            contacts, = self._conn.execute("SELECT COUNT(DISTINCT email) FROM contacts").fetchone()
+            total = self.hits + self.misses
+            return {
+                "searches": searches,
+                "contacts": contacts,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "background_refreshes": self.refreshes,
+                "refreshes_pending": len(self._pending)
+            }
+
+
+contact_store = ContactStore()
@@ -0,0 +1,122 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+
+from services.call_stats import submit_in_context
+
+logger = logging.getLogger(__name__)
+
+_current_deadline = contextvars.ContextVar("application_deadline", default=None)
+
+APPLICATION_DEADLINE = float(os.getenv("APPLICATION_DEADLINE", "180"))
+# Extra wait for a branch past its budget, so it can hand back what it finished in time
+DEADLINE_GRACE = float(os.getenv("DEADLINE_GRACE", "2"))
+
+# Longest a single stage may take, further capped by whatever is left of the whole deadline
+STAGE_BUDGETS = {
+    "hunter": float(os.getenv("DEADLINE_HUNTER", "25")),
+    "scrape": float(os.getenv("DEADLINE_SCRAPE", "20")),
+    "resume": float(os.getenv("DEADLINE_RESUME", "150")),
+    "outreach": float(os.getenv("DEADLINE_OUTREACH", "150")),
+    "parsing": float(os.getenv("DEADLINE_PARSING", "20")),
+}
+
+
+class DeadlineExceeded(Exception):
+    """Raised at a cancellation point once the application's deadline has passed or it was cancelled."""
+
+
+class Deadline:
+    """
+    End-to-end time limit of one application run.
+    Work checks it at cancellation points (before each LLM call, Hunter.io request, scrape,
+    contact task); cancel() makes every later check fail, so abandoned branches stop early.
+    """
+
+    def __init__(self, seconds=None, budgets=None):
+        self.seconds = APPLICATION_DEADLINE if seconds is None else seconds
+        self.budgets = budgets or STAGE_BUDGETS
+        self.expires_at = time.monotonic() + self.seconds
+        self._stage_ends = {}
+        self._cancelled = threading.Event()
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def start_stage(self, stage):
+        """Starts the clock on stage's budget; budget(stage) then counts down from here."""
+        self._stage_ends[stage] = time.monotonic() + self.budget(stage)
+
+    def budget(self, stage):
+        """Seconds stage may still take: its own budget (from when it started) capped by the time left overall."""
+        end = self._stage_ends.get(stage)
+        if end is not None:
+            return max(0.0, min(end, self.expires_at) - time.monotonic())
+        return min(self.budgets.get(stage, self.seconds), self.remaining())
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self, stage):
+        if self.cancelled:
+            raise DeadlineExceeded(f"{stage}: application was cancelled")
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(f"{stage}: {self.seconds}s application deadline passed")
+
+
+@contextmanager
+def deadline_scope(seconds=None):
+    """Applies a Deadline to the work inside this block."""
+    deadline = Deadline(seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline():
+    return _current_deadline.get()
+
+
+def check_deadline(stage):
+    """Cancellation point: raises DeadlineExceeded when the current run is out of time."""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+def stage_timeout(stage, default):
+    """default, shortened to the stage's remaining budget inside a deadline."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return default
+    return max(0.001, min(default, deadline.budget(stage)))
+
+
+def run_within(stage, fn, *args):
+    """
+    Runs fn(*args) on its own thread and waits at most the stage's budget.
+    Returns (result, True), or (None, False) when the budget ran out - the thread is left to
+    stop at its next cancellation point. Outside a deadline this is just fn(*args).
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return fn(*args), True
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"deadline-{stage}")
+    future = submit_in_context(executor, fn, *args)
+    executor.shutdown(wait=False)
+    try:
+        return future.result(timeout=deadline.budget(stage)), True
+    except (FutureTimeoutError, DeadlineExceeded):
+        logger.warning(f"⏱️  {stage} ran out of its time budget, continuing without it")
+        return None, False
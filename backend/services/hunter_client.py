@@ -0,0 +1,155 @@
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services.cache import SQLiteCache
+from services.call_stats import record_upstream_call
+from services.deadline import check_deadline, current_deadline, stage_timeout
+from services.metrics import span
+
+logger = logging.getLogger(__name__)
+
+HUNTER_API_BASE = os.getenv("HUNTER_API_BASE", "https://api.hunter.io/v2")
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Persistent cache for company -> domain lookups so repeat companies cost no API calls.
+# Guessed domains (Hunter.io could not resolve the company) are cached for a shorter time.
+HUNTER_CACHE_TTL = int(os.getenv("HUNTER_CACHE_TTL", str(7 * 24 * 3600)))
+HUNTER_NEGATIVE_CACHE_TTL = int(os.getenv("HUNTER_NEGATIVE_CACHE_TTL", str(6 * 3600)))
+hunter_cache = SQLiteCache(
+    "hunter",
+    default_ttl=HUNTER_CACHE_TTL,
+    max_entries=int(os.getenv("HUNTER_CACHE_MAX_ENTRIES", "2000"))
+)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    `rate` tokens are added per second up to `capacity`; acquire() blocks until a token is free.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_retry_after(value):
+    """Returns the Retry-After header as seconds (supports delta-seconds and HTTP dates)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HunterClient:
+    """
+    Shared Hunter.io client.
+    Uses one keep-alive requests.Session (connection pool) for all calls, a token bucket
+    matched to the plan's rate limit, and retries 429/5xx responses with jittered
+    exponential backoff that honours Retry-After.
+    """
+
+    def __init__(self, rate_per_second=None, burst=None, max_retries=None, backoff_base=None,
+                 max_backoff=None, pool_size=None):
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HUNTER_MAX_RETRIES", "4"))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv("HUNTER_BACKOFF_BASE", "0.5"))
+        self.max_backoff = max_backoff if max_backoff is not None else float(os.getenv("HUNTER_MAX_BACKOFF", "30"))
+        self.rate_limiter = TokenBucket(
+            rate_per_second or float(os.getenv("HUNTER_RATE_PER_SECOND", "15")),
+            burst or float(os.getenv("HUNTER_RATE_BURST", "15"))
+        )
+
+        pool_size = pool_size or int(os.getenv("HUNTER_POOL_SIZE", "10"))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        # Full jitter: random delay between 0 and the exponential cap
+        return random.uniform(0, min(self.max_backoff, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _fits_budget(delay):
+        """True when the Hunter.io budget leaves time to sleep delay and try again."""
+        deadline = current_deadline()
+        return deadline is None or delay < deadline.budget("hunter")
+
+    def get(self, path, params, timeout=20):
+        """
+        GETs a Hunter.io endpoint (e.g. "domain-search") and returns the final response.
+        Network errors are re-raised once retries are exhausted.
+        """
+        url = f"{HUNTER_API_BASE}/{path.lstrip('/')}"
+        with span("hunter_request", path=path) as attrs:
+            response = self._get_with_retries(url, params, timeout, attrs)
+            attrs["status"] = response.status_code
+        return response
+
+    def _get_with_retries(self, url, params, timeout, attrs):
+        for attempt in range(self.max_retries + 1):
+            # Every attempt is a cancellation point and gets at most what is left of the Hunter.io budget
+            check_deadline("hunter")
+            self.rate_limiter.acquire()
+            record_upstream_call("hunter")
+            attrs["attempts"] = attempt + 1
+            try:
+                response = self.session.get(url, params=params, timeout=stage_timeout("hunter", timeout))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self._backoff(attempt)
+                if attempt >= self.max_retries or not self._fits_budget(delay):
+                    raise
+                logger.warning(f"⚠️  Hunter.io {type(e).__name__}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                return response
+
+            delay = self._backoff(attempt, parse_retry_after(response.headers.get("Retry-After")))
+            if not self._fits_budget(delay):
+                # Waiting out the backoff would spend the rest of the budget - give up with this response
+                logger.warning(f"⏱️  Hunter.io returned {response.status_code}, no time left to retry in {delay:.1f}s")
+                return response
+            logger.warning(f"⚠️  Hunter.io returned {response.status_code}, retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+    def domain_search(self, api_key, timeout=20, **params):
+        params["api_key"] = api_key
+        return self.get("domain-search", params, timeout=timeout)
+
+    def account(self, api_key, timeout=10):
+        return self.get("account", {"api_key": api_key}, timeout=timeout)
+
+
+hunter_client = HunterClient()
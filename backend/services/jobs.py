@@ -0,0 +1,190 @@
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity and cannot accept more work."""
+
+
+class LocalQueueBackend:
+    """
+    Bounded in-process queue of job ids.
+    Any backend exposing put/get/size (e.g. Redis or RQ) can be swapped in.
+    """
+
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, job_id):
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            raise QueueFullError("Job queue is full")
+
+    def get(self, timeout=None):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def size(self):
+        return self._queue.qsize()
+
+
+class Job:
+    """State of a single submitted application run."""
+
+    def __init__(self, payload, handler=None):
+        self.id = uuid.uuid4().hex
+        self.payload = payload
+        self.handler = handler
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+
+    @property
+    def done(self):
+        return self.status in ("completed", "failed")
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobManager:
+    """
+    Runs submitted jobs on a fixed pool of worker threads.
+    Concurrency is bounded by the worker count and back-pressure by the queue size,
+    so throughput scales with JOB_WORKERS instead of HTTP threads.
+    """
+
+    def __init__(self, handler, backend=None, workers=None, retention=None):
+        self.handler = handler
+        self.backend = backend or LocalQueueBackend(int(os.getenv("JOB_QUEUE_SIZE", "20")))
+        self.workers = workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.retention = retention or int(os.getenv("JOB_RETENTION", "200"))
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._threads = []
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Starts the worker threads (idempotent, done lazily on first submit)."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, payload, handler=None):
+        """Queues a job; handler overrides the manager's default handler for this job."""
+        if self._stopping.is_set():
+            raise QueueFullError("Server is shutting down")
+        self.start()
+        job = Job(payload, handler)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        self.publish(job, "status", {"status": job.status})
+        try:
+            self.backend.put(job.id)
+        except QueueFullError:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise
+        return job
+
+    def shutdown(self, timeout=None):
+        """
+        Graceful shutdown: stop accepting jobs, let running jobs finish (up to timeout seconds)
+        and fail whatever is still queued so clients don't poll forever.
+        """
+        self._stopping.set()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in list(self._threads):
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+
+        with self._lock:
+            pending = [job for job in self._jobs.values() if not job.done]
+        for job in pending:
+            job.status = "failed"
+            job.error = "Server shut down before the job finished"
+            job.finished_at = time.time()
+            self.publish(job, "status", {"status": job.status})
+        if pending:
+            logger.warning(f"⚠️  Shutdown: {len(pending)} unfinished job(s) marked as failed")
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.workers, "queued": self.backend.size(), "jobs": counts}
+
+    def publish(self, job, event, data):
+        """Appends an event to the job's stream and wakes up any listeners."""
+        with self._changed:
+            job.events.append({"event": event, "data": data})
+            self._changed.notify_all()
+
+    def wait_for_events(self, job, since, timeout=15):
+        """Blocks until the job has events after index `since` (or timeout); returns them."""
+        with self._changed:
+            if len(job.events) <= since and not job.done:
+                self._changed.wait(timeout)
+            return job.events[since:]
+
+    def _evict_finished(self):
+        # Keep memory bounded by dropping the oldest finished jobs
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        while len(self._jobs) > self.retention and finished:
+            self._jobs.pop(finished.pop(0), None)
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            job_id = self.backend.get(timeout=1)
+            if job_id is None:
+                continue
+            job = self.get(job_id)
+            if job is None:
+                continue
+
+            job.status = "running"
+            job.started_at = time.time()
+            self.publish(job, "status", {"status": job.status})
+
+            try:
+                job.result = (job.handler or self.handler)(job.payload, job)
+                job.status = "completed"
+            except Exception as e:
+                logger.error(f"❌ Job {job.id} failed: {type(e).__name__}: {str(e)}")
+                job.error = str(e)
+                job.status = "failed"
+
+            job.finished_at = time.time()
+            self.publish(job, "status", {"status": job.status})
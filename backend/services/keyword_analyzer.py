@@ -0,0 +1,222 @@
+import math
+import re
+from collections import Counter
+
+# Built-in skills lexicon. Multi-word skills are matched as phrases; aliases map to one canonical name.
+SKILLS_LEXICON = {
+    # Languages
+    "python", "java", "javascript", "typescript", "golang", "rust", "c++", "c#", "scala", "kotlin",
+    "swift", "ruby", "php", "matlab", "bash", "sql", "nosql", "html", "css", "sass",
+    # Data / ML
+    "machine learning", "deep learning", "nlp", "natural language processing", "computer vision",
+    "data analysis", "data engineering", "data science", "data visualization", "data modeling", "etl", "elt",
+    "statistics", "a/b testing", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "keras",
+    "spark", "pyspark", "hadoop", "airflow", "dbt", "kafka", "flink", "snowflake", "databricks", "bigquery",
+    "redshift", "tableau", "power bi", "looker", "excel", "llm", "generative ai", "rag", "langchain",
+    "mlops", "feature engineering", "time series", "forecasting",
+    # Backend / infra
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible", "jenkins", "ci/cd", "github actions",
+    "linux", "microservices", "graphql", "grpc", "django", "flask", "fastapi", "spring", "node.js",
+    "express", "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "dynamodb", "cassandra",
+    "rabbitmq", "serverless", "distributed systems", "system design", "observability", "prometheus",
+    "grafana", "networking", "security", "devops", "sre",
+    # Frontend / mobile
+    "react", "angular", "vue", "next.js", "redux", "tailwind", "ios", "android", "react native", "flutter",
+    # Practices / business
+    "agile", "scrum", "kanban", "jira", "testing", "unit testing", "tdd", "code review",
+    "product management", "project management", "stakeholder management", "roadmap", "user research",
+    "ux", "ui", "figma", "seo", "sem", "crm", "salesforce", "hubspot", "b2b", "saas", "financial modeling",
+    "accounting", "budgeting", "recruiting", "communication", "leadership", "mentoring", "cross-functional",
+}
+
+SKILL_ALIASES = {
+    "golang": "go",
+    "k8s": "kubernetes",
+    "dl": "deep learning",
+    "natural language processing": "nlp",
+    "postgres": "postgresql",
+    "nodejs": "node.js",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "microsoft azure": "azure",
+    "sklearn": "scikit-learn",
+    "powerbi": "power bi",
+    "genai": "generative ai",
+    "large language models": "llm",
+    "llms": "llm",
+    "ci cd": "ci/cd",
+    "cicd": "ci/cd",
+}
+
+# Skills whose names are also ordinary words or letters ("go-to-market", "C-level", "R&D", "the rest of").
+# They only count in these exact spellings, and never inside a hyphenated or "&" compound;
+# single letters also have to sit in a list ("C, C++", "Python or R").
+CASED_SKILLS = {
+    "C": "c",
+    "R": "r",
+    "Go": "go",
+    "REST": "rest",
+    "RESTful": "rest",
+    "Git": "git",
+    "git": "git",
+    "Node": "node.js",
+    "JS": "javascript",
+    "TS": "typescript",
+    "ML": "machine learning",
+}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it", "its", "of",
+    "on", "or", "that", "the", "this", "to", "was", "were", "will", "with", "you", "your", "we", "our", "us",
+    "they", "their", "who", "what", "which", "can", "able", "all", "also", "any", "more", "other", "such",
+    "into", "about", "across", "within", "including", "etc", "per", "not", "but", "if", "so", "than", "then",
+    # Generic job-posting vocabulary that says nothing about the role
+    "experience", "experiences", "work", "working", "team", "teams", "role", "job", "company", "candidate",
+    "ability", "strong", "skills", "skill", "knowledge", "years", "year", "plus", "preferred", "required",
+    "requirements", "responsibilities", "qualifications", "including", "new", "help", "using", "use", "well",
+    "good", "great", "excellent", "opportunity", "join", "looking", "ideal", "must", "should", "would",
+    "environment", "based", "related", "relevant", "degree", "bachelor", "equivalent", "etc.", "e.g.", "i.e.",
+}
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def _build_skill_pattern():
+    # One precompiled alternation (longest phrases first) instead of a scan per skill
+    terms = sorted(set(SKILLS_LEXICON) | set(SKILL_ALIASES), key=len, reverse=True)
+    alternation = "|".join(re.escape(term) for term in terms)
+    return re.compile(rf"(?<![a-z0-9+#])({alternation})(?![a-z0-9+#])")
+
+
+def _build_cased_skill_pattern():
+    alternation = "|".join(re.escape(term) for term in sorted(CASED_SKILLS, key=len, reverse=True))
+    return re.compile(rf"(?<![\w+#&/.-])({alternation})(?![\w+#&-]|\.\w|/\w)")
+
+
+_SKILL_PATTERN = _build_skill_pattern()
+_CASED_SKILL_PATTERN = _build_cased_skill_pattern()
+_LIST_BEFORE = re.compile(r"(?:[,:;(/]|\band|\bor)\s*$")
+_LIST_AFTER = re.compile(r"^\s*(?:[,;)/]|and\b|or\b|$)")
+
+
+def _in_list(text, match):
+    line_start = text.rfind("\n", 0, match.start()) + 1
+    line_end = text.find("\n", match.end())
+    before = text[line_start:match.start()]
+    after = text[match.end():line_end if line_end >= 0 else len(text)]
+    return bool(_LIST_BEFORE.search(before) or _LIST_AFTER.match(after))
+
+
+def tokenize(text):
+    return [token for token in _TOKEN.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+def find_skills(text):
+    """Returns a Counter of canonical lexicon skills mentioned in text."""
+    found = Counter()
+    for match in _SKILL_PATTERN.finditer((text or "").lower()):
+        term = match.group(1)
+        found[SKILL_ALIASES.get(term, term)] += 1
+    for match in _CASED_SKILL_PATTERN.finditer(text or ""):
+        if len(match.group(1)) > 1 or _in_list(text, match):
+            found[CASED_SKILLS[match.group(1)]] += 1
+    return found
+
+
+def extract_keywords(job_description, top_n=20):
+    """
+    Ranks the job description's keywords: lexicon skills first (weighted by frequency),
+    then other salient terms scored by log-scaled term frequency.
+    """
+    skills = find_skills(job_description)
+    terms = Counter(token for token in tokenize(job_description) if len(token) > 2 and not token.isdigit())
+
+    scored = {}
+    for skill, count in skills.items():
+        scored[skill] = (3.0 * (1 + math.log(count)), True)
+    for term, count in terms.items():
+        canonical = SKILL_ALIASES.get(term, term)
+        if canonical in scored or count < 2:
+            continue
+        scored[canonical] = (1 + math.log(count), False)
+
+    ranked = sorted(scored.items(), key=lambda item: (-item[1][0], item[0]))[:top_n]
+    return [{"term": term, "score": round(score, 3), "is_skill": is_skill} for term, (score, is_skill) in ranked]
+
+
+def split_resume_lines(resume):
+    """Splits a resume into scoreable lines/bullets (skipping very short ones like headings)."""
+    lines = []
+    for line in (resume or "").split("\n"):
+        line = re.sub(r"^[\s•▪●◦■*\-–—]+", "", line).strip()
+        if len(line) >= 20:
+            lines.append(line)
+    return lines
+
+
+def bm25_scores(documents, query_terms, k1=1.5, b=0.75):
+    """BM25 score of every document (list of token lists) against query_terms."""
+    if not documents:
+        return []
+    avg_len = sum(len(doc) for doc in documents) / len(documents) or 1.0
+    doc_freq = Counter(term for doc in documents for term in set(doc))
+    n_docs = len(documents)
+
+    scores = []
+    for doc in documents:
+        tf = Counter(doc)
+        score = 0.0
+        for term, weight in query_terms.items():
+            if term not in tf:
+                continue
+            idf = math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += weight * idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * len(doc) / avg_len))
+        scores.append(score)
+    return scores
+
+
+def _line_terms(line):
+    terms = [SKILL_ALIASES.get(token, token) for token in tokenize(line)]
+    terms.extend(find_skills(line).elements())
+    return terms
+
+
+def analyze(job_description, resume=None, top_keywords=20, top_lines=8):
+    """
+    Deterministic job description / resume analysis:
+    ranked keywords, which skills the resume covers or misses, and the most relevant resume lines.
+    """
+    keywords = extract_keywords(job_description, top_n=top_keywords)
+    analysis = {"keywords": keywords}
+    if not resume:
+        return analysis
+
+    resume_skills = find_skills(resume)
+    resume_terms = set(tokenize(resume))
+    job_skills = [k["term"] for k in keywords if k["is_skill"]]
+    analysis["matched_skills"] = [skill for skill in job_skills if skill in resume_skills]
+    analysis["missing_skills"] = [skill for skill in job_skills if skill not in resume_skills]
+    analysis["matched_terms"] = [k["term"] for k in keywords if not k["is_skill"] and k["term"] in resume_terms]
+
+    lines = split_resume_lines(resume)
+    query = {k["term"]: k["score"] for k in keywords}
+    scores = bm25_scores([_line_terms(line) for line in lines], query)
+    ranked = sorted(zip(lines, scores), key=lambda item: -item[1])
+    analysis["top_resume_lines"] = [
+        {"line": line, "score": round(score, 3)} for line, score in ranked[:top_lines] if score > 0
+    ]
+    return analysis
+
+
+def format_analysis_for_prompt(analysis):
+    """Compact, ranked summary of an analysis for inclusion in an LLM prompt."""
+    parts = [f"TOP JOB KEYWORDS (most important first): {', '.join(k['term'] for k in analysis['keywords'])}"]
+    if analysis.get("matched_skills"):
+        parts.append(f"SKILLS THE CANDIDATE ALREADY HAS: {', '.join(analysis['matched_skills'])}")
+    if analysis.get("missing_skills"):
+        parts.append(f"JOB SKILLS NOT IN THE RESUME (do not claim them): {', '.join(analysis['missing_skills'])}")
+    if analysis.get("top_resume_lines"):
+        parts.append("MOST RELEVANT RESUME LINES (emphasize these):")
+        parts.extend(f"- {item['line']}" for item in analysis["top_resume_lines"])
+    return "\n".join(parts)
@@ -0,0 +1,42 @@
+import hashlib
+import json
+import os
+
+from services.cache import SQLiteCache
+
+# Content-addressed cache of LLM task outputs. Identical resubmissions (same rendered prompt,
+# agent, model and temperature) are answered from disk without a model call.
+llm_result_cache = SQLiteCache(
+    "llm",
+    default_ttl=int(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600))),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "500")),
+    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+)
+
+
+def llm_cache_enabled(use_cache=None):
+    """Per-request opt-out wins; otherwise LLM_CACHE_ENABLED (default on) decides."""
+    if use_cache is not None:
+        return bool(use_cache)
+    return os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no", "off")
+
+
+# Bump when the cached output format or its parsing changes without a change to the prompt text
+LLM_CACHE_VERSION = 2
+
+
+def make_llm_cache_key(task_name, llm, **inputs):
+    """
+    Hashes the task name, prompt inputs, model name and temperature into a cache key.
+    inputs should be the fully rendered prompt (task description, agent backstory...), not the
+    raw request fields, so prompt changes never return outputs cached for an older prompt.
+    """
+    payload = {
+        "version": LLM_CACHE_VERSION,
+        "task": task_name,
+        "model": getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+        "inputs": inputs
+    }
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{task_name}:{digest}"
@@ -0,0 +1,39 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(threadName)s] %(name)s: %(message)s"
+
+_listener = None
+
+
+def configure_logging(level=None):
+    """
+    Sets up leveled logging for the backend (LOG_LEVEL, default info).
+    Records go through a queue to a background writer thread, so request and crew threads
+    never block on console I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+
+    root = logging.getLogger()
+    root.setLevel((level or os.getenv("LOG_LEVEL", "info")).upper())
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def crew_verbose():
+    """CrewAI's console narration is only enabled with CREW_VERBOSE=true or debug logging."""
+    if os.getenv("CREW_VERBOSE", "").lower() in ("1", "true", "yes", "on"):
+        return True
+    return logging.getLogger().isEnabledFor(logging.DEBUG)
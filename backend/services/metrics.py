@@ -0,0 +1,266 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from services.prompt_budget import count_tokens
+
+# Histogram buckets (seconds) covering cache hits up to multi-minute crew runs
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+MAX_TRACE_SPANS = 500
+
+_current_trace = contextvars.ContextVar("job_trace", default=None)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_string(labelnames, values):
+    if not labelnames:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)) + "}"
+
+
+class Counter:
+    """Monotonic counter with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name, description, labelnames=()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_string(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name, description, labelnames=(), buckets=STAGE_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    labels = _label_string(self.labelnames + ("le",), key + (bound,))
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _label_string(self.labelnames + ("le",), key + ("+Inf",))
+                lines.append(f"{self.name}_bucket{labels} {series['count']}")
+                labels = _label_string(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {round(series['sum'], 6)}")
+                lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide metrics, exposed at /metrics."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, description, labelnames=()):
+        metric = Counter(name, description, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, description, labelnames=(), buckets=STAGE_BUCKETS):
+        metric = Histogram(name, description, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self, gauges=None):
+        """
+        Prometheus text exposition of every metric.
+        gauges is an optional {name: (description, value)} of point-in-time values (queue depth, ...).
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, (description, value) in (gauges or {}).items():
+            lines.extend([f"# HELP {name} {description}", f"# TYPE {name} gauge", f"{name} {value}"])
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+stage_seconds = metrics.histogram(
+    "app_stage_duration_seconds", "Latency of pipeline stages (Hunter.io, scraping, LLM calls, parsing...)",
+    ("stage", "outcome")
+)
+upstream_calls_total = metrics.counter(
+    "app_upstream_calls_total", "Calls made to upstream services", ("service",)
+)
+llm_calls_total = metrics.counter("app_llm_calls_total", "LLM calls", ("model", "outcome"))
+llm_tokens_total = metrics.counter(
+    "app_llm_tokens_total", "Approximate LLM tokens (~4 characters per token)", ("model", "kind")
+)
+llm_call_seconds = metrics.histogram("app_llm_call_duration_seconds", "Latency of LLM calls per model", ("model", "outcome"))
+
+
+class LLMStats:
+    """Per-model call counts, latency and token totals (JSON view of the LLM metrics, for tuning routes)."""
+
+    def __init__(self):
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def record(self, model, seconds, outcome, prompt_tokens=0, completion_tokens=0):
+        with self._lock:
+            stats = self._models.setdefault(model, {
+                "calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0
+            })
+            stats["calls"] += 1
+            stats["errors"] += outcome != "ok"
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                model: {
+                    **stats,
+                    "seconds": round(stats["seconds"], 3),
+                    "max_seconds": round(stats["max_seconds"], 3),
+                    "avg_seconds": round(stats["seconds"] / stats["calls"], 3) if stats["calls"] else 0.0
+                }
+                for model, stats in self._models.items()
+            }
+
+
+llm_stats = LLMStats()
+
+
+class JobTrace:
+    """Ordered list of the spans recorded while serving one job (returned in debug mode)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, stage, start, seconds, outcome, attrs):
+        with self._lock:
+            if len(self.spans) >= MAX_TRACE_SPANS:
+                self.dropped += 1
+                return
+            self.spans.append({
+                "stage": stage,
+                "start": round(start - self.started, 4),
+                "seconds": round(seconds, 4),
+                "outcome": outcome,
+                "thread": threading.current_thread().name,
+                **attrs
+            })
+
+    def as_list(self):
+        with self._lock:
+            return sorted(self.spans, key=lambda span: span["start"])
+
+
+@contextmanager
+def trace_spans():
+    """
+    Collects the spans recorded inside this block into a JobTrace.
+    """
+    trace = JobTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(stage, **attrs):
+    """
+    Times a stage: observed in the stage latency histogram and added to the current job trace.
+    Yields the attrs dict so the block can annotate the span (cache hits, token counts...).
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield attrs
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        stage_seconds.observe(seconds, stage=stage, outcome=outcome)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(stage, start, seconds, outcome, attrs)
+
+
+def _message_text(messages):
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for message in messages or []:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            parts.append(content)
+    return "\n".join(parts)
+
+
+def instrument_llm(llm):
+    """
+    Wraps llm.call so every LLM call (agent steps and repair re-prompts) is timed as an
+    "llm_call" span with approximate prompt/completion token counts.
+    """
+    model = str(getattr(llm, "model", "unknown"))
+    call = llm.call
+
+    def timed_call(messages, *args, **kwargs):
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            with span("llm_call", model=model) as attrs:
+                response = call(messages, *args, **kwargs)
+                attrs["prompt_tokens"] = count_tokens(_message_text(messages))
+                attrs["completion_tokens"] = count_tokens(response if isinstance(response, str) else "")
+            outcome = "ok"
+        finally:
+            seconds = time.perf_counter() - start
+            llm_calls_total.inc(model=model, outcome=outcome)
+            llm_call_seconds.observe(seconds, model=model, outcome=outcome)
+            llm_stats.record(model, seconds, outcome, attrs.get("prompt_tokens", 0), attrs.get("completion_tokens", 0))
+        llm_tokens_total.inc(attrs["prompt_tokens"], model=model, kind="prompt")
+        llm_tokens_total.inc(attrs["completion_tokens"], model=model, kind="completion")
+        return response
+
+    # object.__setattr__ also works when the LLM class is a pydantic model without a "call" field
+    object.__setattr__(llm, "call", timed_call)
+    return llm
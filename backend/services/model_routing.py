@@ -0,0 +1,153 @@
+import logging
+import os
+import threading
+
+from services.deadline import check_deadline
+from services.metrics import instrument_llm, metrics
+
+logger = logging.getLogger(__name__)
+
+llm_fallbacks_total = metrics.counter(
+    "app_llm_fallbacks_total", "LLM calls retried on the other model tier after a timeout", ("from_model", "to_model")
+)
+
+# Model tiers. "strong" writes the tailored resume and cover letter, "fast" everything short
+# (per-contact LinkedIn notes and emails, JSON repair re-prompts).
+MODEL_TIERS = {
+    "strong": {
+        "model": os.getenv("LLM_MODEL_STRONG", "gemini/gemini-2.5-flash"),
+        "temperature": float(os.getenv("LLM_TEMPERATURE_STRONG", "0.7")),
+        "max_tokens": int(os.getenv("LLM_MAX_TOKENS_STRONG", "8192")),
+        "timeout": float(os.getenv("LLM_TIMEOUT_STRONG", "120")),
+    },
+    "fast": {
+        "model": os.getenv("LLM_MODEL_FAST", "gemini/gemini-2.5-flash-lite"),
+        "temperature": float(os.getenv("LLM_TEMPERATURE_FAST", "0.7")),
+        "max_tokens": int(os.getenv("LLM_MAX_TOKENS_FAST", "2048")),
+        "timeout": float(os.getenv("LLM_TIMEOUT_FAST", "45")),
+    },
+}
+
+# Task -> tier. Override with LLM_ROUTES, e.g. "outreach=strong,output_repair=strong".
+DEFAULT_ROUTES = {
+    "resume_tailoring": "strong",
+    "outreach": "fast",
+    "output_repair": "fast",
+}
+
+
+def load_routes(spec=None):
+    routes = dict(DEFAULT_ROUTES)
+    spec = os.getenv("LLM_ROUTES", "") if spec is None else spec
+    for item in spec.split(","):
+        task, _, tier = item.partition("=")
+        task, tier = task.strip(), tier.strip()
+        if not task:
+            continue
+        if tier not in MODEL_TIERS:
+            logger.warning(f"⚠️  Ignoring LLM route '{item.strip()}': unknown tier '{tier}'")
+            continue
+        routes[task] = tier
+    return routes
+
+
+def is_timeout(error):
+    """True for socket/asyncio timeouts and provider timeout errors (litellm.Timeout and friends)."""
+    return isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower()
+
+
+def with_fallback(llm, fallback):
+    """
+    Wraps llm.call so a call that times out is retried once on the fallback model.
+    Any other error is raised as usual.
+    """
+    call = llm.call
+    model = str(getattr(llm, "model", "unknown"))
+    fallback_model = str(getattr(fallback, "model", "unknown"))
+
+    def call_with_fallback(messages, *args, **kwargs):
+        try:
+            return call(messages, *args, **kwargs)
+        except Exception as e:
+            if not is_timeout(e):
+                raise
+            logger.warning(f"⏱️  {model} timed out, retrying on {fallback_model}")
+            llm_fallbacks_total.inc(from_model=model, to_model=fallback_model)
+            return fallback.call(messages, *args, **kwargs)
+
+    object.__setattr__(llm, "call", call_with_fallback)
+    return llm
+
+
+def with_deadline_check(llm):
+    """Makes every call a cancellation point: no new LLM call once the application is out of time."""
+    call = llm.call
+
+    def checked_call(messages, *args, **kwargs):
+        check_deadline("llm_call")
+        return call(messages, *args, **kwargs)
+
+    object.__setattr__(llm, "call", checked_call)
+    return llm
+
+
+class ModelRouter:
+    """
+    Builds one instrumented LLM per (tier, fallback) and hands out the one routed to each task.
+    Every tier falls back to the other one on timeout (LLM_FALLBACK=false disables it).
+    """
+
+    def __init__(self, tiers=None, routes=None):
+        self.tiers = tiers or MODEL_TIERS
+        self.routes = routes or load_routes()
+        self.fallback_enabled = os.getenv("LLM_FALLBACK", "true").lower() not in ("0", "false", "no", "off")
+        self._llms = {}
+        self._lock = threading.Lock()
+
+    def tier_for(self, task):
+        return self.routes.get(task, "strong")
+
+    def _create(self, tier):
+        # Looked up at call time so the offline benchmark can swap in its fake LLM class
+        from crewai import LLM
+
+        settings = self.tiers[tier]
+        llm = LLM(
+            model=settings["model"],
+            api_key=os.getenv("GEMINI_API_KEY"),
+            temperature=settings["temperature"],
+            max_tokens=settings["max_tokens"],
+            timeout=settings["timeout"]
+        )
+        instrument_llm(llm)  # per-model latency and token counts at /metrics
+        return with_deadline_check(llm)
+
+    def _get(self, tier, fallback_tier=None):
+        # Caller holds self._lock. The fallback instance is a separate plain LLM, so fallbacks never chain.
+        key = (tier, fallback_tier)
+        if key not in self._llms:
+            llm = self._create(tier)
+            if fallback_tier:
+                llm = with_fallback(llm, self._get(fallback_tier))
+            self._llms[key] = llm
+        return self._llms[key]
+
+    def llm_for(self, task):
+        """The LLM routed to task (falling back to the other tier on timeout)."""
+        tier = self.tier_for(task)
+        fallback = next((other for other in self.tiers if other != tier), None) if self.fallback_enabled else None
+        logger.debug(f"🧭 {task} -> {self.tiers[tier]['model']}")
+        with self._lock:
+            return self._get(tier, fallback)
+
+    def describe(self):
+        return {
+            task: {"tier": tier, "model": self.tiers[tier]["model"]} for task, tier in sorted(self.routes.items())
+        }
+
+
+model_router = ModelRouter()
+
+
+def llm_for(task):
+    return model_router.llm_for(task)
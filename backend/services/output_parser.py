@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+import re
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from services.call_stats import record_upstream_call
+from services.deadline import run_within
+from services.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeOutput(BaseModel):
+    """Expected output of the resume tailoring task."""
+    model_config = ConfigDict(extra="ignore")
+
+    tailored_resume: str
+    cover_letter: str
+
+
+class OutreachContact(BaseModel):
+    """Expected output for one outreach contact."""
+    model_config = ConfigDict(extra="allow")
+
+    name: str
+    title: str = ""
+    email: str
+    linkedin: str = ""
+    linkedin_profile_summary: str = ""
+    connection_points: str = ""
+    linkedin_note: str
+    cold_email: str
+
+
+# strict=False lets raw newlines/tabs inside strings through, which LLMs emit all the time
+_decoder = json.JSONDecoder(strict=False)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_FENCE = re.compile(r"```(?:json|JSON)?")
+
+
+def iter_json_values(text):
+    """
+    Yields every top-level JSON object/array embedded in text, left to right.
+    Tolerates markdown fences, prose around the JSON and trailing commas.
+    """
+    text = _FENCE.sub("", text or "")
+    cleaned = _TRAILING_COMMA.sub(r"\1", text)
+    for candidate in ((text, cleaned) if cleaned != text else (text,)):
+        pos = 0
+        while True:
+            starts = [idx for idx in (candidate.find("{", pos), candidate.find("[", pos)) if idx != -1]
+            if not starts:
+                break
+            start = min(starts)
+            try:
+                value, end = _decoder.raw_decode(candidate, start)
+            except json.JSONDecodeError:
+                pos = start + 1
+                continue
+            yield value
+            pos = end
+
+
+def extract_json(text, expected_type):
+    """Returns the first embedded JSON value of expected_type (dict or list), or None."""
+    for value in iter_json_values(text):
+        if isinstance(value, expected_type):
+            return value
+    return None
+
+
+def repair_output(llm, raw_output, schema, error):
+    """
+    Single bounded repair re-prompt: asks the model to re-emit its output as valid JSON.
+    Returns the repaired text, or None when repair is disabled or fails.
+    """
+    if llm is None or os.getenv("OUTPUT_REPAIR_ENABLED", "true").lower() in ("0", "false", "no", "off"):
+        return None
+
+    max_chars = int(os.getenv("OUTPUT_REPAIR_MAX_CHARS", "20000"))
+    prompt = (
+        "The text below was supposed to be valid JSON matching this JSON schema:\n"
+        f"{json.dumps(schema)}\n\n"
+        f"It could not be used because: {error}\n\n"
+        "Return ONLY the corrected JSON (no markdown, no commentary). "
+        "Keep all content; only fix the structure.\n\n"
+        f"TEXT:\n{(raw_output or '')[:max_chars]}"
+    )
+
+    logger.info(f"🔧 Attempting one repair re-prompt ({error})")
+    try:
+        record_upstream_call("llm_repair")
+        # Bounded by the parsing budget inside an application deadline
+        repaired, finished = run_within("parsing", llm.call, [{"role": "user", "content": prompt}])
+        return repaired if finished else None
+    except Exception as e:
+        logger.error(f"❌ Repair re-prompt failed: {type(e).__name__}: {str(e)}")
+        return None
+
+
+def _validate_resume(raw_output):
+    data = extract_json(raw_output, dict)
+    if data is None:
+        return None, "no JSON object found"
+    try:
+        return ResumeOutput.model_validate(data), None
+    except ValidationError as e:
+        return None, f"schema validation failed: {e.errors()[0]['msg']} ({e.errors()[0]['loc']})"
+
+
+def _validate_contacts(raw_output, overrides=None):
+    data = extract_json(raw_output, list)
+    if data is None:
+        data = extract_json(raw_output, dict)
+        if data is None:
+            return [], "no JSON array found"
+        if "error" in data:
+            # The "no contacts found" task answers with an error object - nothing to repair
+            return [], None
+        data = [data]
+
+    contacts = []
+    errors = []
+    for item in data:
+        if overrides and isinstance(item, dict):
+            item = {**item, **overrides}
+        try:
+            contacts.append(OutreachContact.model_validate(item).model_dump())
+        except ValidationError as e:
+            errors.append(e.errors()[0]["msg"])
+    if errors:
+        logger.warning(f"⚠️  Dropped {len(errors)} invalid outreach item(s): {errors[0]}")
+    if not contacts and data:
+        return [], f"no valid contacts ({errors[0] if errors else 'empty'})"
+    return contacts, None
+
+
+def parse_resume_output(raw_output, llm=None):
+    """
+    Parses the resume task output into tailored_resume / cover_letter fields.
+    Falls back to the raw text as the resume when the output cannot be parsed or repaired.
+    """
+    with span("output_parsing", task="resume") as attrs:
+        resume, error = _validate_resume(raw_output)
+        if error:
+            logger.warning(f"Error parsing resume JSON: {error}")
+            attrs["repaired"] = True
+            repaired = repair_output(llm, raw_output, ResumeOutput.model_json_schema(), error)
+            if repaired:
+                resume, error = _validate_resume(repaired)
+
+    if resume is None:
+        return {"tailored_resume": _FENCE.sub("", raw_output or "").strip(), "cover_letter": None}
+    return resume.model_dump()
+
+
+def parse_outreach_output(raw_output, llm=None):
+    """Parses the outreach task output into a list of validated contact dicts."""
+    with span("output_parsing", task="outreach") as attrs:
+        contacts, error = _validate_contacts(raw_output)
+        if error:
+            logger.warning(f"Error parsing outreach JSON: {error}")
+            logger.debug(f"Failed to parse: {(raw_output or '')[:500]}")
+            attrs["repaired"] = True
+            schema = {"type": "array", "items": OutreachContact.model_json_schema()}
+            repaired = repair_output(llm, raw_output, schema, error)
+            if repaired:
+                contacts, error = _validate_contacts(repaired)
+    return contacts
+
+
+def parse_contact_output(raw_output, llm=None, contact=None):
+    """
+    Parses a single-contact outreach output (fan-out mode) into a dict, or None.
+    Fields given in contact (the Hunter.io record) always override what the model wrote.
+    """
+    overrides = {key: contact[key] for key in ("name", "title", "email", "linkedin") if key in contact} if contact else None
+    with span("output_parsing", task="contact") as attrs:
+        contacts, error = _validate_contacts(raw_output, overrides)
+        if error:
+            logger.warning(f"Error parsing contact JSON: {error}")
+            attrs["repaired"] = True
+            repaired = repair_output(llm, raw_output, OutreachContact.model_json_schema(), error)
+            if repaired:
+                contacts, error = _validate_contacts(repaired, overrides)
+    return contacts[0] if contacts else None
@@ -0,0 +1,465 @@
+from crewai import Crew, Process
+from agents.resume_agent import resume_tailoring_agent
+from agents.outreach_agent import outreach_agent
+from tasks.resume_tasks import create_resume_tailoring_task, render_resume_tailoring_prompt
+from tasks.outreach_tasks import (
+    create_outreach_task,
+    create_contact_outreach_task,
+    get_outreach_contacts,
+    prefetch_contact_profiles,
+    format_profile_text
+)
+from services.call_stats import submit_in_context, track_upstream_calls
+from services.logging_setup import crew_verbose
+from services.metrics import span, trace_spans
+from services.llm_cache import llm_result_cache, llm_cache_enabled, make_llm_cache_key
+from services.progress import listen_progress, emit_progress
+from services.batch import shared
+from services.single_flight import single_flight
+from services.resume_profile import resume_profile
+from services.model_routing import llm_for
+from services.deadline import DEADLINE_GRACE, DeadlineExceeded, check_deadline, current_deadline, deadline_scope, run_within
+from services.contact_providers import normalize_company_name
+from services.output_parser import parse_resume_output, parse_outreach_output, parse_contact_output
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+import hashlib
+import logging
+import os
+import json
+import time
+
+logger = logging.getLogger(__name__)
+
+# "parallel" runs the resume and outreach branches as separate crews at the same time,
+# "sequential" keeps the original single-crew Process.sequential behaviour.
+DEFAULT_EXECUTION_MODE = "parallel"
+
+# "fanout" gives every contact its own small outreach task (run with bounded parallelism),
+# "single" keeps one outreach task that handles all contacts in one prompt.
+DEFAULT_OUTREACH_MODE = "fanout"
+
+# Identical applications submitted while one is already running wait for it instead of starting new crews
+application_flight = single_flight("application")
+
+# JSON repair re-prompts are short structural fixes, routed to the fast model by default
+repair_llm = llm_for("output_repair")
+
+
+def _resume_cache_key(job_description, base_resume):
+    # Keyed on the prompt the agent would actually receive (budgets, keyword block, resume format)
+    description, expected_output, _ = render_resume_tailoring_prompt(job_description, base_resume)
+    return make_llm_cache_key(
+        "resume_tailoring",
+        resume_tailoring_agent.llm,
+        description=description,
+        expected_output=expected_output,
+        role=resume_tailoring_agent.role,
+        goal=resume_tailoring_agent.goal,
+        backstory=resume_tailoring_agent.backstory
+    )
+
+
+def get_cached_resume_output(job_description, base_resume, use_cache=None):
+    """Returns the memoized resume output (JSON text) for identical inputs, or None."""
+    if not llm_cache_enabled(use_cache):
+        return None
+    cached = llm_result_cache.get(_resume_cache_key(job_description, base_resume))
+    if cached is not None:
+        logger.info("⚡ Resume tailoring cache hit - skipping model call")
+    return cached
+
+
+def store_resume_output(job_description, base_resume, resume, use_cache=None):
+    """Memoizes a parsed resume output, but only if it validated (never cache a broken answer)."""
+    if not llm_cache_enabled(use_cache) or resume is None or resume["cover_letter"] is None:
+        return
+    llm_result_cache.set(_resume_cache_key(job_description, base_resume), json.dumps(resume))
+
+
+def _emit_outreach(contacts):
+    for index, contact in enumerate(contacts):
+        emit_progress("contact", {"index": index, "total": len(contacts), "contact": contact})
+
+
+def _step_callback(branch):
+    """CrewAI step callback that reports agent progress (tool calls, thoughts) for a branch."""
+    def on_step(step):
+        emit_progress("step", {"branch": branch, "type": type(step).__name__})
+    return on_step
+
+
+def create_streaming_resume_task(agent, job_description, base_resume, parsed):
+    """
+    Resume task whose completion callback parses the output once (into parsed["resume"])
+    and streams the resume/cover letter right away.
+    """
+    resume_task = create_resume_tailoring_task(agent, job_description, base_resume)
+
+    def on_complete(output):
+        parsed["resume"] = parse_resume_output(output.raw, llm=repair_llm)
+        emit_progress("resume", parsed["resume"])
+
+    resume_task.callback = on_complete
+    return resume_task
+
+
+def create_streaming_outreach_task(agent, company_name, role, base_resume, parsed):
+    """
+    Outreach task whose completion callback parses the output once (into parsed["outreach"])
+    and streams each contact's messages.
+    """
+    outreach_task = create_outreach_task(agent, company_name, role, base_resume)
+
+    def on_complete(output):
+        parsed["outreach"] = parse_outreach_output(output.raw, llm=repair_llm)
+        _emit_outreach(parsed["outreach"])
+
+    outreach_task.callback = on_complete
+    return outreach_task
+
+
+def run_resume_branch(job_description, base_resume, use_cache=None):
+    """
+    Runs the resume tailoring task in its own crew and returns the parsed output.
+    Identical resume/job description pairs inside a batch share one run.
+    """
+    return shared(
+        ("resume", _resume_cache_key(job_description, base_resume), use_cache),
+        lambda: _run_resume_crew(job_description, base_resume, use_cache)
+    )
+
+
+def _run_resume_crew(job_description, base_resume, use_cache=None):
+    cached = get_cached_resume_output(job_description, base_resume, use_cache)
+    if cached is not None:
+        resume = parse_resume_output(cached)
+        emit_progress("resume", resume)
+        return resume
+
+    parsed = {}
+    # Each concurrent crew needs its own agent instance (agents keep per-run executor state)
+    agent = resume_tailoring_agent.copy()
+    resume_task = create_streaming_resume_task(agent, job_description, base_resume, parsed)
+    crew = Crew(
+        agents=[agent],
+        tasks=[resume_task],
+        process=Process.sequential,
+        step_callback=_step_callback("resume"),
+        verbose=crew_verbose()
+    )
+    crew_output = crew.kickoff()
+    resume = parsed.get("resume") or parse_resume_output(crew_output.tasks_output[0].raw, llm=repair_llm)
+    store_resume_output(job_description, base_resume, resume, use_cache)
+    return resume
+
+
+def run_contact_outreach(company_name, role, base_resume, contact, profile_text=None):
+    """Runs the outreach task for one contact and returns the parsed contact dict."""
+    check_deadline("contact_outreach")
+    # Each concurrent crew needs its own agent instance (agents keep per-run executor state)
+    agent = outreach_agent.copy()
+    contact_task = create_contact_outreach_task(agent, company_name, role, base_resume, contact, profile_text)
+    crew = Crew(
+        agents=[agent],
+        tasks=[contact_task],
+        process=Process.sequential,
+        step_callback=_step_callback("outreach"),
+        verbose=crew_verbose()
+    )
+    # Contact details always come from Hunter.io, never from the model
+    result = parse_contact_output(crew.kickoff().tasks_output[0].raw, llm=repair_llm, contact=contact)
+    if result is None:
+        raise ValueError(f"Could not parse outreach output for {contact.get('name')}")
+    return result
+
+
+def run_outreach_fanout(company_name, role, base_resume):
+    """
+    Per-contact fan-out: one small task per contact, run with bounded parallelism.
+    Results keep the Hunter.io order; a failed contact is dropped without losing the others.
+    Returns (contacts, finished): finished is False when the outreach budget ran out first.
+    """
+    contacts = get_outreach_contacts(company_name, role, limit=5)
+    if not contacts:
+        logger.warning(f"❌ No real contacts found from Hunter.io for {company_name}, skipping outreach")
+        return [], True
+
+    # All profile pages are fetched in parallel up front instead of inside each agent loop
+    profiles = prefetch_contact_profiles(contacts)
+
+    concurrency = int(os.getenv("OUTREACH_FANOUT_CONCURRENCY", "3"))
+    results = [None] * len(contacts)
+    deadline = current_deadline()
+    finished = True
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(contacts))), thread_name_prefix="contact-outreach")
+    futures = {
+        submit_in_context(
+            executor, run_contact_outreach, company_name, role, base_resume, contact, format_profile_text(contact, profiles)
+        ): index
+        for index, contact in enumerate(contacts)
+    }
+    try:
+        # Contacts finished within the outreach budget are kept; the rest are dropped
+        for future in as_completed(futures, timeout=deadline.budget("outreach") if deadline else None):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                logger.warning(f"⚠️  Dropping contact {contacts[index].get('name')}: {type(e).__name__}: {str(e)}")
+                continue
+            emit_progress("contact", {"index": index, "total": len(contacts), "contact": results[index]})
+    except FutureTimeoutError:
+        finished = False
+        logger.warning(f"⏱️  Outreach budget ran out with {sum(1 for f in futures if not f.done())} contacts unfinished")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return [result for result in results if result is not None], finished
+
+
+def run_outreach_branch(company_name, role, base_resume):
+    """
+    Runs the outreach task in its own crew and returns (parsed contacts, finished).
+    The Hunter.io lookups happen while building the task, so they are part of this branch.
+    """
+    if os.getenv("OUTREACH_MODE", DEFAULT_OUTREACH_MODE) == "fanout":
+        return run_outreach_fanout(company_name, role, base_resume)
+
+    parsed = {}
+    agent = outreach_agent.copy()
+    outreach_task = create_streaming_outreach_task(agent, company_name, role, base_resume, parsed)
+    crew = Crew(
+        agents=[agent],
+        tasks=[outreach_task],
+        process=Process.sequential,
+        step_callback=_step_callback("outreach"),
+        verbose=crew_verbose()
+    )
+    crew_output = crew.kickoff()
+    if "outreach" in parsed:
+        return parsed["outreach"], True
+    return parse_outreach_output(crew_output.tasks_output[0].raw, llm=repair_llm), True
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    with span(fn.__name__):
+        result = fn(*args)
+    return result, round(time.perf_counter() - start, 3)
+
+
+def _branch_result(name, future, timeout):
+    """
+    (result, seconds, error) of a branch. result and seconds are None when it ran out of time
+    (error None) or raised (error is the exception's summary); the other branch is unaffected.
+    """
+    try:
+        result, seconds = future.result(timeout=timeout)
+        return result, seconds, None
+    except (FutureTimeoutError, DeadlineExceeded):
+        logger.warning(f"⏱️  The {name} branch did not finish within its budget")
+        return None, None, None
+    except Exception as e:
+        logger.error(f"❌ The {name} branch failed: {type(e).__name__}: {str(e)}")
+        return None, None, f"{type(e).__name__}: {str(e)}"
+
+
+def run_parallel(base_resume, job_description, company_name, role, use_cache=None):
+    """
+    Runs both branches at once on a thread pool.
+    End-to-end latency is roughly the slower branch instead of the sum of both.
+    Inside a deadline each branch is waited for at most its budget; one that runs out or raises
+    is reported as incomplete (and failed, with its error) and the other one's result is still returned.
+    """
+    start = time.perf_counter()
+    deadline = current_deadline()
+
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="crew-branch")
+    resume_future = submit_in_context(executor, _timed, run_resume_branch, job_description, base_resume, use_cache)
+    outreach_future = submit_in_context(executor, _timed, run_outreach_branch, company_name, role, base_resume)
+    executor.shutdown(wait=False)
+
+    if deadline is not None:
+        deadline.start_stage("resume")
+        deadline.start_stage("outreach")
+    resume, resume_seconds, resume_error = _branch_result(
+        "resume", resume_future, deadline.budget("resume") if deadline else None
+    )
+    # The outreach fan-out returns the contacts it finished when its budget runs out, given a moment
+    outreach, outreach_seconds, outreach_error = _branch_result(
+        "outreach", outreach_future, deadline.budget("outreach") + DEADLINE_GRACE if deadline else None
+    )
+    errors = {name: error for name, error in (("resume", resume_error), ("outreach", outreach_error)) if error}
+    incomplete = [name for name, seconds in (("resume", resume_seconds), ("outreach", outreach_seconds)) if seconds is None]
+    if outreach is not None:
+        outreach, outreach_finished = outreach
+        if not outreach_finished:
+            # Returned in time, but only with the contacts finished before the outreach budget ran out
+            incomplete.append("outreach")
+
+    return {
+        "resume": resume,
+        "outreach": outreach,
+        "incomplete": incomplete,
+        "failed": errors,
+        "timings": {
+            "mode": "parallel",
+            "resume_seconds": resume_seconds,
+            "outreach_seconds": outreach_seconds,
+            "total_seconds": round(time.perf_counter() - start, 3)
+        }
+    }
+
+
+def run_sequential(base_resume, job_description, company_name, role, use_cache=None):
+    """Runs both tasks in a single crew with Process.sequential (original behaviour)."""
+    start = time.perf_counter()
+
+    # A memoized resume output removes the resume task from the crew entirely
+    cached_resume = get_cached_resume_output(job_description, base_resume, use_cache)
+
+    parsed = {}
+    tasks = []
+    agents = []
+    if cached_resume is None:
+        # Per-run agent copies, so concurrent jobs never share an agent executor
+        resume_agent = resume_tailoring_agent.copy()
+        tasks.append(create_streaming_resume_task(resume_agent, job_description, base_resume, parsed))
+        agents.append(resume_agent)
+    else:
+        parsed["resume"] = parse_resume_output(cached_resume)
+        emit_progress("resume", parsed["resume"])
+    agent = outreach_agent.copy()
+    outreach_task, setup_seconds = _timed(create_streaming_outreach_task, agent, company_name, role, base_resume, parsed)
+    tasks.append(outreach_task)
+    agents.append(agent)
+
+    job_application_crew = Crew(
+        agents=agents,
+        tasks=tasks,
+        process=Process.sequential,
+        step_callback=_step_callback("crew"),
+        verbose=crew_verbose()
+    )
+    # One crew runs both tasks: out of time, keep whichever task callback already delivered
+    _, finished = run_within("crew", job_application_crew.kickoff)
+
+    if cached_resume is None:
+        store_resume_output(job_description, base_resume, parsed.get("resume"), use_cache)
+
+    return {
+        "resume": parsed.get("resume"),
+        "outreach": parsed.get("outreach"),
+        "incomplete": [] if finished else [name for name in ("resume", "outreach") if parsed.get(name) is None],
+        "timings": {
+            "mode": "sequential",
+            "outreach_setup_seconds": setup_seconds,
+            "total_seconds": round(time.perf_counter() - start, 3)
+        }
+    }
+
+
+def application_key(base_resume, job_description, company_name, role, mode, use_cache):
+    """Identity of an application run: whitespace/case-insensitive where it does not change the output."""
+    parts = [
+        " ".join((base_resume or "").split()),
+        " ".join((job_description or "").split()),
+        normalize_company_name(company_name),
+        " ".join((role or "").lower().split()),
+        mode,
+        str(use_cache)
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def run_application(base_resume, job_description, company_name, role, mode=None, use_cache=None, on_event=None):
+    """
+    Runs the application crews in the requested (or configured) execution mode.
+    use_cache=False bypasses the LLM result cache for this run.
+    on_event(event, data) receives progress events (resume, contacts_found, contact, step)
+    as soon as each piece of work completes.
+    The per-stage spans of the run are returned in run_result["trace"].
+    An identical application already in flight is joined instead of run again: its events are
+    replayed to on_event and its result is returned with run_result["coalesced"] = True.
+    The run is bounded by APPLICATION_DEADLINE (and per-stage budgets, see services/deadline.py):
+    run_result["status"] is "complete", "partial" or "timed_out" and run_result["incomplete"]
+    names the branches that ran out of time.
+    """
+    mode = mode or os.getenv("CREW_EXECUTION_MODE", DEFAULT_EXECUTION_MODE)
+    key = application_key(base_resume, job_description, company_name, role, mode, use_cache)
+    run_result, coalesced = application_flight.do_with_events(
+        key,
+        lambda emit: _run_application(base_resume, job_description, company_name, role, mode, use_cache, emit),
+        on_event
+    )
+    if coalesced:
+        logger.info(f"🔗 Joined an in-flight application for {company_name} / {role}")
+        return {**run_result, "coalesced": True}
+    return run_result
+
+
+def _run_application(base_resume, job_description, company_name, role, mode, use_cache, on_event):
+    with track_upstream_calls() as upstream_calls, listen_progress(on_event), trace_spans() as trace, \
+            deadline_scope() as deadline:
+        try:
+            with span("application", mode=mode):
+                # Parse (or load) the resume profile once, before both branches need it
+                resume_profile(base_resume)
+                if mode == "sequential":
+                    run_result = run_sequential(base_resume, job_description, company_name, role, use_cache)
+                else:
+                    run_result = run_parallel(base_resume, job_description, company_name, role, use_cache)
+        finally:
+            # Whatever is still running for this application stops at its next cancellation point
+            deadline.cancel()
+    run_result["status"] = application_status(run_result)
+    run_result["upstream_calls"] = upstream_calls.as_dict()
+    run_result["trace"] = trace.as_list()
+    return run_result
+
+
+def application_status(run_result):
+    """
+    "complete", "partial" (some branch ran out of time or failed), "failed" (nothing finished and a
+    branch raised) or "timed_out" (nothing finished in time).
+    """
+    incomplete = run_result.get("incomplete") or []
+    if not incomplete:
+        return "complete"
+    if run_result.get("resume") is None and not run_result.get("outreach"):
+        return "failed" if run_result.get("failed") else "timed_out"
+    return "partial"
+
+
+def build_response(run_result, include_trace=False):
+    """
+    Merges the branch outputs into the /api/process-application response shape.
+    include_trace adds the per-stage timing trace (debug mode).
+    """
+    # Structure the response properly
+    response = {
+        "tailored_resume": None,
+        "cover_letter": None,
+        "outreach": [],
+        "timings": run_result["timings"],
+        "upstream_calls": run_result.get("upstream_calls", {}),
+        "status": run_result.get("status", "complete"),
+        "incomplete": run_result.get("incomplete", []),
+        "failed": run_result.get("failed", {})
+    }
+    if run_result.get("coalesced"):
+        response["coalesced"] = True
+
+    # Resume and cover letter from the resume branch (already parsed and validated)
+    if run_result["resume"] is not None:
+        response.update(run_result["resume"])
+
+    # Outreach contacts from the outreach branch
+    if run_result["outreach"] is not None:
+        response["outreach"] = run_result["outreach"]
+
+    if include_trace:
+        response["trace"] = run_result.get("trace", [])
+
+    return response
@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.call_stats import submit_in_context
+from services.contact_providers import company_domain_hint, normalize_company_name
+from services.deadline import current_deadline
+from services.role_classifier import classify_department
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_TTL = int(os.getenv("PREFETCH_TTL", "600"))
+PREFETCH_DEBOUNCE = float(os.getenv("PREFETCH_DEBOUNCE", "1.5"))
+PREFETCH_SESSION_LIMIT = int(os.getenv("PREFETCH_SESSION_LIMIT", "10"))
+PREFETCH_SESSION_WINDOW = int(os.getenv("PREFETCH_SESSION_WINDOW", "3600"))
+# Server-wide cap on prefetches per 24 hours: session ids are client-chosen, so the per-session
+# cap alone does not bound Hunter.io spend
+PREFETCH_DAILY_LIMIT = int(os.getenv("PREFETCH_DAILY_LIMIT", "200"))
+# How long a real application waits for a prefetch of the same company that is still running
+PREFETCH_WAIT = float(os.getenv("PREFETCH_WAIT", "20"))
+
+
+def prefetch_key(company_name, role):
+    return (company_domain_hint(company_name) or normalize_company_name(company_name), classify_department(role))
+
+
+class _Entry:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.expires_at = None
+
+
+class Prefetcher:
+    """
+    Speculative contact lookups started while the user is still filling in the form.
+    Requests are debounced per session (only the last company/role typed within
+    PREFETCH_DEBOUNCE seconds runs), capped at PREFETCH_SESSION_LIMIT runs per session
+    per PREFETCH_SESSION_WINDOW and at PREFETCH_DAILY_LIMIT runs per day across all sessions,
+    so typing never burns Hunter.io quota.
+    Results live in memory for PREFETCH_TTL seconds; the outreach task picks them up with warm().
+    """
+
+    def __init__(self, workers=None):
+        self.scheduled = 0
+        self.debounced = 0
+        self.limited = 0
+        self.completed = 0
+        self.failed = 0
+        self.hits = 0
+        self._entries = {}
+        self._profiles = {}
+        self._timers = {}
+        self._session_runs = {}
+        self._daily_runs = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or int(os.getenv("PREFETCH_WORKERS", "2")), thread_name_prefix="prefetch"
+        )
+
+    def _prune(self, now):
+        for key, entry in list(self._entries.items()):
+            if entry.expires_at is not None and entry.expires_at < now:
+                del self._entries[key]
+        for url, (_, expires_at) in list(self._profiles.items()):
+            if expires_at < now:
+                del self._profiles[url]
+        for session, runs in list(self._session_runs.items()):
+            runs[:] = [started for started in runs if now - started < PREFETCH_SESSION_WINDOW]
+            if not runs:
+                del self._session_runs[session]
+        self._daily_runs[:] = [started for started in self._daily_runs if now - started < 24 * 3600]
+
+    def _over_limit(self, session):
+        return (
+            len(self._session_runs.get(session, [])) >= PREFETCH_SESSION_LIMIT
+            or len(self._daily_runs) >= PREFETCH_DAILY_LIMIT
+        )
+
+    def request(self, session, company_name, role):
+        """
+        Schedules a prefetch for company/role after the debounce delay.
+        Returns "warm", "in_progress", "scheduled" or "limited".
+        """
+        key = prefetch_key(company_name, role)
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                return "warm" if entry.done.is_set() else "in_progress"
+            if self._over_limit(session):
+                self.limited += 1
+                return "limited"
+
+            pending = self._timers.pop(session, None)
+            if pending is not None:
+                pending.cancel()
+                self.debounced += 1
+            timer = threading.Timer(PREFETCH_DEBOUNCE, self._start, (session, key, company_name, role))
+            timer.daemon = True
+            self._timers[session] = timer
+        timer.start()
+        return "scheduled"
+
+    def _start(self, session, key, company_name, role):
+        with self._lock:
+            if self._timers.get(session) is threading.current_thread():
+                del self._timers[session]
+            self._prune(time.time())
+            if key in self._entries or self._over_limit(session):
+                return
+            self._session_runs.setdefault(session, []).append(time.time())
+            self._daily_runs.append(time.time())
+            entry = self._entries[key] = _Entry()
+            self.scheduled += 1
+        submit_in_context(self._executor, self._run, key, entry, company_name, role)
+
+    def _run(self, key, entry, company_name, role):
+        # Imported here: the outreach tasks pull in crewai, which the web process loads lazily
+        from tasks.outreach_tasks import prefetch_outreach
+
+        logger.info(f"🔮 Prefetching contacts for {company_name} / {role}")
+        try:
+            result = prefetch_outreach(company_name, role)
+        except Exception as e:
+            logger.warning(f"⚠️  Prefetch for {company_name} failed: {type(e).__name__}: {str(e)}")
+            with self._lock:
+                self.failed += 1
+                self._entries.pop(key, None)
+            entry.done.set()
+            return
+
+        now = time.time()
+        with self._lock:
+            self.completed += 1
+            entry.result = result
+            entry.expires_at = now + PREFETCH_TTL
+            for url, text in result.get("profiles", {}).items():
+                if text:
+                    self._profiles[url] = (text, now + PREFETCH_TTL)
+        entry.done.set()
+        logger.info(f"✅ Prefetched {len(result.get('contacts', []))} contacts for {company_name}")
+
+    def warm(self, company_name, role, wait=PREFETCH_WAIT):
+        """
+        The prefetched contacts for company/role, or None. A prefetch that is still running
+        is waited for (up to wait seconds, and never past the run's Hunter.io budget) - it is
+        already doing the lookup the caller needs.
+        """
+        deadline = current_deadline()
+        if deadline is not None:
+            wait = min(wait, deadline.budget("hunter"))
+        with self._lock:
+            entry = self._entries.get(prefetch_key(company_name, role))
+        if entry is None or not entry.done.wait(wait):
+            return None
+        with self._lock:
+            if entry.result is None or entry.expires_at < time.time():
+                return None
+            self.hits += 1
+        return [dict(contact) for contact in entry.result["contacts"]]
+
+    def profiles(self, urls):
+        """{url: profile text} for the urls a recent prefetch already scraped."""
+        now = time.time()
+        with self._lock:
+            return {
+                url: self._profiles[url][0] for url in urls
+                if url in self._profiles and self._profiles[url][1] >= now
+            }
+
+    def stats(self):
+        with self._lock:
+            return {
+                "scheduled": self.scheduled,
+                "debounced": self.debounced,
+                "limited": self.limited,
+                "completed": self.completed,
+                "failed": self.failed,
+                "hits": self.hits,
+                "daily_runs": len(self._daily_runs),
+                "entries": len(self._entries),
+                "pending": len(self._timers)
+            }
+
+
+prefetcher = Prefetcher()
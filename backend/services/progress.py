@@ -0,0 +1,30 @@
+import contextvars
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_current_listener = contextvars.ContextVar("progress_listener", default=None)
+
+
+@contextmanager
+def listen_progress(on_event):
+    """
+    Routes progress events emitted inside this block to on_event(event, data).
+    """
+    token = _current_listener.set(on_event)
+    try:
+        yield
+    finally:
+        _current_listener.reset(token)
+
+
+def emit_progress(event, data):
+    """Sends a progress event to the current listener, if any. Listener errors never break a run."""
+    on_event = _current_listener.get()
+    if on_event is None:
+        return
+    try:
+        on_event(event, data)
+    except Exception as e:
+        logger.warning(f"⚠️  Progress listener failed for '{event}': {type(e).__name__}: {str(e)}")
@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import re
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate (~4 characters per token for English prose). Good enough to
+# measure and bound prompt size without pulling a tokenizer into the request path.
+CHARS_PER_TOKEN = 4
+
+RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", "2500"))
+JOB_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("PROMPT_JOB_TOKEN_BUDGET", "2000"))
+
+# Section headings and how much they matter to the LLM (higher = kept longer)
+SECTION_WEIGHTS = [
+    (re.compile(r"responsibilit|what you.?ll do|the role|duties", re.I), 3.0),
+    (re.compile(r"requirement|qualification|what you.?ll need|must have|skills|experience", re.I), 3.0),
+    (re.compile(r"preferred|nice to have|bonus|plus", re.I), 2.0),
+    (re.compile(r"project|education|certification|summary|profile", re.I), 2.0),
+    (re.compile(r"about (us|the company|the team)|who we are|our mission|company overview", re.I), 0.5),
+    (re.compile(r"benefit|perks|compensation|salary|what we offer", re.I), 0.4),
+    (re.compile(r"hobbies|interests|references", re.I), 0.3),
+    (re.compile(r"equal opportunity|eeo|diversity|accommodation|privacy|e-verify", re.I), 0.1),
+]
+
+# Boilerplate lines that carry no signal for tailoring
+BOILERPLATE_PATTERNS = re.compile(
+    r"(equal opportunity employer|without regard to (race|color)|reasonable accommodation|"
+    r"e-verify|privacy (notice|policy)|applicants? (with disabilities|must be authorized)|"
+    r"we do not accept unsolicited|recruitment agencies|#li-\w+)",
+    re.I
+)
+
+_BULLETS = re.compile(r"^[\s]*[•▪●◦■□➢►·*–—]+\s*", re.M)
+_HEADING = re.compile(r"^[A-Za-z][A-Za-z &/'()-]{1,60}:?$")
+
+
+def count_tokens(text):
+    """Approximate token count of a prompt string."""
+    if not text:
+        return 0
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def clean_text(text):
+    """Normalizes pasted text: unicode, bullets, whitespace runs and blank lines."""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text)
+    text = "".join(ch for ch in text if ch in "\n\t" or unicodedata.category(ch)[0] != "C")
+    text = _BULLETS.sub("- ", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r" *\n *", "\n", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def strip_boilerplate(text):
+    """Drops legal/EEO/recruiting boilerplate lines."""
+    return "\n".join(line for line in text.split("\n") if not BOILERPLATE_PATTERNS.search(line))
+
+
+def _is_heading(line):
+    line = line.strip()
+    if not line or len(line) > 60 or not _HEADING.match(line):
+        return False
+    return line.endswith(":") or line.isupper() or any(pattern.search(line) for pattern, _ in SECTION_WEIGHTS)
+
+
+def split_sections(text):
+    """Splits text into [(heading, body)] using heading-like lines; the preamble has heading ''."""
+    sections = [["", []]]
+    for line in text.split("\n"):
+        if _is_heading(line):
+            sections.append([line.strip(), []])
+        else:
+            sections[-1][1].append(line)
+    return [(heading, "\n".join(lines).strip()) for heading, lines in sections if heading or "".join(lines).strip()]
+
+
+def section_weight(heading):
+    for pattern, weight in SECTION_WEIGHTS:
+        if pattern.search(heading):
+            return weight
+    return 1.0
+
+
+def _keywords(text):
+    return set(re.findall(r"[a-z][a-z+#.]{2,}", (text or "").lower()))
+
+
+def trim_to_budget(text, budget, reference=None, keep_first=True):
+    """
+    Drops the lowest-relevance sections until text fits in `budget` tokens.
+    Relevance = heading weight x keyword overlap with `reference` (e.g. the job description).
+    The first section (resume header / job title) is kept when keep_first is set.
+    """
+    if count_tokens(text) <= budget:
+        return text
+
+    sections = split_sections(text)
+    reference_words = _keywords(reference)
+
+    def relevance(index):
+        heading, body = sections[index]
+        score = section_weight(heading)
+        if reference_words:
+            words = _keywords(body)
+            score *= 0.5 + len(words & reference_words) / max(1, len(words))
+        return score
+
+    order = sorted(range(len(sections)), key=relevance)
+    dropped = set()
+    total = count_tokens(text)
+    for index in order:
+        if total <= budget:
+            break
+        if keep_first and index == 0:
+            continue
+        dropped.add(index)
+        total -= count_tokens(sections[index][0] + "\n" + sections[index][1])
+
+    kept = [f"{heading}\n{body}".strip() for i, (heading, body) in enumerate(sections) if i not in dropped]
+    trimmed = "\n\n".join(kept)
+    # Still too long (one huge section): hard cut at the budget
+    return trimmed[:budget * CHARS_PER_TOKEN]
+
+
+def prepare_resume(base_resume, job_description=None):
+    """Cleans a pasted resume and fits it into the resume token budget."""
+    return trim_to_budget(clean_text(base_resume), RESUME_TOKEN_BUDGET, reference=job_description)
+
+
+def prepare_job_description(job_description):
+    """Cleans a pasted job description, strips boilerplate and fits it into its token budget."""
+    return trim_to_budget(strip_boilerplate(clean_text(job_description)), JOB_DESCRIPTION_TOKEN_BUDGET)
+
+
+def compact_contacts_json(contacts, fields=("name", "title", "email", "linkedin")):
+    """Compact JSON for contacts embedded in prompts (no indentation, only the fields the LLM needs)."""
+    if isinstance(contacts, dict):
+        return json.dumps({key: contacts.get(key, "") for key in fields}, separators=(",", ":"), ensure_ascii=False)
+    return json.dumps(
+        [{key: contact.get(key, "") for key in fields} for contact in contacts],
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+
+
+def log_prompt_tokens(task_name, description, expected_output="", **parts):
+    """Logs the approximate prompt size of a task and its main inputs; returns the total."""
+    total = count_tokens(description) + count_tokens(expected_output)
+    breakdown = ", ".join(f"{name} {count_tokens(value)}" for name, value in parts.items())
+    logger.info(f"📏 Prompt tokens [{task_name}]: ~{total}" + (f" ({breakdown})" if breakdown else ""))
+    return total
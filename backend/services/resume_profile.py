@@ -0,0 +1,245 @@
+import hashlib
+import logging
+import os
+import re
+
+from services.cache import SQLiteCache
+from services.metrics import span
+from services.prompt_budget import RESUME_TOKEN_BUDGET, clean_text, prepare_resume, split_sections, trim_to_budget
+
+logger = logging.getLogger(__name__)
+
+# Parsed profiles keyed by resume content hash: a resume reused across jobs is parsed once
+resume_profile_cache = SQLiteCache(
+    "resume_profiles",
+    default_ttl=int(os.getenv("RESUME_PROFILE_CACHE_TTL", str(30 * 24 * 3600))),
+    max_entries=int(os.getenv("RESUME_PROFILE_CACHE_MAX_ENTRIES", "1000"))
+)
+
+# Bump when the profile shape or parsing rules change, so old cached profiles are not reused
+PROFILE_VERSION = 2
+
+SECTION_KINDS = [
+    ("summary", re.compile(r"summary|profile|objective|about me", re.I)),
+    ("skills", re.compile(r"skill|technolog|tools|competenc|tech stack", re.I)),
+    ("projects", re.compile(r"project", re.I)),
+    ("experience", re.compile(r"experience|employment|work history|career", re.I)),
+    ("education", re.compile(r"education|certification|degree|training", re.I)),
+]
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"\+?\(?\d[\d\s().-]{7,}\d")
+_URL = re.compile(r"(?:https?://)?(?:www\.)?(?:linkedin\.com|github\.com|gitlab\.com)/[\w./-]+|https?://[\w./-]+", re.I)
+_SKILL_SPLIT = re.compile(r"\s*[,;|•·]\s*|\s+/\s+")
+
+
+def resume_hash(base_resume):
+    return hashlib.sha256(clean_text(base_resume).encode("utf-8")).hexdigest()
+
+
+def _section_kind(heading):
+    for kind, pattern in SECTION_KINDS:
+        if pattern.search(heading):
+            return kind
+    return None
+
+
+def _is_section_heading(heading):
+    """Real section headings ("Work Experience", "SKILLS:") as opposed to lines like "Project Manager"."""
+    heading = heading.strip().rstrip(":")
+    words = heading.split()
+    return bool(words) and (heading.isupper() or (len(words) <= 4 and _section_kind(words[-1]) is not None))
+
+
+def _sections(text):
+    sections = []
+    for heading, body in split_sections(text):
+        if heading and not sections and _looks_like_name(heading):
+            # An all-caps name line at the top ("JANE DOE") is the header, not a section
+            sections.append(("", "\n".join(filter(None, [heading, body]))))
+        elif heading and sections and not _is_section_heading(heading):
+            # Not a section heading after all: keep the line inside the current section
+            previous_heading, previous_body = sections[-1]
+            sections[-1] = (previous_heading, "\n".join(filter(None, [previous_body, heading, body])))
+        else:
+            sections.append((heading, body))
+    return sections
+
+
+def _looks_like_name(line):
+    words = line.split()
+    return (
+        2 <= len(words) <= 5 and len(line) <= 50
+        and not _EMAIL.search(line) and not _PHONE.search(line) and not _URL.search(line)
+        and all(re.fullmatch(r"[A-Za-zÀ-ÿ.'-]+", word) for word in words)
+        and _section_kind(line) is None
+    )
+
+
+def _strip_contacts(line):
+    """line without its emails, phones and links ("Seattle, WA | jane@x.com" -> "Seattle, WA")."""
+    for pattern in (_EMAIL, _URL, _PHONE):
+        line = pattern.sub("", line)
+    return " | ".join(part.strip() for part in re.split(r"\s*[|•·]\s*", line) if part.strip(" ,-"))
+
+
+def _entries(body):
+    """Groups a section into [{"title", "bullets"}]: non-bullet lines start a new entry."""
+    entries = []
+    for line in body.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("- "):
+            if not entries:
+                entries.append({"title": "", "bullets": []})
+            entries[-1]["bullets"].append(line[2:].strip())
+        elif entries and not entries[-1]["bullets"]:
+            # Second header line of the same entry (company / dates under the job title)
+            entries[-1]["title"] = f"{entries[-1]['title']} | {line}" if entries[-1]["title"] else line
+        else:
+            entries.append({"title": line, "bullets": []})
+    return entries
+
+
+def _skills(body):
+    skills = []
+    for line in body.split("\n"):
+        line = line.strip().lstrip("- ")
+        # "Languages: Python, Go" -> the list after the label
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        skills.extend(item.strip(" .") for item in _SKILL_SPLIT.split(line) if item.strip(" ."))
+    return list(dict.fromkeys(skills))
+
+
+def parse_resume(base_resume):
+    """
+    Parses a pasted resume into a structured profile: name, other header lines (location, headline),
+    contact details, summary, skills, experience and project entries (title + bullets), education
+    and any other sections.
+    Local and deterministic (no LLM call); sections it cannot classify are kept in "other".
+    """
+    text = clean_text(base_resume)
+    profile = {
+        "version": PROFILE_VERSION,
+        "name": "",
+        "header": [],
+        "contacts": {"emails": [], "phones": [], "links": []},
+        "summary": "",
+        "skills": [],
+        "experience": [],
+        "projects": [],
+        "education": [],
+        "other": []
+    }
+    profile["contacts"]["emails"] = list(dict.fromkeys(_EMAIL.findall(text)))
+    profile["contacts"]["links"] = list(dict.fromkeys(_URL.findall(text)))
+    # Phone numbers only from the header, where date ranges ("2018 - 2021") are unlikely
+    header = "\n".join(text.split("\n")[:6])
+    profile["contacts"]["phones"] = list(dict.fromkeys(
+        phone.strip() for phone in _PHONE.findall(header) if len(re.sub(r"\D", "", phone)) >= 9
+    ))[:2]
+
+    for heading, body in _sections(text):
+        kind = _section_kind(heading) if heading else None
+        if not heading:
+            # Resume header: the name line plus contact details (and sometimes a location or summary)
+            lines = [line.strip() for line in body.split("\n") if line.strip()]
+            name = next((line for line in lines[:3] if _looks_like_name(line)), "")
+            profile["name"] = name.title() if name.isupper() else name
+            profile["header"] = [_strip_contacts(line) for line in lines if line != name and _strip_contacts(line)]
+        elif kind == "summary":
+            profile["summary"] = " ".join(filter(None, [profile["summary"], " ".join(body.split())]))
+        elif kind == "skills":
+            profile["skills"].extend(_skills(body))
+        elif kind in ("experience", "projects"):
+            profile[kind].extend(_entries(body))
+        elif kind == "education":
+            profile["education"].extend(line.strip().lstrip("- ") for line in body.split("\n") if line.strip())
+        else:
+            profile["other"].append({"heading": heading.rstrip(":"), "lines": [line for line in body.split("\n") if line.strip()]})
+
+    profile["skills"] = list(dict.fromkeys(profile["skills"]))
+    return profile
+
+
+def resume_profile(base_resume):
+    """The structured profile of a resume, parsed once per distinct resume text and cached."""
+    key = f"resume_profile:v{PROFILE_VERSION}:{resume_hash(base_resume)}"
+    profile = resume_profile_cache.get(key)
+    if profile is not None:
+        return profile
+    with span("resume_parsing"):
+        profile = parse_resume(base_resume)
+    resume_profile_cache.set(key, profile)
+    logger.info(
+        f"🧾 Parsed resume profile: {profile['name'] or 'unknown name'}, {len(profile['skills'])} skills, "
+        f"{len(profile['experience'])} roles, {len(profile['projects'])} projects"
+    )
+    return profile
+
+
+def _format_entries(entries, max_entries=None, max_bullets=None):
+    lines = []
+    for entry in entries[:max_entries]:
+        if entry["title"]:
+            lines.append(entry["title"])
+        lines.extend(f"- {bullet}" for bullet in entry["bullets"][:max_bullets])
+    return lines
+
+
+def format_profile(profile, compact=False):
+    """
+    Renders a profile for a prompt.
+    The full form keeps every parsed fact; compact=True keeps only what outreach messages need: name, contacts, skills and the top roles, projects and bullets.
+    """
+    contacts = profile["contacts"]
+    lines = [f"NAME: {profile['name'] or '(not found)'}"]
+    lines.extend(profile["header"][:1] if compact else profile["header"])
+    if compact:
+        contact_items = contacts["emails"][:1] + contacts["phones"][:1] + contacts["links"][:2]
+    else:
+        contact_items = contacts["emails"] + contacts["phones"] + contacts["links"]
+    if contact_items:
+        lines.append(f"CONTACT INFO: {' | '.join(contact_items)}")
+    if profile["summary"]:
+        lines.append(f"SUMMARY: {profile['summary'][:400] if compact else profile['summary']}")
+    if profile["skills"]:
+        lines.append(f"SKILLS: {', '.join(profile['skills'][:25] if compact else profile['skills'])}")
+
+    sections = [
+        ("EXPERIENCE", _format_entries(profile["experience"], *((3, 3) if compact else (None, None)))),
+        ("PROJECTS", _format_entries(profile["projects"], *((3, 1) if compact else (None, None)))),
+        ("EDUCATION", profile["education"][:2] if compact else profile["education"]),
+    ]
+    if not compact:
+        sections.extend((item["heading"].upper(), item["lines"]) for item in profile["other"])
+    for heading, section_lines in sections:
+        if section_lines:
+            lines.append("")
+            lines.append(f"{heading}:")
+            lines.extend(section_lines)
+    return "\n".join(lines)
+
+
+def has_structure(profile):
+    """False when parsing found no recognizable sections (the raw resume text is the better input)."""
+    return bool(profile["experience"] or profile["projects"] or profile["education"])
+
+
+def resume_for_prompt(base_resume, job_description=None, compact=False):
+    """
+    The resume as it goes into the outreach prompts: the cached structured profile (full, or
+    compact), fitted into the resume token budget. Falls back to the cleaned raw text when the
+    resume has no recognizable sections.
+    """
+    profile = resume_profile(base_resume)
+    if not has_structure(profile):
+        return prepare_resume(base_resume, job_description)
+    return trim_to_budget(format_profile(profile, compact=compact), RESUME_TOKEN_BUDGET, reference=job_description)
+
+
+def candidate_name(base_resume):
+    """The candidate's name from the parsed resume ("" when it could not be found)."""
+    return resume_profile(base_resume)["name"]
@@ -0,0 +1,127 @@
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Hunter.io department -> {keyword or phrase: weight}.
+# Department-specific words outweigh generic tech words, so "Support Engineer" is support and
+# "Marketing Analyst" is marketing. Dict order breaks ties. Extend or override with a JSON file
+# of the same shape in ROLE_DEPARTMENT_KEYWORDS.
+DEPARTMENT_KEYWORDS = {
+    "it": {
+        "software engineer": 3, "data engineer": 3, "data scientist": 3, "machine learning": 3, "site reliability": 3,
+        "devops": 3, "sre": 3, "developer": 2, "software": 2, "programmer": 2, "scientist": 2, "backend": 2,
+        "back end": 2, "frontend": 2, "front end": 2, "full stack": 2, "fullstack": 2, "ml": 2, "qa": 2, "it": 2,
+        "infrastructure": 2, "engineer": 1.5, "engineering": 1.5, "data": 1.5, "analytics": 1.5, "analyst": 1.5,
+        "architect": 1.5, "security": 1.5, "cloud": 1.5, "technical": 1, "platform": 1,
+    },
+    "hr": {
+        "human resources": 4, "people operations": 4, "talent acquisition": 4, "hr": 3, "talent": 3,
+        "recruiter": 3, "recruiting": 3, "recruitment": 3, "people": 2,
+    },
+    "sales": {
+        "business development": 4, "account executive": 4, "sales": 3, "account manager": 3, "bdr": 3, "sdr": 3,
+        "account": 1.5,
+    },
+    "marketing": {
+        "product marketing": 4, "marketing": 3, "seo": 3, "brand": 2.5, "content": 2, "growth": 2,
+        "communications": 2,
+    },
+    "finance": {
+        "finance": 3, "accounting": 3, "accountant": 3, "controller": 3, "treasury": 3, "fp&a": 3,
+        "financial": 2.5, "auditor": 2.5, "tax": 2,
+    },
+    "support": {
+        "customer success": 4, "customer service": 4, "technical support": 4, "help desk": 3, "helpdesk": 3,
+        "support": 3, "service": 1.5,
+    },
+    "executive": {
+        "ceo": 4, "cto": 4, "cfo": 4, "coo": 4, "cmo": 4, "chief": 4, "vice president": 3, "president": 3, "vp": 3,
+        "founder": 3, "executive": 2,
+    },
+    "legal": {
+        "legal": 3, "lawyer": 3, "attorney": 3, "counsel": 3, "paralegal": 3, "compliance": 2,
+    },
+    "design": {
+        "product designer": 4, "designer": 3, "ux": 2.5, "design": 2, "ui": 2,
+    },
+    "operations": {
+        "supply chain": 3, "logistics": 3, "procurement": 3, "operations": 2,
+    },
+}
+
+# Below this score a title is left unclassified (no department filter)
+MIN_SCORE = 1.5
+
+_SEPARATORS = re.compile(r"[-_/|,()]+")
+
+
+def load_keywords(path=None):
+    """The default keyword table, merged with the JSON file in ROLE_DEPARTMENT_KEYWORDS if set."""
+    keywords = {department: dict(table) for department, table in DEPARTMENT_KEYWORDS.items()}
+    path = path or os.getenv("ROLE_DEPARTMENT_KEYWORDS")
+    if path:
+        with open(path) as f:
+            for department, table in json.load(f).items():
+                keywords.setdefault(department, {}).update(table)
+        logger.info(f"🏷️  Loaded role keywords from {path}")
+    return keywords
+
+
+class RoleClassifier:
+    """
+    Classifies job titles into Hunter.io departments.
+    All keywords are matched in one pass by a single precompiled alternation (longest phrases
+    first, on word boundaries); each matched keyword adds its weight to its departments.
+    """
+
+    def __init__(self, keywords=None, min_score=MIN_SCORE, cache_size=4096):
+        keywords = keywords or DEPARTMENT_KEYWORDS
+        self.min_score = min_score
+        self._order = {department: index for index, department in enumerate(keywords)}
+        self._weights = {}
+        for department, table in keywords.items():
+            for keyword, weight in table.items():
+                self._weights.setdefault(self._normalize(keyword), []).append((department, weight))
+
+        terms = sorted(self._weights, key=len, reverse=True)
+        self._pattern = re.compile(r"(?<![a-z0-9&])(" + "|".join(re.escape(term) for term in terms) + r")(?![a-z0-9&])")
+        self.department = lru_cache(maxsize=cache_size)(self._department)
+
+    @staticmethod
+    def _normalize(text):
+        return " ".join(_SEPARATORS.sub(" ", (text or "").lower()).split())
+
+    def scores(self, title):
+        """{department: score} for every department with a keyword in title."""
+        scores = {}
+        for keyword in set(self._pattern.findall(self._normalize(title))):
+            for department, weight in self._weights[keyword]:
+                scores[department] = scores.get(department, 0) + weight
+        return scores
+
+    def classify(self, title):
+        """All departments scoring at least min_score, best first: [(department, score)]."""
+        ranked = sorted(self.scores(title).items(), key=lambda item: (-item[1], self._order.get(item[0], 0)))
+        return [(department, score) for department, score in ranked if score >= self.min_score]
+
+    def _department(self, title):
+        ranked = self.classify(title)
+        return ranked[0][0] if ranked else None
+
+    def classify_titles(self, titles):
+        """Best department for each title (memoized, for bulk contact/batch classification)."""
+        return [self.department(title) for title in titles]
+
+
+role_classifier = RoleClassifier(load_keywords())
+
+
+def classify_department(title):
+    """Best Hunter.io department for a role or job title, or None."""
+    if not title:
+        return None
+    return role_classifier.department(title)
@@ -0,0 +1,164 @@
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services.cache import SQLiteCache
+from services.call_stats import record_upstream_call, submit_in_context
+from services.deadline import check_deadline, stage_timeout
+from services.metrics import span
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "10"))
+SCRAPE_MAX_CHARS = int(os.getenv("SCRAPE_MAX_CHARS", "4000"))
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "8"))
+SCRAPE_PER_HOST_CONCURRENCY = int(os.getenv("SCRAPE_PER_HOST_CONCURRENCY", "2"))
+SCRAPE_NEGATIVE_CACHE_TTL = int(os.getenv("SCRAPE_NEGATIVE_CACHE_TTL", "3600"))
+
+# Extracted page text keyed by URL. Failed fetches are remembered briefly (empty string).
+scrape_cache = SQLiteCache(
+    "scrape",
+    default_ttl=int(os.getenv("SCRAPE_CACHE_TTL", str(24 * 3600))),
+    max_entries=int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "5000")),
+    max_bytes=int(os.getenv("SCRAPE_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+)
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=SCRAPE_CONCURRENCY, pool_maxsize=SCRAPE_CONCURRENCY))
+_session.mount("http://", HTTPAdapter(pool_connections=SCRAPE_CONCURRENCY, pool_maxsize=SCRAPE_CONCURRENCY))
+_session.headers.update({
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9"
+})
+
+_host_limits = {}
+_host_limits_lock = threading.Lock()
+
+
+class MainTextExtractor(HTMLParser):
+    """
+    Collects visible text from an HTML page, skipping scripts, styles and page chrome.
+    Text inside <main>/<article> is kept separately so it can be preferred over the full body.
+    """
+
+    SKIP_TAGS = {"script", "style", "noscript", "svg", "nav", "header", "footer", "form", "aside", "template"}
+    MAIN_TAGS = {"main", "article"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._skip_depth = 0
+        self._main_depth = 0
+        self.text = []
+        self.main_text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in self.MAIN_TAGS:
+            self._main_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in self.MAIN_TAGS and self._main_depth:
+            self._main_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        data = data.strip()
+        if not data:
+            return
+        self.text.append(data)
+        if self._main_depth:
+            self.main_text.append(data)
+
+
+def extract_main_text(html, max_chars=None):
+    """Returns the main readable text of an HTML document, de-duplicated and length-capped."""
+    parser = MainTextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+
+    chunks = parser.main_text or parser.text
+    seen = set()
+    lines = []
+    for chunk in chunks:
+        line = re.sub(r"\s+", " ", chunk)
+        if len(line) < 3 or line in seen:
+            continue
+        seen.add(line)
+        lines.append(line)
+
+    text = "\n".join(lines)
+    max_chars = SCRAPE_MAX_CHARS if max_chars is None else max_chars
+    return text[:max_chars]
+
+
+def _host_limit(url):
+    host = urlparse(url).netloc.lower()
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.Semaphore(SCRAPE_PER_HOST_CONCURRENCY)
+        return _host_limits[host]
+
+
+def scrape_page(url, use_cache=True):
+    """
+    Fetches a page and returns its extracted main text ("" when it can't be read).
+    Results are cached by URL; concurrent fetches to the same host are limited.
+    """
+    if not url:
+        return ""
+    if not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+
+    if use_cache:
+        cached = scrape_cache.get(url)
+        if cached is not None:
+            return cached
+
+    check_deadline("scrape")
+    with span("scrape", url=url) as attrs:
+        with _host_limit(url):
+            record_upstream_call("scrape")
+            try:
+                response = _session.get(url, timeout=stage_timeout("scrape", SCRAPE_TIMEOUT))
+            except requests.RequestException as e:
+                logger.warning(f"⚠️  Scrape failed for {url}: {type(e).__name__}")
+                attrs["error"] = type(e).__name__
+                scrape_cache.set(url, "", ttl=SCRAPE_NEGATIVE_CACHE_TTL)
+                return ""
+
+        attrs["status"] = response.status_code
+        if response.status_code != 200 or "html" not in response.headers.get("Content-Type", "text/html"):
+            logger.warning(f"⚠️  Scrape of {url} returned {response.status_code}")
+            scrape_cache.set(url, "", ttl=SCRAPE_NEGATIVE_CACHE_TTL)
+            return ""
+
+        text = extract_main_text(response.text)
+        attrs["chars"] = len(text)
+    scrape_cache.set(url, text, ttl=None if text else SCRAPE_NEGATIVE_CACHE_TTL)
+    return text
+
+
+def scrape_pages(urls):
+    """Scrapes many URLs concurrently (bounded overall and per host); returns {url: text}."""
+    urls = [url for url in dict.fromkeys(urls) if url]
+    if not urls:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(SCRAPE_CONCURRENCY, len(urls)), thread_name_prefix="scrape") as executor:
+        futures = [submit_in_context(executor, scrape_page, url) for url in urls]
+        texts = [future.result() for future in futures]
+    return dict(zip(urls, texts))
@@ -0,0 +1,122 @@
+import logging
+import threading
+
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+coalesced_calls_total = metrics.counter(
+    "app_coalesced_calls_total", "Calls that joined an identical in-flight call instead of running", ("flight",)
+)
+
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.events = []
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    def emit(self, event, data):
+        # Events are kept so callers that join late get the ones they missed
+        with self.lock:
+            self.events.append((event, data))
+            listeners = list(self.listeners)
+        for listener in listeners:
+            try:
+                listener(event, data)
+            except Exception as e:
+                logger.warning(f"⚠️  Coalesced listener failed for '{event}': {type(e).__name__}: {str(e)}")
+
+    def listen(self, on_event):
+        with self.lock:
+            missed = list(self.events)
+            self.listeners.append(on_event)
+        for event, data in missed:
+            on_event(event, data)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: the first caller for a key runs the work, callers that
+    arrive while it is in flight wait for it and get the same result (or exception).
+    Nothing is kept once the call finishes - that is what the caches are for.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.executed = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                coalesced_calls_total.inc(flight=self.name)
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def _run(self, key, call, fn):
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                self.executed += 1
+            call.done.set()
+
+    def do(self, key, fn):
+        """Returns (fn() result, coalesced) - coalesced is True when another caller did the work."""
+        call, leader = self._join(key)
+        if leader:
+            return self._run(key, call, fn), False
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    def do_with_events(self, key, fn, on_event=None):
+        """
+        Like do(), for work that reports progress: fn(emit) runs once and every caller's on_event
+        receives its events, including those emitted before the caller joined.
+        """
+        call, leader = self._join(key)
+        if on_event is not None:
+            call.listen(on_event)
+        if leader:
+            return self._run(key, call, lambda: fn(call.emit)), False
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    def stats(self):
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+def single_flight(name):
+    """The process-wide SingleFlight group with this name."""
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name)
+        return _flights[name]
+
+
+def single_flight_stats():
+    with _flights_lock:
+        flights = list(_flights.values())
+    return {flight.name: flight.stats() for flight in flights}
@@ -0,0 +1,89 @@
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Heavy modules in import order. Importing the agent modules builds the LLM clients and tools,
+# so this is where most of a cold start goes; timing each step gives the breakdown.
+HEAVY_MODULES = [
+    "crewai",
+    "crewai_tools",
+    "agents.resume_agent",
+    "agents.outreach_agent",
+    "tasks.resume_tasks",
+    "tasks.outreach_tasks",
+    "services.pipeline",
+]
+
+
+class Warmup:
+    """
+    Defers the heavy crewai/agent imports until first use (or a background warm-up started
+    once the server is accepting connections), so health checks answer immediately.
+    """
+
+    def __init__(self, modules=None):
+        self.modules = modules or HEAVY_MODULES
+        self.state = "cold"
+        self.error = None
+        self.import_seconds = {}
+        self.total_seconds = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._pipeline = None
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            for name in self.modules:
+                module_start = time.perf_counter()
+                module = importlib.import_module(name)
+                self.import_seconds[name] = round(time.perf_counter() - module_start, 3)
+            self._pipeline = module
+            self.state = "ready"
+            logger.info(f"🔥 Warm-up complete in {time.perf_counter() - start:.2f}s: {self.import_seconds}")
+        except Exception as e:
+            self.state = "failed"
+            self.error = f"{type(e).__name__}: {str(e)}"
+            logger.error(f"❌ Warm-up failed: {self.error}")
+        finally:
+            self.total_seconds = round(time.perf_counter() - start, 3)
+            self._done.set()
+
+    def _claim(self):
+        with self._lock:
+            if self.state != "cold":
+                return False
+            self.state = "warming"
+            return True
+
+    def start_background(self):
+        """Starts warming up on a background thread (no-op if already started)."""
+        if self._claim():
+            threading.Thread(target=self._load, name="warmup", daemon=True).start()
+
+    def ensure_ready(self):
+        """Returns services.pipeline, loading it now (or waiting for the warm-up) if needed."""
+        if self._claim():
+            self._load()
+        self._done.wait()
+        if self.state != "ready":
+            raise RuntimeError(f"Backend failed to initialize: {self.error}")
+        return self._pipeline
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    def report(self):
+        return {
+            "state": self.state,
+            "error": self.error,
+            "total_seconds": self.total_seconds,
+            "import_seconds": self.import_seconds
+        }
+
+
+warmup = Warmup()
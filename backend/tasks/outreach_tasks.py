@@ -1,141 +1,191 @@
 from crewai import Task
-import requests
+from services.hunter_client import hunter_client, hunter_cache, HUNTER_NEGATIVE_CACHE_TTL
+from services.contact_store import contact_store
+from services.role_classifier import classify_department
+from services.progress import emit_progress
+from services.scraper import scrape_pages
+from services.batch import shared
+from services.prompt_budget import compact_contacts_json, log_prompt_tokens
+from services.resume_profile import candidate_name, resume_for_prompt
+from services.metrics import span
+from services.deadline import run_within
+from services.single_flight import single_flight
+from services.prefetch import prefetcher
+from services.contact_providers import (
+    ContactProvider,
+    company_domain_hint,
+    discover_contacts,
+    local_contact_providers,
+    normalize_company_name
+)
+import logging
 import os
-import json
 import re
 
-def get_company_domain(company_name, api_key):
+logger = logging.getLogger(__name__)
+
+# Identical Hunter.io lookups running at the same time (double submits, a popular posting) share one request
+hunter_flight = single_flight("hunter")
+
+
+def _company_key(company_name):
+    return company_domain_hint(company_name) or normalize_company_name(company_name)
+
+
+def map_role_to_department(role):
+    """Maps a role title to a Hunter.io department filter (or None)."""
+    return classify_department(role)
+
+
+def guess_company_domain(company_name):
+    """Best-effort domain guess: remove spaces/punctuation and add .com"""
+    clean_name = company_name.lower().strip().replace(" ", "").replace("'", "").replace(",", "")
+    return f"{clean_name}.com"
+
+
+def hunter_domain_search(params):
     """
-    Uses Hunter.io to find the actual domain for a company name.
-    This is a free API call that doesn't consume credits.
+    Calls the Hunter.io Domain Search endpoint through the shared client.
+    Returns (data, status_code); data is None when the request failed.
     """
-    url = "https://api.hunter.io/v2/domain-search"
+    # Shared pooled client: rate limited, retries 429/5xx with backoff
+    with span("contact_search", by="domain" if "domain" in params else "company") as attrs:
+        response = hunter_client.get("domain-search", params, timeout=20)
+        attrs["status"] = response.status_code
     
-    # Try the company parameter - Hunter will attempt to find the domain
-    params = {
-        "company": company_name,
-        "api_key": api_key,
-        "limit": 1
-    }
+    logger.debug(f"📡 Response Status Code: {response.status_code}")
     
-    try:
-        response = requests.get(url, params=params, timeout=15)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('data') and data['data'].get('domain'):
-                return data['data']['domain']
-        
-        # If that didn't work, try removing spaces and adding .com
-        clean_name = company_name.lower().strip().replace(" ", "").replace("'", "").replace(",", "")
-        return f"{clean_name}.com"
-        
-    except:
-        # Fallback
-        clean_name = company_name.lower().strip().replace(" ", "").replace("'", "").replace(",", "")
-        return f"{clean_name}.com"
+    # Check for errors
+    if response.status_code == 400:
+        error_data = response.json()
+        logger.warning(f"❌ Bad Request (400): {error_data.get('errors', [{}])[0].get('details', 'Invalid request')}")
+        return None, response.status_code
+    elif response.status_code == 401:
+        logger.error(f"❌ Unauthorized (401) - Invalid API key")
+        return None, response.status_code
+    elif response.status_code == 429:
+        logger.error(f"❌ Rate limit exceeded (429) after {hunter_client.max_retries} retries (free plan: 50 searches/month)")
+        return None, response.status_code
+    elif response.status_code != 200:
+        logger.error(f"❌ HTTP Error: {response.status_code}")
+        return None, response.status_code
 
+    return response.json(), response.status_code
 
-def find_contacts_hunter(company_name, role, limit=10):
+
+def find_contacts_hunter(company_name, role, limit=10, refresh=False):
     """
     Finds contacts using Hunter.io Domain Search API.
     Free tier: 50 searches/month (1 credit per 10 emails found)
+    Every answer is saved to the local contact store, so a domain/department searched before is
+    served without an API call; stale entries are refreshed in the background
+    (refresh=True is that background call and always asks Hunter.io).
+    Concurrent searches for the same company, department and limit share one lookup.
     """
-    print(f"\n{'='*70}")
-    print(f"🔍 SEARCHING FOR CONTACTS VIA HUNTER.IO")
-    print(f"{'='*70}")
-    print(f"Company: {company_name}")
-    print(f"Role: {role}")
-    print(f"{'='*70}\n")
+    key = ("contacts", _company_key(company_name), map_role_to_department(role), limit, refresh)
+    contacts, coalesced = hunter_flight.do(key, lambda: _find_contacts_hunter(company_name, role, limit, refresh))
+    if coalesced:
+        logger.info(f"🔗 Joined an in-flight Hunter.io lookup for {company_name}")
+    return [dict(contact) for contact in contacts]
+
+
+def _find_contacts_hunter(company_name, role, limit=10, refresh=False):
+    logger.info(f"🔍 Searching for contacts via Hunter.io: {company_name} / {role}")
     
     hunter_api_key = os.getenv("HUNTER_API_KEY")
 
     if not hunter_api_key:
-        print("❌ ERROR: HUNTER_API_KEY not found in .env file.")
-        print("Sign up at https://hunter.io to get a free API key")
-        print("Free tier: 50 searches/month\n")
+        logger.error(
+            "❌ HUNTER_API_KEY not found in .env file. "
+            "Sign up at https://hunter.io to get a free API key (free tier: 50 searches/month)"
+        )
         return []
 
-    # If user already provided a domain (contains .), use it directly
-    if "." in company_name and len(company_name.split(".")) > 1:
-        company_domain = company_name.lower().strip()
-        print(f"🔗 Using provided domain: {company_domain}")
-    else:
-        # Try to find the domain dynamically
-        print(f"🔍 Looking up domain for: {company_name}")
-        company_domain = get_company_domain(company_name, hunter_api_key)
-        print(f"🔗 Resolved to domain: {company_domain}")
-    
     # Hunter.io Domain Search endpoint
-    url = "https://api.hunter.io/v2/domain-search"
-    
     params = {
-        "domain": company_domain,
         "api_key": hunter_api_key,
         "limit": min(limit, 10),
         "type": "personal"
     }
     
     # Add department filter if we can map the role
-    if role:
-        role_lower = role.lower()
-        department = None
-        
-        if any(word in role_lower for word in ['data', 'analyst', 'analytics', 'engineer', 'developer', 'scientist']):
-            department = 'it'
-        elif any(word in role_lower for word in ['hr', 'people', 'talent', 'recruiter']):
-            department = 'hr'
-        elif any(word in role_lower for word in ['sales', 'account', 'business development']):
-            department = 'sales'
-        elif any(word in role_lower for word in ['marketing', 'brand', 'content']):
-            department = 'marketing'
-        elif any(word in role_lower for word in ['finance', 'accounting', 'controller']):
-            department = 'finance'
-        elif any(word in role_lower for word in ['support', 'customer success', 'service']):
-            department = 'support'
-        elif any(word in role_lower for word in ['ceo', 'cto', 'cfo', 'chief', 'executive', 'president', 'vp']):
-            department = 'executive'
-        
-        if department:
-            params['department'] = department
-            print(f"🎯 Filtering by department: {department}")
+    department = map_role_to_department(role)
+    if department:
+        params['department'] = department
+        logger.debug(f"🎯 Filtering by department: {department}")
+
+    # If user already provided a domain (contains .), use it directly
+    domain_cache_key = f"domain:{normalize_company_name(company_name)}"
+    if "." in company_name and len(company_name.split(".")) > 1:
+        company_domain = company_name.lower().strip()
+        logger.debug(f"🔗 Using provided domain: {company_domain}")
+    else:
+        company_domain = hunter_cache.get(domain_cache_key) or contact_store.domain_for(company_name)
+        if company_domain:
+            logger.info(f"⚡ Domain cache hit: {company_name} -> {company_domain}")
+        else:
+            # Resolve the domain and fetch contacts in a single company-parameterized request
+            logger.debug(f"🔍 Resolving domain and contacts in one request for: {company_name}")
+
+    def stored_contacts(domain):
+        if refresh:
+            return None
+        stored = contact_store.lookup(domain, department, limit)
+        if stored is None:
+            return None
+        contacts, stale = stored
+        logger.info(f"⚡ Contact store hit: {len(contacts)} contacts for {domain}" + (" (stale, refreshing)" if stale else ""))
+        if stale:
+            contact_store.schedule_refresh(
+                (domain, department or ""),
+                lambda: find_contacts_hunter(company_name, role, limit=limit, refresh=True)
+            )
+        return contacts
+
+    if company_domain:
+        params['domain'] = company_domain
+        contacts = stored_contacts(company_domain)
+        if contacts is not None:
+            return contacts
+    else:
+        params['company'] = company_name
     
     try:
-        print(f"🌐 Making API request to Hunter.io...")
-        
-        response = requests.get(url, params=params, timeout=20)
+        logger.debug(f"🌐 Making API request to Hunter.io...")
         
-        print(f"📡 Response Status Code: {response.status_code}")
-        
-        # Check for errors
-        if response.status_code == 400:
-            print(f"❌ Bad Request (400)")
-            error_data = response.json()
-            print(f"   Error: {error_data.get('errors', [{}])[0].get('details', 'Invalid request')}")
-            return []
-        elif response.status_code == 401:
-            print(f"❌ Unauthorized (401) - Invalid API key")
-            return []
-        elif response.status_code == 429:
-            print(f"❌ Rate limit exceeded (429)")
-            print(f"   Free plan: 50 searches/month")
-            return []
-        elif response.status_code != 200:
-            print(f"❌ HTTP Error: {response.status_code}")
+        data, status_code = hunter_domain_search(params)
+
+        if not company_domain:
+            resolved_domain = ((data or {}).get('data') or {}).get('domain')
+            if resolved_domain:
+                company_domain = resolved_domain
+                hunter_cache.set(domain_cache_key, company_domain)
+                logger.info(f"🔗 Resolved to domain: {company_domain}")
+            elif status_code in (200, 400):
+                # Hunter doesn't know this company name - fall back to a guessed domain
+                company_domain = guess_company_domain(company_name)
+                hunter_cache.set(domain_cache_key, company_domain, ttl=HUNTER_NEGATIVE_CACHE_TTL)
+                logger.info(f"🔗 Falling back to guessed domain: {company_domain}")
+
+                params.pop('company')
+                params['domain'] = company_domain
+                contacts = stored_contacts(company_domain)
+                if contacts is not None:
+                    return contacts
+                data, status_code = hunter_domain_search(params)
+
+        if data is None:
             return []
-        
-        data = response.json()
+
         contacts = []
+        departments = []
         
         if data.get('data') and data['data'].get('emails'):
             emails_data = data['data']['emails']
             domain = data['data'].get('domain', company_domain)
             organization = data['data'].get('organization', company_name)
             
-            print(f"\n✅ Found {len(emails_data)} contacts from Hunter.io")
-            print(f"   Domain: {domain}")
-            print(f"   Organization: {organization}")
-            print(f"{'='*70}\n")
+            logger.info(f"✅ Found {len(emails_data)} contacts from Hunter.io (domain: {domain}, organization: {organization})")
             
             for idx, person in enumerate(emails_data, 1):
                 if len(contacts) >= limit:
@@ -165,30 +215,43 @@ def find_contacts_hunter(company_name, role, limit=10):
                         "linkedin": linkedin_url,
                         "confidence": confidence
                     })
+                    departments.append(person.get('department'))
                     
-                    print(f"[{len(contacts)}] {name}")
-                    print(f"     Title: {title}")
-                    print(f"     Email: {email}")
-                    print(f"     LinkedIn: {linkedin_url}")
-                    print(f"     Confidence: {confidence}%")
-                    print()
+                    logger.debug(f"[{len(contacts)}] {name} | {title} | {email} | {linkedin_url} | confidence {confidence}%")
             
         else:
-            print(f"\n❌ No contacts found for domain: {company_domain}")
-            print(f"   Hunter.io may not have data for this company")
-            print(f"   Try entering the exact domain (e.g., 'hpe.com')\n")
+            logger.warning(
+                f"❌ No contacts found for domain: {company_domain}. Hunter.io may not have data for this "
+                f"company - try entering the exact domain (e.g., 'hpe.com')"
+            )
             
-        print(f"{'='*70}")
-        print(f"✅ Retrieved {len(contacts)} contacts from Hunter.io")
-        print(f"{'='*70}\n")
+        logger.info(f"✅ Retrieved {len(contacts)} contacts from Hunter.io")
+
+        contact_store.save_search(
+            company_name, company_domain, department, limit,
+            [{**contact, "department": dept} for contact, dept in zip(contacts, departments)]
+        )
         
         return contacts
         
     except Exception as e:
-        print(f"❌ Error: {type(e).__name__}: {str(e)}\n")
+        logger.error(f"❌ Error: {type(e).__name__}: {str(e)}")
         return []
 
 
+class HunterContactProvider(ContactProvider):
+    """Hunter.io Domain Search (cached, see find_contacts_hunter)."""
+
+    name = "hunter"
+
+    def find_contacts(self, company_name, role, department, limit):
+        return find_contacts_hunter(company_name, role, limit=limit)
+
+
+# Queried concurrently for every lookup; local lists (CONTACT_CSV_PATH / CONTACT_DB_PATH) are optional
+contact_providers = [HunterContactProvider(), *local_contact_providers()]
+
+
 def construct_linkedin_url(name):
     """Construct a LinkedIn profile URL from a name."""
     if not name:
@@ -205,21 +268,88 @@ def construct_linkedin_url(name):
     return ""
 
 
+def get_outreach_contacts(company_name, role, limit=5):
+    """
+    Looks up the real contacts used for outreach and reports them as soon as they are known.
+    All contact providers are queried at once (bounded by CONTACT_DISCOVERY_TIMEOUT) and their
+    results merged. Inside a batch, the lookup runs once per company and department.
+    Contacts prefetched while the user was typing (see /api/prefetch) are used as they are.
+    """
+    contacts = prefetcher.warm(company_name, role)
+    if contacts:
+        logger.info(f"⚡ Using {len(contacts)} prefetched contacts for {company_name}")
+        contacts = contacts[:limit]
+    else:
+        contacts = _discover_contacts(company_name, role, limit)
+    if contacts:
+        emit_progress("contacts_found", {"company": company_name, "count": len(contacts), "contacts": contacts})
+    return contacts
+
+
+def _discover_contacts(company_name, role, limit):
+    department = map_role_to_department(role)
+    key = ("contacts", normalize_company_name(company_name), department, limit)
+    contacts = shared(key, lambda: discover_contacts(contact_providers, company_name, role, department, limit=limit))
+    return [dict(c) for c in contacts]
+
+
+def prefetch_outreach(company_name, role, limit=5):
+    """Speculative contact lookup and profile scrape for /api/prefetch (no progress events)."""
+    contacts = _discover_contacts(company_name, role, limit)
+    return {"contacts": contacts, "profiles": prefetch_contact_profiles(contacts) if contacts else {}}
+
+
+def prefetch_contact_profiles(contacts):
+    """
+    Scrapes every contact's LinkedIn page in parallel (cached, per-host limited) before the
+    LLM step, so the agent doesn't have to scrape profiles one by one inside its loop.
+    Returns {linkedin_url: main text}.
+    """
+    urls = [c.get('linkedin') for c in contacts if c.get('linkedin')]
+    if not urls:
+        return {}
+    profiles = prefetcher.profiles(urls)
+    missing = [url for url in urls if url not in profiles]
+    if missing:
+        logger.debug(f"🌐 Pre-fetching {len(missing)} LinkedIn profiles...")
+        with span("profile_prefetch", urls=len(missing)) as attrs:
+            # Profiles not scraped within the scrape budget are left to the agent's scrape tool
+            scraped, attrs["finished"] = run_within(
+                "scrape", shared, ("profiles", tuple(sorted(missing))), lambda: scrape_pages(missing)
+            )
+            profiles.update(scraped or {})
+    logger.info(f"✅ Profiles with content: {sum(1 for text in profiles.values() if text)}/{len(urls)}")
+    return profiles
+
+
+def format_profile_text(contact, profiles):
+    """Returns the pre-fetched profile text for a contact, or a note telling the agent to scrape."""
+    text = profiles.get(contact.get('linkedin')) if contact.get('linkedin') else None
+    if text:
+        return text
+    return "(not available - use the 'Read website content' tool on their LinkedIn URL if they have one)"
+
+
+def _signature_rule(user_resume):
+    # The name comes from the parsed resume profile, so the model doesn't have to find it
+    name = candidate_name(user_resume)
+    if name:
+        return f"Sign every email as {name}"
+    return "Sign emails with the candidate's name from the resume"
+
+
 def create_outreach_task(agent, company_name, role, user_resume):
     """
     Creates an outreach task with REAL contacts from Hunter.io
     Agent will scrape LinkedIn profiles for personalization
     """
-    print("\n" + "="*70)
-    print("🚀 CREATING OUTREACH TASK WITH LINKEDIN SCRAPING")
-    print("="*70)
+    logger.debug("🚀 Creating outreach task with LinkedIn scraping")
     
     # Get real contacts using Hunter.io
-    contacts = find_contacts_hunter(company_name, role, limit=5)
+    contacts = get_outreach_contacts(company_name, role, limit=5)
     
     if not contacts or len(contacts) == 0:
-        print("❌ ERROR: No real contacts found from Hunter.io")
-        print("Returning error task.\n")
+        logger.warning("❌ No real contacts found from Hunter.io, returning error task")
         
         return Task(
             description=(
@@ -231,22 +361,28 @@ def create_outreach_task(agent, company_name, role, user_resume):
             agent=agent
         )
     
-    print(f"\n✅ USING {len(contacts)} REAL CONTACTS FROM HUNTER.IO:")
-    print("="*70)
+    logger.info(f"✅ Using {len(contacts)} real contacts from Hunter.io")
     for i, c in enumerate(contacts, 1):
-        print(f"{i}. {c['name']:25} | {c['email']:30} | {c['title'][:40]}")
-        print(f"   LinkedIn: {c['linkedin']}")
-    print("="*70 + "\n")
+        logger.debug(f"{i}. {c['name']:25} | {c['email']:30} | {c['title'][:40]} | {c['linkedin']}")
     
-    contacts_json_str = json.dumps(contacts, indent=2)
+    contacts_json_str = compact_contacts_json(contacts)
+    signature_rule = _signature_rule(user_resume)
+    user_resume = resume_for_prompt(user_resume, compact=True)
+
+    profiles = prefetch_contact_profiles(contacts)
+    profiles_str = "\n\n".join(
+        f"--- {c['name']} ({c.get('linkedin') or 'no LinkedIn URL'}) ---\n{format_profile_text(c, profiles)}"
+        for c in contacts
+    )
     
-    return Task(
+    task = Task(
         description=(
             f"="*70 + "\n"
-            f"STEP 1: SCRAPE LINKEDIN PROFILES\n"
+            f"STEP 1: REVIEW LINKEDIN PROFILES\n"
             f"="*70 + "\n"
             f"You have {len(contacts)} REAL contacts (from Hunter.io).\n"
-            f"For EACH contact with a LinkedIn URL, use the ScrapeWebsiteTool to scrape their profile.\n"
+            f"Their LinkedIn profile content has already been fetched below. Only use the "
+            f"'Read website content' tool for a contact whose profile content is not available.\n"
             f"Extract key information:\n"
             f"- Current role and responsibilities\n"
             f"- Previous experience and career path\n"
@@ -256,6 +392,8 @@ def create_outreach_task(agent, company_name, role, user_resume):
             f"- Any shared interests or connections\n\n"
             f"CONTACTS TO RESEARCH:\n"
             f"{contacts_json_str}\n\n"
+            f"PRE-FETCHED PROFILE CONTENT:\n"
+            f"{profiles_str}\n\n"
             f"="*70 + "\n"
             f"STEP 2: ANALYZE CANDIDATE'S RESUME\n"
             f"="*70 + "\n"
@@ -285,7 +423,7 @@ def create_outreach_task(agent, company_name, role, user_resume):
             f"   - First paragraph: Reference specific detail from their LinkedIn (project, post, skill)\n"
             f"   - Second paragraph: Connect it to candidate's relevant experience (2-3 specific skills/projects)\n"
             f"   - Third paragraph: Clear ask for 15-20 min informational chat\n"
-            f"   - Professional signature with candidate's name from resume\n\n"
+            f"   - Professional signature with the candidate's name\n\n"
             f"CRITICAL RULES:\n"
             f"- Output exactly {len(contacts)} contacts\n"
             f"- Use EXACT names, emails, titles, and LinkedIn URLs from input\n"
@@ -293,7 +431,7 @@ def create_outreach_task(agent, company_name, role, user_resume):
             f"- Base personalization on ACTUAL scraped LinkedIn data\n"
             f"- If scraping fails for a profile, use their title and company for personalization\n"
             f"- Make each message unique based on their specific background\n"
-            f"- Extract candidate's name from resume for email signatures\n"
+            f"- {signature_rule}\n"
         ),
         expected_output=(
             f"A JSON array with EXACTLY {len(contacts)} objects.\n\n"
@@ -318,3 +456,69 @@ def create_outreach_task(agent, company_name, role, user_resume):
         ),
         agent=agent
     )
+
+    log_prompt_tokens(
+        "outreach", task.description, task.expected_output,
+        resume=user_resume, contacts=contacts_json_str, profiles=profiles_str
+    )
+    return task
+
+
+def create_contact_outreach_task(agent, company_name, role, user_resume, contact, profile_text=None):
+    """
+    Creates a small outreach task for a SINGLE contact (per-contact fan-out mode).
+    Each task covers one profile and writes one set of messages, so prompts stay short
+    and a malformed answer only loses this contact.
+    profile_text is the pre-fetched LinkedIn content (see prefetch_contact_profiles).
+    """
+    contact_json_str = compact_contacts_json(contact)
+    signature_rule = _signature_rule(user_resume)
+    user_resume = resume_for_prompt(user_resume, compact=True)
+    
+    task = Task(
+        description=(
+            f"You are writing outreach to ONE real contact at {company_name} (from Hunter.io) "
+            f"on behalf of a candidate applying for the {role} role.\n\n"
+            f"CONTACT:\n"
+            f"{contact_json_str}\n\n"
+            f"PRE-FETCHED LINKEDIN PROFILE CONTENT:\n"
+            f"{profile_text or format_profile_text(contact, {})}\n\n"
+            f"CANDIDATE'S RESUME:\n"
+            f"{user_resume}\n\n"
+            f"STEPS:\n"
+            f"1. Review their profile content above (current role, career path, skills, education, "
+            f"recent activity). Only use the 'Read website content' tool if it is not available.\n"
+            f"2. Find connection points between the profile and the candidate's resume "
+            f"(shared skills, similar career paths, relevant projects, common background).\n"
+            f"3. Write a LinkedIn connection note (under 300 characters) that references something "
+            f"SPECIFIC from their profile and a genuine connection point.\n"
+            f"4. Write a cold email: compelling subject line, personalized greeting, a paragraph referencing "
+            f"their work, a paragraph connecting it to 2-3 of the candidate's relevant skills/projects, "
+            f"a clear ask for a 15-20 min informational chat, and a signature with the candidate's name.\n\n"
+            f"CRITICAL RULES:\n"
+            f"- Use the EXACT name, email, title, and LinkedIn URL from the contact above\n"
+            f"- {signature_rule}\n"
+            f"- Base personalization on ACTUAL scraped LinkedIn data\n"
+            f"- If scraping fails, use their title and company for personalization\n"
+        ),
+        expected_output=(
+            "A single JSON object (raw JSON, no markdown code blocks):\n"
+            "{\n"
+            '  "name": "exact name from input",\n'
+            '  "title": "exact title from input",\n'
+            '  "linkedin": "exact LinkedIn URL from input",\n'
+            '  "email": "exact email from input",\n'
+            '  "linkedin_profile_summary": "brief summary of key findings from their profile (2-3 sentences)",\n'
+            '  "connection_points": "specific connections between their profile and candidate background",\n'
+            '  "linkedin_note": "personalized note under 300 chars referencing their profile",\n'
+            '  "cold_email": "Subject: [compelling subject]\\n\\nDear [Name],\\n\\n...\\n\\nBest regards,\\n[Candidate Name]"\n'
+            "}\n"
+        ),
+        agent=agent
+    )
+
+    log_prompt_tokens(
+        f"outreach:{contact.get('name', '')}", task.description, task.expected_output,
+        resume=user_resume, profile=profile_text or ""
+    )
+    return task
@@ -1,25 +1,50 @@
+from functools import lru_cache
+
 from crewai import Task
+from services.prompt_budget import prepare_job_description, prepare_resume, log_prompt_tokens
+from services.keyword_analyzer import analyze, format_analysis_for_prompt
+
+
+@lru_cache(maxsize=32)
+def render_resume_tailoring_prompt(job_description, base_resume):
+    """
+    Renders the resume tailoring prompt: (description, expected_output, prompt parts for logging).
+    Also used for the LLM result cache key, so any change to the rendered prompt is a cache miss.
+    """
+    # Clean pasted text and keep both documents inside their token budgets
+    job_description = prepare_job_description(job_description)
+    base_resume = prepare_resume(base_resume, job_description)
+
+    # Keywords and resume relevance are computed locally, so the LLM doesn't have to derive them
+    keyword_analysis = format_analysis_for_prompt(analyze(job_description, base_resume))
+
+    description = (
+        f"IMPORTANT: You must use the EXACT personal information (name, contact details, education, experience) from the base resume below. Do not change the person's name or invent new information.\n\n"
+        f"BASE RESUME:\n{base_resume}\n\n"
+        f"JOB DESCRIPTION:\n{job_description}\n\n"
+        f"KEYWORD ANALYSIS (pre-computed from the job description and resume):\n{keyword_analysis}\n\n"
+        f"TASKS:\n"
+        f"1. Use the keyword analysis above as the key skills, experiences, and keywords to target.\n"
+        f"2. Tailor the base resume by highlighting the candidate's actual experiences and skills that are most relevant to the job.\n"
+        f"3. Incorporate the identified keywords naturally into the tailored resume.\n"
+        f"4. Generate a compelling cover letter using the candidate's real name and background.\n\n"
+        f"CRITICAL RULES:\n"
+        f"- Use the EXACT name from the base resume\n"
+        f"- Use ONLY experiences and qualifications that exist in the base resume\n"
+        f"- Do not fabricate or exaggerate any information\n"
+        f"- Keep all personal details (name, contact info) exactly as provided"
+    )
+    expected_output = (
+        "A JSON object with two keys: 'tailored_resume' and 'cover_letter'. "
+        "The value for each key should be a string containing the respective document."
+    )
+    parts = (("resume", base_resume), ("job_description", job_description), ("keyword_analysis", keyword_analysis))
+    return description, expected_output, parts
+
 
 def create_resume_tailoring_task(agent, job_description, base_resume):
-    return Task(
-        description=(
-            f"IMPORTANT: You must use the EXACT personal information (name, contact details, education, experience) from the base resume below. Do not change the person's name or invent new information.\n\n"
-            f"BASE RESUME:\n{base_resume}\n\n"
-            f"JOB DESCRIPTION:\n{job_description}\n\n"
-            f"TASKS:\n"
-            f"1. Analyze the job description above to identify key skills, experiences, and keywords.\n"
-            f"2. Tailor the base resume by highlighting the candidate's actual experiences and skills that are most relevant to the job.\n"
-            f"3. Incorporate the identified keywords naturally into the tailored resume.\n"
-            f"4. Generate a compelling cover letter using the candidate's real name and background.\n\n"
-            f"CRITICAL RULES:\n"
-            f"- Use the EXACT name from the base resume\n"
-            f"- Use ONLY experiences and qualifications that exist in the base resume\n"
-            f"- Do not fabricate or exaggerate any information\n"
-            f"- Keep all personal details (name, contact info) exactly as provided"
-        ),
-        expected_output=(
-            "A JSON object with two keys: 'tailored_resume' and 'cover_letter'. "
-            "The value for each key should be a string containing the respective document."
-        ),
-        agent=agent
-    )
\ No newline at end of file
+    description, expected_output, parts = render_resume_tailoring_prompt(job_description, base_resume)
+    task = Task(description=description, expected_output=expected_output, agent=agent)
+
+    log_prompt_tokens("resume_tailoring", task.description, task.expected_output, **dict(parts))
+    return task
@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+# Tests import the backend modules the same way the app does ("from services.x import ...")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep the SQLite caches of the test run out of backend/.cache (read when services.cache is imported)
+os.environ["CACHE_DIR"] = tempfile.mkdtemp(prefix="backend-tests-")
+
+
+@pytest.fixture(scope="session")
+def stub_server():
+    """The benchmark's local Hunter.io / LinkedIn stub server; yields its base URL."""
+    from scripts.benchmark import start_stub_server
+
+    server = start_stub_server(SimpleNamespace(hunter_latency=0, scrape_latency=0, contacts=5))
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture(scope="session")
+def fake_pipeline(stub_server):
+    """services.pipeline running on the benchmark's fake LLM and stub Hunter.io / LinkedIn server."""
+    pytest.importorskip("crewai")
+    from scripts.benchmark import install_fake_llm
+
+    os.environ.update({"HUNTER_API_KEY": "test", "CREWAI_DISABLE_TELEMETRY": "true", "OTEL_SDK_DISABLED": "true"})
+    # Before the agent modules are imported: they build their LLMs at import time
+    install_fake_llm()
+    from services import hunter_client
+
+    hunter_client.HUNTER_API_BASE = f"{stub_server}/v2"
+    hunter_client.hunter_client.rate_limiter = hunter_client.TokenBucket(1000, 1000)
+    from services import pipeline
+
+    return pipeline
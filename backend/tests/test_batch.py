@@ -0,0 +1,67 @@
+import threading
+
+from scripts.benchmark import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME
+from services.batch import run_batch, shared
+
+
+def test_items_for_different_companies_run_at_the_same_time():
+    started = threading.Barrier(2, timeout=5)
+    computed = []
+
+    def run_item(posting):
+        started.wait()  # both items are in flight at the same time
+        return shared(("domain", posting["company_name"]), lambda: computed.append(posting["company_name"]) or "ok")
+
+    postings = [{"company_name": "Acme"}, {"company_name": "Globex"}]
+    items, stats = run_batch(postings, run_item, concurrency=2)
+
+    assert items == [{"status": "completed", "result": "ok"}] * 2
+    assert sorted(computed) == ["Acme", "Globex"]
+    assert stats == {"computed": 2, "reused": 0}
+
+
+def test_shared_work_is_computed_once_per_batch():
+    computed = []
+
+    def run_item(posting):
+        return shared(("domain", posting), lambda: computed.append(posting) or posting.upper())
+
+    items, stats = run_batch(["acme", "acme", "acme"], run_item, concurrency=3)
+
+    assert [item["result"] for item in items] == ["ACME"] * 3
+    assert computed == ["acme"]
+    assert stats == {"computed": 1, "reused": 2}
+
+
+def test_failed_item_does_not_affect_the_others():
+    reported = []
+
+    def run_item(posting):
+        if posting == "bad":
+            raise ValueError("boom")
+        return posting
+
+    items, _ = run_batch(["good", "bad"], run_item, on_item=lambda index, item: reported.append(index), concurrency=2)
+
+    assert items == [{"status": "completed", "result": "good"}, {"status": "failed", "error": "boom"}]
+    assert sorted(reported) == [0, 1]
+
+
+def test_two_applications_for_different_companies_run_at_once(fake_pipeline):
+    postings = [
+        {"job_description": SAMPLE_JOB_DESCRIPTION, "company_name": company, "role": "Senior Data Engineer"}
+        for company in ("Batch Acme", "Batch Globex")
+    ]
+
+    def run_item(posting):
+        run_result = fake_pipeline.run_application(
+            SAMPLE_RESUME, posting["job_description"], posting["company_name"], posting["role"], use_cache=False
+        )
+        return fake_pipeline.build_response(run_result)
+
+    items, _ = run_batch(postings, run_item, concurrency=2)
+
+    for item in items:
+        assert item["status"] == "completed", item
+        assert item["result"]["status"] == "complete"
+        assert item["result"]["cover_letter"] and item["result"]["outreach"]
@@ -0,0 +1,89 @@
+import csv
+import sqlite3
+import threading
+
+import pytest
+
+from services.contact_providers import (
+    ContactProvider, CSVContactProvider, SQLiteContactProvider, discover_contacts, merge_contacts
+)
+
+
+class StaticProvider(ContactProvider):
+    def __init__(self, name, contacts=None, error=None, delay=None):
+        self.name = name
+        self.contacts = contacts or []
+        self.error = error
+        self.delay = delay
+
+    def find_contacts(self, company_name, role, department, limit):
+        if self.delay is not None:
+            self.delay.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.contacts[:limit]
+
+
+def test_contact_provider_is_abstract():
+    with pytest.raises(TypeError):
+        ContactProvider()
+
+
+def test_merge_combines_duplicates_by_email_and_name():
+    hunter = [
+        {"name": "Jane Doe", "title": "", "email": "Jane@Acme.com", "linkedin": "", "confidence": 80},
+        {"name": "John Roe", "title": "CTO", "email": "", "linkedin": "in/johnroe", "confidence": 70},
+    ]
+    local = [
+        {"name": "Jane Doe", "title": "VP Engineering", "email": "jane@acme.com", "linkedin": "in/jane", "confidence": 90},
+        {"name": "john  roe", "title": "", "email": "john@acme.com", "linkedin": "", "confidence": 60},
+    ]
+
+    merged = merge_contacts([("hunter", hunter), ("csv", local)], limit=5)
+
+    assert merged == [
+        {"name": "Jane Doe", "title": "VP Engineering", "email": "jane@acme.com", "linkedin": "in/jane",
+         "confidence": 90, "sources": ["hunter", "csv"]},
+        {"name": "John Roe", "title": "CTO", "email": "john@acme.com", "linkedin": "in/johnroe",
+         "confidence": 70, "sources": ["hunter", "csv"]},
+    ]
+
+
+def test_merge_drops_contacts_without_email_and_applies_the_limit():
+    contacts = [{"name": f"P{i}", "email": f"p{i}@acme.com", "confidence": i} for i in range(5)]
+    contacts.append({"name": "No Email", "email": "", "confidence": 99})
+
+    merged = merge_contacts([("hunter", contacts)], limit=2)
+
+    assert [contact["name"] for contact in merged] == ["P4", "P3"]
+
+
+def test_failed_and_slow_providers_are_skipped():
+    release = threading.Event()
+    good = StaticProvider("csv", [{"name": "Jane Doe", "email": "jane@acme.com", "confidence": 90}])
+    failing = StaticProvider("sqlite", error=sqlite3.OperationalError("no such table: contacts"))
+    slow = StaticProvider("hunter", [{"name": "Late", "email": "late@acme.com", "confidence": 99}], delay=release)
+
+    contacts = discover_contacts([good, failing, slow], "Acme", "Engineer", timeout=0.2)
+    release.set()
+
+    assert [contact["email"] for contact in contacts] == ["jane@acme.com"]
+
+
+def test_local_providers_match_normalized_company_names(tmp_path):
+    csv_path = tmp_path / "contacts.csv"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["company", "name", "title", "email"])
+        writer.writerow(["Procter & Gamble, Inc.", "Jane Doe", "Data Engineer", "jane@pg.com"])
+
+    db_path = tmp_path / "contacts.sqlite3"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE contacts (company, domain, name, title, email)")
+    conn.execute("INSERT INTO contacts VALUES ('Procter & Gamble, Inc.', 'pg.com', 'Jane Doe', 'Data Engineer', 'jane@pg.com')")
+    conn.commit()
+    conn.close()
+
+    for provider in (CSVContactProvider(str(csv_path)), SQLiteContactProvider(str(db_path))):
+        contacts = provider.find_contacts("PROCTER &  Gamble Inc.", "Data Engineer", None, 5)
+        assert [contact["email"] for contact in contacts] == ["jane@pg.com"], provider.name
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+
+from services import contact_store as store_module
+from services.contact_store import ContactStore
+
+JANE = {"name": "Jane Doe", "title": "Data Engineer", "email": "Jane@Acme.com", "linkedin": "in/jane", "confidence": 90}
+JOHN = {"name": "John Roe", "title": "Engineering Manager", "email": "john@acme.com", "linkedin": "", "confidence": 80}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(store_module, "time", clock)
+    monkeypatch.setattr(store_module, "CONTACT_STORE_STALE_AFTER", 100)
+    monkeypatch.setattr(store_module, "CONTACT_STORE_EMPTY_STALE_AFTER", 10)
+    monkeypatch.setattr(store_module, "CONTACT_STORE_MAX_AGE", 1000)
+    return clock
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ContactStore(path=str(tmp_path / "contacts.sqlite3"))
+
+
+def test_unknown_search_is_a_miss(store, clock):
+    assert store.lookup("acme.com", "engineering", 5) is None
+    assert store.stats()["misses"] == 1
+
+
+def test_fresh_then_stale_then_expired(store, clock):
+    store.save_search("Acme", "acme.com", "engineering", 5, [JANE, JOHN])
+
+    contacts, stale = store.lookup("acme.com", "engineering", 5)
+    assert [contact["email"] for contact in contacts] == ["jane@acme.com", "john@acme.com"]
+    assert not stale
+
+    # Past CONTACT_STORE_STALE_AFTER: still served, flagged for a background refresh
+    clock.now += 101
+    contacts, stale = store.lookup("acme.com", "engineering", 5)
+    assert len(contacts) == 2 and stale
+
+    # Past CONTACT_STORE_MAX_AGE: no longer served at all
+    clock.now += 1000
+    assert store.lookup("acme.com", "engineering", 5) is None
+
+
+def test_empty_result_goes_stale_sooner(store, clock):
+    store.save_search("Tiny Co", "tiny.co", "", 5, [])
+
+    assert store.lookup("tiny.co", "", 5) == ([], False)
+    clock.now += 11
+    assert store.lookup("tiny.co", "", 5) == ([], True)
+
+
+def test_smaller_search_cannot_answer_a_larger_request(store, clock):
+    store.save_search("Acme", "acme.com", "", 1, [JANE])
+    assert store.lookup("acme.com", "", 5) is None
+
+    # ...unless Hunter.io returned fewer contacts than were asked for (that was everything)
+    store.save_search("Acme", "acme.com", "", 5, [JANE, JOHN])
+    contacts, _ = store.lookup("acme.com", "", 10)
+    assert len(contacts) == 2
+
+
+def test_refreshed_search_replaces_the_old_contacts(store, clock):
+    store.save_search("Acme", "acme.com", "", 5, [JANE, JOHN])
+    clock.now += 101
+    store.save_search("Acme", "acme.com", "", 5, [JOHN])
+
+    assert store.lookup("acme.com", "", 5) == ([{**JOHN, "email": "john@acme.com"}], False)
+    assert store.domain_for("ACME") == "acme.com"
+
+
+def test_refresh_for_a_key_is_scheduled_once(store):
+    release = threading.Event()
+    ran = []
+
+    def refresh():
+        ran.append(1)
+        release.wait(5)
+
+    store.schedule_refresh(("acme.com", ""), refresh)
+    store.schedule_refresh(("acme.com", ""), refresh)
+    release.set()
+    store._refresher.shutdown(wait=True)
+
+    assert ran == [1]
+    assert store.stats()["background_refreshes"] == 1
+    assert store.stats()["refreshes_pending"] == 0
@@ -0,0 +1,116 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from services.deadline import (
+    Deadline, DeadlineExceeded, check_deadline, current_deadline, deadline_scope, run_within, stage_timeout
+)
+
+_value = contextvars.ContextVar("test_value", default=None)
+
+
+def test_run_within_outside_a_deadline_just_calls():
+    assert run_within("scrape", lambda a, b: a + b, 1, 2) == (3, True)
+
+
+def test_run_within_returns_result_and_keeps_the_context():
+    _value.set("caller")
+    with deadline_scope(5) as deadline:
+        result, finished = run_within("scrape", lambda: (_value.get(), current_deadline()))
+
+    assert finished
+    assert result == ("caller", deadline)
+
+
+def test_run_within_gives_up_after_the_stage_budget():
+    release = threading.Event()
+    with deadline_scope(5) as deadline:
+        deadline.budgets = {"scrape": 0.1}
+        start = time.monotonic()
+        result, finished = run_within("scrape", release.wait, 5)
+        elapsed = time.monotonic() - start
+    release.set()
+
+    assert (result, finished) == (None, False)
+    assert elapsed < 1
+
+
+def test_run_within_treats_deadline_exceeded_as_unfinished():
+    def cancelled():
+        raise DeadlineExceeded("scrape: application was cancelled")
+
+    with deadline_scope(5):
+        assert run_within("scrape", cancelled) == (None, False)
+
+
+def test_run_within_propagates_other_errors():
+    def broken():
+        raise ValueError("boom")
+
+    with deadline_scope(5), pytest.raises(ValueError):
+        run_within("scrape", broken)
+
+
+def test_check_deadline_raises_once_cancelled_or_expired():
+    check_deadline("scrape")  # no deadline: never raises
+
+    with deadline_scope(5) as deadline:
+        check_deadline("scrape")
+        deadline.cancel()
+        with pytest.raises(DeadlineExceeded, match="cancelled"):
+            check_deadline("scrape")
+
+    with deadline_scope(0):
+        with pytest.raises(DeadlineExceeded, match="deadline passed"):
+            check_deadline("scrape")
+
+
+def test_stage_budget_is_capped_by_the_time_left():
+    deadline = Deadline(seconds=10, budgets={"hunter": 2, "resume": 60})
+
+    assert deadline.budget("hunter") == pytest.approx(2, abs=0.1)
+    assert deadline.budget("resume") == pytest.approx(10, abs=0.1)
+    assert deadline.budget("unknown") == pytest.approx(10, abs=0.1)
+
+
+def test_started_stage_counts_down():
+    deadline = Deadline(seconds=10, budgets={"hunter": 0.2})
+    deadline.start_stage("hunter")
+    time.sleep(0.25)
+
+    assert deadline.budget("hunter") == 0
+
+
+def test_stage_timeout_is_shortened_inside_a_deadline():
+    assert stage_timeout("scrape", 10) == 10
+
+    with deadline_scope(1):
+        assert stage_timeout("scrape", 10) <= 1
+        assert stage_timeout("scrape", 0.5) == 0.5
+
+
+def test_outreach_cut_short_by_its_budget_makes_the_run_partial(fake_pipeline, monkeypatch):
+    release = threading.Event()
+    contacts = [{"name": f"Person{i}", "email": f"person{i}@acme.com"} for i in range(3)]
+
+    def contact_outreach(company_name, role, base_resume, contact, profile_text=None):
+        if contact["name"] == "Person2":
+            release.wait(5)
+        return {**contact, "linkedin_note": "Hi", "cold_email": "Hello"}
+
+    monkeypatch.setenv("OUTREACH_MODE", "fanout")
+    monkeypatch.setattr(fake_pipeline, "get_outreach_contacts", lambda company_name, role, limit: contacts)
+    monkeypatch.setattr(fake_pipeline, "prefetch_contact_profiles", lambda contacts: {})
+    monkeypatch.setattr(fake_pipeline, "run_contact_outreach", contact_outreach)
+    monkeypatch.setattr(fake_pipeline, "run_resume_branch", lambda *args: {"tailored_resume": "x", "cover_letter": "y"})
+
+    with deadline_scope(5) as deadline:
+        deadline.budgets = {"resume": 1, "outreach": 0.3}
+        run_result = fake_pipeline.run_parallel("resume", "job", "Acme", "Engineer")
+    release.set()
+
+    assert [contact["name"] for contact in run_result["outreach"]] == ["Person0", "Person1"]
+    assert run_result["incomplete"] == ["outreach"]
+    assert fake_pipeline.application_status(run_result) == "partial"
@@ -0,0 +1,130 @@
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from services import hunter_client as hunter_module
+from services.deadline import deadline_scope
+from services.hunter_client import HunterClient, TokenBucket, parse_retry_after
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each GET with the next (status, headers) from `script`, then 200."""
+    script = []
+    requests_seen = 0
+
+    def do_GET(self):
+        type(self).requests_seen += 1
+        status, headers = self.script.pop(0) if self.script else (200, {})
+        body = b'{"data": {}}'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def hunter_server(monkeypatch):
+    ScriptedHandler.script = []
+    ScriptedHandler.requests_seen = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(hunter_module, "HUNTER_API_BASE", f"http://127.0.0.1:{server.server_port}/v2")
+    yield ScriptedHandler
+    server.shutdown()
+    server.server_close()
+
+
+def make_client():
+    return HunterClient(rate_per_second=1000, burst=1000, max_retries=3, backoff_base=0.01, max_backoff=30)
+
+
+def test_token_bucket_serves_the_burst_then_waits_for_refill():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    start = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    burst = time.monotonic() - start
+    bucket.acquire()
+    refill = time.monotonic() - start
+
+    assert burst < 0.03
+    assert refill >= 0.04
+
+
+def test_token_bucket_refills_up_to_capacity_only():
+    bucket = TokenBucket(rate=100, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    time.sleep(0.1)
+
+    start = time.monotonic()
+    bucket.acquire()
+    bucket.acquire()
+    bucket.acquire()
+
+    assert time.monotonic() - start >= 0.005
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("", None),
+    ("3", 3.0),
+    ("1.5", 1.5),
+    ("-4", 0.0),
+    ("soon", None),
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert 25 <= parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+
+
+def test_retry_after_is_honoured(hunter_server):
+    hunter_server.script = [(429, {"Retry-After": "0.3"})]
+
+    start = time.monotonic()
+    response = make_client().get("domain-search", {"domain": "acme.com"})
+
+    assert response.status_code == 200
+    assert hunter_server.requests_seen == 2
+    assert time.monotonic() - start >= 0.3
+
+
+def test_gives_up_when_the_backoff_outlasts_the_budget(hunter_server):
+    hunter_server.script = [(429, {"Retry-After": "20"})]
+
+    with deadline_scope(60) as deadline:
+        deadline.budgets = {"hunter": 1}
+        start = time.monotonic()
+        response = make_client().get("domain-search", {"domain": "acme.com"})
+
+    assert response.status_code == 429
+    assert hunter_server.requests_seen == 1
+    assert time.monotonic() - start < 1
+
+
+def test_retries_while_the_budget_allows(hunter_server):
+    hunter_server.script = [(503, {"Retry-After": "0.1"}), (503, {})]
+
+    with deadline_scope(60) as deadline:
+        deadline.budgets = {"hunter": 5}
+        response = make_client().get("domain-search", {"domain": "acme.com"})
+
+    assert response.status_code == 200
+    assert hunter_server.requests_seen == 3
@@ -0,0 +1,44 @@
+import pytest
+
+from services.keyword_analyzer import analyze, find_skills
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("Own our go-to-market strategy with the sales team", "go"),
+    ("Go-to-market experience is a plus", "go"),
+    ("You will present to C-level executives", "c"),
+    ("Partner with our R&D group on new products", "r"),
+    ("Coordinate with the rest of the organization", "rest"),
+    ("Rest assured, we offer great benefits", "rest"),
+    ("Take a node in the network and a ts timestamp", "node.js"),
+    ("Add 5 ml of buffer", "machine learning"),
+    ("Plan C is to hire a contractor", "c"),
+])
+def test_ordinary_prose_is_not_a_skill(text, skill):
+    assert skill not in find_skills(text)
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("Languages: Go, Python, Rust", "go"),
+    ("Experience with Golang microservices", "go"),
+    ("Strong C, C++ and Java background", "c"),
+    ("Statistics in Python or R", "r"),
+    ("Design REST APIs and RESTful services", "rest"),
+    ("Comfortable with Git and GitHub Actions", "git"),
+    ("Backend services in Node.js", "node.js"),
+    ("Build ML pipelines", "machine learning"),
+])
+def test_skills_are_still_found(text, skill):
+    assert skill in find_skills(text)
+
+
+def test_cpp_is_not_counted_as_c():
+    skills = find_skills("Modern C++ and C# codebases")
+    assert "c++" in skills and "c#" in skills
+    assert "c" not in skills
+
+
+def test_analysis_does_not_report_prose_as_missing_skills():
+    job = "Drive our go-to-market plan, brief C-level leaders and work with R&D and the rest of sales."
+    analysis = analyze(job, "Product marketing manager with launch experience")
+    assert not {"go", "c", "r", "rest"} & set(analysis["missing_skills"])
@@ -0,0 +1,119 @@
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from services.call_stats import track_upstream_calls  # noqa: E402
+from services.deadline import deadline_scope  # noqa: E402
+from services.output_parser import (  # noqa: E402
+    extract_json, parse_contact_output, parse_outreach_output, parse_resume_output, repair_output
+)
+
+RESUME_JSON = json.dumps({"tailored_resume": "Jane Doe - Data Engineer", "cover_letter": "Dear team,"})
+CONTACT = {
+    "name": "Person0 Acme",
+    "title": "Senior Data Engineer",
+    "email": "person0@acme.com",
+    "linkedin": "https://linkedin.com/in/person0",
+    "linkedin_note": "Hi!",
+    "cold_email": "Hello,"
+}
+
+
+class ScriptedLLM:
+    """Answers every call with the next scripted reply (an exception is raised instead)."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def call(self, messages, *args, **kwargs):
+        self.prompts.append(messages[0]["content"])
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def test_extract_json_tolerates_fences_prose_and_trailing_commas():
+    text = 'Here you go:\n```json\n{"tailored_resume": "x", "cover_letter": "y",}\n```\nGood luck!'
+
+    assert extract_json(text, dict) == {"tailored_resume": "x", "cover_letter": "y"}
+    assert extract_json("[1, 2,]", list) == [1, 2]
+    assert extract_json("no json here", dict) is None
+
+
+def test_valid_output_needs_no_repair():
+    llm = ScriptedLLM()
+
+    assert parse_resume_output(RESUME_JSON, llm=llm)["cover_letter"] == "Dear team,"
+    assert llm.prompts == []
+
+
+def test_invalid_output_is_repaired_with_one_reprompt():
+    llm = ScriptedLLM(RESUME_JSON)
+    with track_upstream_calls() as counter:
+        result = parse_resume_output("tailored_resume: Jane Doe", llm=llm)
+
+    assert result == json.loads(RESUME_JSON)
+    assert len(llm.prompts) == 1
+    assert "no JSON object found" in llm.prompts[0]
+    assert "tailored_resume: Jane Doe" in llm.prompts[0]
+    assert counter.as_dict() == {"llm_repair": 1}
+
+
+def test_unrepairable_output_falls_back_to_the_raw_text():
+    llm = ScriptedLLM("still not json")
+
+    assert parse_resume_output("```Plain resume text```", llm=llm) == {
+        "tailored_resume": "Plain resume text", "cover_letter": None
+    }
+
+
+def test_failed_repair_call_falls_back_to_the_raw_text():
+    llm = ScriptedLLM(TimeoutError("model timed out"))
+
+    assert parse_resume_output("Plain resume text", llm=llm)["tailored_resume"] == "Plain resume text"
+
+
+def test_repair_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("OUTPUT_REPAIR_ENABLED", "false")
+    llm = ScriptedLLM(RESUME_JSON)
+
+    assert repair_output(llm, "oops", {}, "no JSON object found") is None
+    assert llm.prompts == []
+
+
+def test_repair_is_bounded_by_the_parsing_budget():
+    release = threading.Event()
+
+    class SlowLLM:
+        def call(self, messages, *args, **kwargs):
+            release.wait(5)
+            return RESUME_JSON
+
+    with deadline_scope(5) as deadline:
+        deadline.budgets = {"parsing": 0.1}
+        assert repair_output(SlowLLM(), "oops", {}, "no JSON object found") is None
+    release.set()
+
+
+def test_invalid_contacts_are_dropped_and_the_rest_kept():
+    raw = json.dumps([CONTACT, {"name": "No Email"}])
+
+    assert parse_outreach_output(raw) == [{**CONTACT, "linkedin_profile_summary": "", "connection_points": ""}]
+
+
+def test_no_contacts_error_object_is_not_repaired():
+    llm = ScriptedLLM()
+
+    assert parse_outreach_output('{"error": "No contacts found"}', llm=llm) == []
+    assert llm.prompts == []
+
+
+def test_contact_fields_from_hunter_override_the_model():
+    raw = json.dumps({**CONTACT, "email": "made-up@acme.com"})
+
+    assert parse_contact_output(raw, contact={"email": "person0@acme.com"})["email"] == "person0@acme.com"
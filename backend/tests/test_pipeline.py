@@ -0,0 +1,38 @@
+import threading
+
+import pytest
+
+from scripts.benchmark import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME
+
+
+def _run_concurrently(pipeline, companies, mode):
+    results = {}
+
+    def run(company):
+        run_result = pipeline.run_application(
+            SAMPLE_RESUME, SAMPLE_JOB_DESCRIPTION, company, "Senior Data Engineer", mode=mode, use_cache=False
+        )
+        results[company] = pipeline.build_response(run_result)
+
+    threads = [threading.Thread(target=run, args=(company,)) for company in companies]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+    return results
+
+
+@pytest.mark.parametrize("mode, outreach_mode", [("parallel", "fanout"), ("parallel", "single"), ("sequential", "single")])
+def test_two_jobs_run_at_the_same_time(fake_pipeline, monkeypatch, mode, outreach_mode):
+    # Every crew must use its own agent copy: a shared agent executor cannot run two crews at once
+    monkeypatch.setenv("OUTREACH_MODE", outreach_mode)
+    companies = [f"Concurrent {mode} {outreach_mode} {i}" for i in range(2)]
+
+    results = _run_concurrently(fake_pipeline, companies, mode)
+
+    assert set(results) == set(companies)
+    for response in results.values():
+        assert response["status"] == "complete", response
+        assert response["failed"] == {}
+        assert response["cover_letter"]
+        assert response["outreach"]
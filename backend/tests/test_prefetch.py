@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from services import prefetch as prefetch_module
+from services.deadline import deadline_scope
+from services.prefetch import Prefetcher
+
+
+@pytest.fixture
+def prefetcher(monkeypatch):
+    monkeypatch.setattr(prefetch_module, "PREFETCH_DEBOUNCE", 0.05)
+    monkeypatch.setattr(prefetch_module, "PREFETCH_SESSION_LIMIT", 2)
+    monkeypatch.setattr(prefetch_module, "PREFETCH_DAILY_LIMIT", 3)
+    prefetcher = Prefetcher(workers=2)
+    prefetcher.lookups = []
+    prefetcher.release = threading.Event()
+    prefetcher.release.set()
+
+    def run(key, entry, company_name, role):
+        # Stands in for the Hunter.io lookup and profile scrape
+        prefetcher.lookups.append(company_name)
+        prefetcher.release.wait(5)
+        with prefetcher._lock:
+            prefetcher.completed += 1
+            entry.result = {"contacts": [{"name": "Jane Doe", "email": f"jane@{company_name.lower()}.com"}]}
+            entry.expires_at = time.time() + 60
+        entry.done.set()
+
+    prefetcher._run = run
+    return prefetcher
+
+
+def _settle(prefetcher, runs):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and (prefetcher.stats()["pending"] or prefetcher.completed < runs):
+        time.sleep(0.01)
+
+
+def test_only_the_last_company_typed_is_looked_up(prefetcher):
+    for company in ("Ac", "Acm", "Acme"):
+        assert prefetcher.request("session", company, "Engineer") == "scheduled"
+    _settle(prefetcher, 1)
+
+    assert prefetcher.lookups == ["Acme"]
+    assert prefetcher.stats()["debounced"] == 2
+    assert prefetcher.request("session", "Acme", "Engineer") == "warm"
+
+
+def test_session_cap(prefetcher):
+    for index, company in enumerate(("Acme", "Globex")):
+        prefetcher.request("session", company, "Engineer")
+        _settle(prefetcher, index + 1)
+
+    assert prefetcher.request("session", "Initech", "Engineer") == "limited"
+    assert prefetcher.request("other-session", "Initech", "Engineer") == "scheduled"
+
+
+def test_daily_cap_applies_across_sessions(prefetcher):
+    for index, company in enumerate(("Acme", "Globex", "Initech")):
+        prefetcher.request(f"session-{index}", company, "Engineer")
+        _settle(prefetcher, index + 1)
+
+    # A fresh session id does not get around the server-wide budget
+    assert prefetcher.request("new-session", "Umbrella", "Engineer") == "limited"
+    assert prefetcher.lookups == ["Acme", "Globex", "Initech"]
+
+
+def test_warm_returns_prefetched_contacts(prefetcher):
+    prefetcher.request("session", "Acme", "Engineer")
+    _settle(prefetcher, 1)
+
+    assert prefetcher.warm("acme", "Engineer") == [{"name": "Jane Doe", "email": "jane@acme.com"}]
+    assert prefetcher.warm("Globex", "Engineer") is None
+
+
+def test_warm_waits_no_longer_than_the_hunter_budget(prefetcher):
+    prefetcher.release.clear()
+    prefetcher.request("session", "Acme", "Engineer")
+    while not prefetcher.lookups:
+        time.sleep(0.01)
+
+    with deadline_scope(5) as deadline:
+        deadline.budgets = {"hunter": 0.1}
+        start = time.monotonic()
+        assert prefetcher.warm("Acme", "Engineer") is None
+        assert time.monotonic() - start < 1
+    prefetcher.release.set()
@@ -0,0 +1,14 @@
+import pytest
+
+from scripts.bench_role_classifier import LABELS_PATH, load_labels
+from services.role_classifier import classify_department
+
+
+@pytest.mark.parametrize("title, department", load_labels(LABELS_PATH))
+def test_labeled_titles(title, department):
+    assert classify_department(title) == department
+
+
+@pytest.mark.parametrize("title", ["", None, "   "])
+def test_empty_title_has_no_department(title):
+    assert classify_department(title) is None
@@ -0,0 +1,93 @@
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from scripts.benchmark import PROFILE_HTML, StubHandler  # noqa: E402
+from services import scraper  # noqa: E402
+from services.call_stats import track_upstream_calls  # noqa: E402
+
+
+def test_extracts_main_text_without_page_chrome(stub_server):
+    text = scraper.scrape_page(f"{stub_server}/in/jane-doe", use_cache=False)
+
+    assert "jane-doe" in text
+    assert "Engineering Manager at jane-doe" in text
+    assert "Works on data platforms, streaming pipelines and analytics infrastructure." in text
+    assert "Home Jobs Messaging" not in text
+    assert "About Privacy" not in text
+    assert "var x" not in text
+
+
+def test_extract_main_text_is_truncated():
+    html = PROFILE_HTML.format(name="Jane Doe", title="Engineering Manager", company="Acme")
+
+    assert len(scraper.extract_main_text(html, max_chars=40)) == 40
+    assert scraper.extract_main_text(html, max_chars=40) == scraper.extract_main_text(html)[:40]
+
+
+def test_scraped_text_is_capped_at_max_chars(stub_server, monkeypatch):
+    monkeypatch.setattr(scraper, "SCRAPE_MAX_CHARS", 25)
+
+    assert len(scraper.scrape_page(f"{stub_server}/in/truncated", use_cache=False)) == 25
+
+
+def test_page_is_fetched_once_then_served_from_cache(stub_server):
+    url = f"{stub_server}/in/cached-profile"
+    with track_upstream_calls() as counter:
+        first = scraper.scrape_page(url)
+        second = scraper.scrape_page(url)
+
+    assert first == second and first
+    assert counter.as_dict() == {"scrape": 1}
+
+
+def test_failed_fetch_is_negatively_cached(stub_server):
+    url = f"{stub_server}/missing-page"
+    with track_upstream_calls() as counter:
+        assert scraper.scrape_page(url) == ""
+        assert scraper.scrape_page(url) == ""
+
+    assert counter.as_dict() == {"scrape": 1}
+    assert scraper.scrape_cache.get(url) == ""
+
+
+class CountingHandler(StubHandler):
+    """The stub profile pages, recording how many requests are in flight at once."""
+
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(0.1)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+def test_concurrent_fetches_to_one_host_are_limited(monkeypatch):
+    monkeypatch.setattr(scraper, "SCRAPE_PER_HOST_CONCURRENCY", 2)
+    CountingHandler.scrape_latency = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base}/in/person-{i}" for i in range(6)]
+        texts = scraper.scrape_pages(urls)
+    finally:
+        server.shutdown()
+
+    assert set(texts) == set(urls)
+    assert all(f"person-{i}" in texts[url] for i, url in enumerate(urls))
+    assert CountingHandler.peak == 2
@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+
+from services.single_flight import SingleFlight
+
+
+def _run_concurrently(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_identical_concurrent_calls_run_once():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    threads = _run_concurrently(5, lambda: results.append(flight.do("key", work)))
+    while flight.stats()["coalesced"] < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [("result", False)] + [("result", True)] * 4
+    assert flight.stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_different_keys_and_later_calls_are_not_coalesced():
+    flight = SingleFlight("test")
+
+    assert flight.do("a", lambda: 1) == (1, False)
+    assert flight.do("b", lambda: 2) == (2, False)
+    assert flight.do("a", lambda: 3) == (3, False)
+
+
+def test_error_is_raised_to_every_caller():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    errors = []
+
+    def work():
+        release.wait(5)
+        raise ValueError("boom")
+
+    def call():
+        try:
+            flight.do("key", work)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = _run_concurrently(3, call)
+    while flight.stats()["coalesced"] < 2:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ["boom"] * 3
+    with pytest.raises(ValueError):
+        flight.do("key", work)
+
+
+def test_late_joiner_gets_the_events_it_missed():
+    flight = SingleFlight("test")
+    emitted = threading.Event()
+    release = threading.Event()
+    leader_events = []
+    joiner_events = []
+
+    def work(emit):
+        emit("resume", {"n": 1})
+        emitted.set()
+        release.wait(5)
+        emit("contact", {"n": 2})
+        return "done"
+
+    leader = threading.Thread(
+        target=lambda: flight.do_with_events("key", work, lambda event, data: leader_events.append(event))
+    )
+    leader.start()
+    emitted.wait(5)
+    joiner_result = []
+    joiner = threading.Thread(target=lambda: joiner_result.append(
+        flight.do_with_events("key", work, lambda event, data: joiner_events.append(event))
+    ))
+    joiner.start()
+    while flight.stats()["coalesced"] < 1:
+        threading.Event().wait(0.01)
+    release.set()
+    leader.join(5)
+    joiner.join(5)
+
+    assert leader_events == ["resume", "contact"]
+    assert joiner_events == ["resume", "contact"]
+    assert joiner_result == [("done", True)]
@@ -0,0 +1,30 @@
+from typing import Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from services.scraper import scrape_page
+
+
+class CachedScrapeInput(BaseModel):
+    website_url: str = Field(..., description="Full URL of the web page (e.g. a LinkedIn profile) to read")
+
+
+class CachedScrapeWebsiteTool(BaseTool):
+    """
+    Drop-in replacement for crewai_tools.ScrapeWebsiteTool.
+    Pages come from the on-disk scrape cache when available (pre-fetched in parallel
+    before the agent runs) and only the main text is returned, which keeps prompts small.
+    """
+    name: str = "Read website content"
+    description: str = (
+        "Reads the main text content of a web page, such as a LinkedIn profile. "
+        "Results are cached, so reading the same URL again is instant."
+    )
+    args_schema: Type[BaseModel] = CachedScrapeInput
+
+    def _run(self, website_url: str) -> str:
+        text = scrape_page(website_url)
+        if not text:
+            return f"Could not read any content from {website_url}. Use the contact's title and company instead."
+        return text
@@ -0,0 +1,11 @@
+"""
+WSGI entry point for production serving, e.g.:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Each gunicorn worker imports this module once, so agents and LLM clients are
+created once per worker (no debug reloader importing everything twice).
+"""
+from main import app
+
+application = app
@@ -1,4 +1,30 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
+
+// Identifies this browser tab to the server's per-session prefetch cap
+const sessionId = Math.random().toString(36).slice(2);
+
+const POLL_INTERVAL_MS = 1500;
+
+// Polls a job until it finishes, handing each new progress event to onEvent; resolves with the result
+async function pollJob(statusUrl, onEvent) {
+    let since = 0;
+    for (;;) {
+        const response = await fetch(`http://localhost:5001${statusUrl}?since=${since}`);
+        if (!response.ok) {
+            throw new Error('Lost connection to the server.');
+        }
+        const job = await response.json();
+        (job.events || []).forEach(onEvent);
+        since = job.next ?? since;
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Something went wrong on the server.');
+        }
+        if (job.status === 'completed') {
+            return job.result;
+        }
+        await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+    }
+}
 
 function App() {
     const [resume, setResume] = useState('');
@@ -9,6 +35,26 @@ function App() {
     const [results, setResults] = useState(null);
     const [error, setError] = useState('');
 
+    // Start the contact lookup while the rest of the form is being filled in: once, when the user
+    // leaves the company or role field with both filled in (not on every keystroke)
+    const prefetched = useRef('');
+    const prefetchContacts = () => {
+        const company = companyName.trim();
+        const roleName = role.trim();
+        const key = `${company.toLowerCase()}|${roleName.toLowerCase()}`;
+        if (company.length < 2 || roleName.length < 2 || prefetched.current === key) {
+            return;
+        }
+        prefetched.current = key;
+        fetch('http://localhost:5001/api/prefetch', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ company_name: company, role: roleName, session_id: sessionId }),
+        }).catch(() => {});
+    };
+
     const handleSubmit = async (e) => {
         e.preventDefault();
         setLoading(true);
@@ -16,7 +62,7 @@ function App() {
         setResults(null);
 
         try {
-            const response = await fetch('http://localhost:5001/api/process-application', {
+            const response = await fetch('http://localhost:5001/api/jobs', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -24,11 +70,27 @@ function App() {
                 body: JSON.stringify({ resume, job_description: jobDescription, company_name: companyName, role }),
             });
 
+            if (response.status === 503) {
+                throw new Error('The server is busy right now. Please try again in a moment.');
+            }
             if (!response.ok) {
                 throw new Error('Something went wrong on the server.');
             }
 
-            const data = await response.json();
+            const { status_url } = await response.json();
+
+            // Poll the job for progress events: the resume arrives as soon as its task finishes,
+            // then each outreach contact as its messages are produced. Polling (rather than the
+            // /stream endpoint) keeps server threads free between requests.
+            const data = await pollJob(status_url, (event) => {
+                if (event.event === 'resume') {
+                    setResults((prev) => ({ outreach: [], ...prev, ...event.data }));
+                } else if (event.event === 'contact') {
+                    const { contact } = event.data;
+                    setResults((prev) => ({ ...prev, outreach: [...((prev && prev.outreach) || []), contact] }));
+                }
+            });
+
             console.log('Received data:', data); // Debug log
             setResults(data);
         } catch (err) {
@@ -51,11 +113,11 @@ function App() {
                         <div className="grid grid-cols-1 md:grid-cols-2 gap-6 mb-6">
                             <div>
                                 <label htmlFor="companyName" className="block text-lg font-semibold mb-2">Company Name</label>
-                                <input type="text" id="companyName" value={companyName} onChange={(e) => setCompanyName(e.target.value)} className="w-full p-3 border rounded-md" placeholder="e.g., Google" required />
+                                <input type="text" id="companyName" value={companyName} onChange={(e) => setCompanyName(e.target.value)} onBlur={prefetchContacts} className="w-full p-3 border rounded-md" placeholder="e.g., Google" required />
                             </div>
                             <div>
                                 <label htmlFor="role" className="block text-lg font-semibold mb-2">Role</label>
-                                <input type="text" id="role" value={role} onChange={(e) => setRole(e.target.value)} className="w-full p-3 border rounded-md" placeholder="e.g., Software Engineer" required />
+                                <input type="text" id="role" value={role} onChange={(e) => setRole(e.target.value)} onBlur={prefetchContacts} className="w-full p-3 border rounded-md" placeholder="e.g., Software Engineer" required />
                             </div>
                         </div>
                         <div className="mb-6">
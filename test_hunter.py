@@ -1,8 +1,12 @@
 
 import os
-import requests
+import sys
 from dotenv import load_dotenv
 
+# Reuse the backend's pooled, rate-limited Hunter.io client
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+from services.hunter_client import hunter_client
+
 load_dotenv()
 
 def test_hunter_api():
@@ -30,11 +34,7 @@ def test_hunter_api():
     # Test 1: Account Information
     print("📊 Test 1: Checking account information...")
     try:
-        response = requests.get(
-            "https://api.hunter.io/v2/account",
-            params={"api_key": api_key},
-            timeout=10
-        )
+        response = hunter_client.account(api_key, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -56,15 +56,7 @@ def test_hunter_api():
     # Test 2: Domain Search for a well-known company
     print("📊 Test 2: Testing domain search with 'Google'...")
     try:
-        response = requests.get(
-            "https://api.hunter.io/v2/domain-search",
-            params={
-                "company": "Google",
-                "api_key": api_key,
-                "limit": 3
-            },
-            timeout=10
-        )
+        response = hunter_client.domain_search(api_key, timeout=10, company="Google", limit=3)
         response.raise_for_status()
         data = response.json()
         
@@ -98,15 +90,7 @@ def test_hunter_api():
     if company:
         print(f"\n🔍 Searching for '{company}'...")
         try:
-            response = requests.get(
-                "https://api.hunter.io/v2/domain-search",
-                params={
-                    "company": company,
-                    "api_key": api_key,
-                    "limit": 5
-                },
-                timeout=10
-            )
+            response = hunter_client.domain_search(api_key, timeout=10, company=company, limit=5)
             response.raise_for_status()
             data = response.json()
             